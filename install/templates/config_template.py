@@ -10,6 +10,10 @@ mysql: DatabaseConfig = DatabaseConfig(
     password = 'DBPASS',
     database = 'DBNAME',
     port     = 3306,
+    # Uncomment these lines to change the database connection pool settings.
+    # pool_size    = 5,
+    # max_overflow = 5,
+    # pool_recycle = 3600,
 )
 
 # Uncomment this statement if your project uses AWS S3.
@@ -18,6 +22,9 @@ mysql: DatabaseConfig = DatabaseConfig(
 #     aws_secret_access_key = 'AWS_SECRET_ACCESS_KEY',
 #     aws_s3_endpoint_url   = 'AWS_S3_ENDPOINT',
 #     aws_s3_bucket_name    = 'AWS_S3_BUCKET_NAME',
+#     max_concurrent_transfers = 10,
+#     cache_dir_path = 'S3_CACHE_DIR_PATH',
+#     cache_max_size = 50,
 # )
 
 
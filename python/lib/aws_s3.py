@@ -1,20 +1,52 @@
 """This class interacts with S3 Buckets"""
 
+import hashlib
+import math
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.exceptions import ClientError, EndpointConnectionError
 from loris_utils.crypto import compute_file_md5_hash
+from s3transfer.utils import ChunksizeAdjuster
+
+# maximum size of an object copied with a single `copy_object` request, larger objects are copied
+# with a multipart copy
+MAX_COPY_OBJECT_SIZE = 5 * 1024 ** 3
+
+# maximum number of keys deleted by a single `delete_objects` request
+MAX_DELETE_OBJECTS_KEYS = 1000
+
+
+@dataclass
+class S3ObjectInfo:
+    """
+    Information about an object stored in an S3 bucket, as returned by a bucket listing.
+    """
+
+    size: int
+    etag: str
 
 
 class AwsS3:
 
-    def __init__(self, aws_access_key_id, aws_secret_access_key, aws_endpoint_url, bucket_name):
+    def __init__(self, aws_access_key_id, aws_secret_access_key, aws_endpoint_url, bucket_name,
+                 max_concurrent_transfers=10, file_cache=None):
 
         self.aws_access_key_id = aws_access_key_id
         self.aws_secret_access_key = aws_secret_access_key
         self.aws_endpoint_url = aws_endpoint_url
         self.bucket_name = bucket_name
+        # number of files transferred at the same time by the batch operations, each file transfer
+        # can itself use several threads for multipart transfers
+        self.max_concurrent_transfers = max_concurrent_transfers
+        self.transfer_config = TransferConfig(use_threads=True)
+        # optional local cache of the downloaded files, indexed by their BLAKE2b hash
+        self.file_cache = file_cache
         self.s3 = self.connect_to_s3_bucket()
         self.s3_client = self.connect_to_s3_client()
         if self.s3:
@@ -57,7 +89,11 @@ class AwsS3:
                 service_name="s3",
                 aws_access_key_id=self.aws_access_key_id,
                 aws_secret_access_key=self.aws_secret_access_key,
-                endpoint_url=self.aws_endpoint_url
+                endpoint_url=self.aws_endpoint_url,
+                # the client is shared by all the concurrent transfers
+                config=Config(
+                    max_pool_connections=self.max_concurrent_transfers * self.transfer_config.max_concurrency
+                )
             )
         except ClientError as err:
             print(f'\n[ERROR   ] S3 connection failure: {format(err)}\n')
@@ -68,7 +104,42 @@ class AwsS3:
 
         return s3_client
 
-    def check_object_content_exists(self, file_path, key):
+    def compute_file_etag(self, file_path):
+        """
+        Compute the ETag that S3 gives to a file uploaded with the transfer configuration of this
+        object. This is the MD5 hash of the file for single part uploads, and the MD5 hash of the
+        concatenated MD5 hashes of the parts followed by the number of parts for multipart uploads.
+
+        :param file_path: Full path to the file to compute the ETag of
+         :type file_path: str
+
+        :return: the S3 ETag of the file, without quotes
+         :rtype: str
+        """
+
+        file_size = os.path.getsize(file_path)
+        if file_size < self.transfer_config.multipart_threshold:
+            return compute_file_md5_hash(file_path)
+
+        # use the same part size adjustment as the transfer manager
+        part_size = ChunksizeAdjuster().adjust_chunksize(self.transfer_config.multipart_chunksize, file_size)
+
+        # Since the file given to this function may be large, we read it in chunks to avoid running
+        # out of memory.
+        part_digests = []
+        with open(file_path, 'rb') as file:
+            for _ in range(math.ceil(file_size / part_size)):
+                part_hash = hashlib.md5()
+                remaining_size = part_size
+                while remaining_size > 0 and (chunk := file.read(min(1048576, remaining_size))):
+                    part_hash.update(chunk)
+                    remaining_size -= len(chunk)
+
+                part_digests.append(part_hash.digest())
+
+        return f'{hashlib.md5(b"".join(part_digests)).hexdigest()}-{len(part_digests)}'
+
+    def check_object_content_exists(self, file_path, key, etag=None):
         """
         Check if file content already exists
         :param file_path: Full path to the file to check hash
@@ -76,19 +147,19 @@ class AwsS3:
         :param key: S3 object key. It should be identical to the S3 object key.
                     (It will not include `s3://BUCKET_NAME/`)
          :type key: str
+        :param etag: S3 ETag of the file if it has already been computed
+         :type etag: str
         """
         try:
-            etag = compute_file_md5_hash(file_path)
-            self.s3_client.head_object(Bucket=self.bucket_name, Key=key, IfMatch=etag)
+            response = self.s3_client.head_object(Bucket=self.bucket_name, Key=key)
         except ClientError:
-            """
-            Per Boto3 documentation for S3.Client.head_object IfMatch will:
-            Return the object only if its entity tag (ETag) is the same as the one specified;
-            otherwise, return a 412 (precondition failed) error.
-            """
+            # the object does not exist
             return False
-        else:
-            return True
+
+        if etag is None:
+            etag = self.compute_file_etag(file_path)
+
+        return response['ETag'].strip('"') == etag
 
     def upload_file(self, file_name, s3_object_name):
         """
@@ -101,20 +172,131 @@ class AwsS3:
          :type s3_object_name: str
         """
 
-        (s3_bucket_name, s3_bucket, s3_file_name) = self.get_s3_object_path_part(s3_object_name)
+        (s3_bucket_name, _, s3_file_name) = self.get_s3_object_path_part(s3_object_name)
 
-        # Upload the file
+        # Upload the file, the S3 client is used instead of the bucket resource as it is thread-safe
         try:
+            # the file ETag is only computed if an object already exists for this key
             object_exists = self.check_object_content_exists(file_name, s3_file_name)
             if not object_exists:
                 print(f"Uploading {s3_file_name} to {self.aws_endpoint_url}/{s3_bucket_name}")
-                s3_bucket.upload_file(file_name, s3_file_name)
+                self.s3_client.upload_file(file_name, s3_bucket_name, s3_file_name, Config=self.transfer_config)
             elif object_exists:
                 print(
                     f"Skipping! Key Content for {s3_file_name} matches key at {self.aws_endpoint_url}/{s3_bucket_name}")
         except ClientError as err:
             raise Exception(f"{file_name} upload failure - {format(err)}")
 
+    def upload_files(self, files):
+        """
+        Upload several files to an S3 bucket concurrently, with at most `max_concurrent_transfers`
+        files being transferred at the same time. An exception is raised once all the transfers are
+        done if any of them failed.
+
+        :param files: list of (full path to the file to upload, S3 object name) tuples
+         :type files: list[tuple[str, str]]
+        """
+
+        uploads = []
+        files_by_bucket = {}
+        for file_name, s3_object_name in files:
+            (s3_bucket_name, _, s3_file_name) = self.get_s3_object_path_part(s3_object_name)
+            files_by_bucket.setdefault(s3_bucket_name, []).append((file_name, s3_file_name))
+
+        for s3_bucket_name, bucket_files in files_by_bucket.items():
+            # list the destination keys once rather than sending one request per file
+            s3_objects = self.list_objects_with_keys([s3_key for _, s3_key in bucket_files], s3_bucket_name)
+            for file_name, s3_key in bucket_files:
+                s3_object = s3_objects.get(s3_key)
+                if s3_object is not None and s3_object.size == os.path.getsize(file_name) \
+                        and s3_object.etag == self.compute_file_etag(file_name):
+                    print(f"Skipping! Key Content for {s3_key} matches key at {self.aws_endpoint_url}/{s3_bucket_name}")
+                    continue
+
+                uploads.append((file_name, s3_bucket_name, s3_key))
+
+        self.run_concurrent_transfers(
+            [lambda upload=upload: self._upload_file_to_key(*upload) for upload in uploads],
+            "upload"
+        )
+
+    def run_concurrent_transfers(self, transfers, transfer_type, report_progress=False):
+        """
+        Run several transfer functions concurrently, with at most `max_concurrent_transfers`
+        transfers running at the same time. An exception is raised once all the transfers are done
+        if any of them failed.
+
+        :param transfers: list of functions that each run one transfer
+         :type transfers: list[Callable[[], None]]
+        :param transfer_type: type of the transfers, used in the error and progress messages
+         :type transfer_type: str
+        :param report_progress: whether to print the progress of the transfers
+         :type report_progress: bool
+        """
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrent_transfers) as executor:
+            futures = [executor.submit(transfer) for transfer in transfers]
+            if report_progress:
+                # print the progress about every 10% of the transfers
+                step = max(1, len(futures) // 10)
+                for count, _ in enumerate(as_completed(futures), start=1):
+                    if count % step == 0 or count == len(futures):
+                        print(f"{transfer_type.capitalize()} progress: {count}/{len(futures)} object(s)")
+
+        errors = [future.exception() for future in futures if future.exception() is not None]
+        if errors:
+            raise Exception(f"{len(errors)} file(s) {transfer_type} failure - {format(errors[0])}")
+
+    def list_objects(self, s3_prefix, bucket_name=None):
+        """
+        List the objects of a bucket under a given prefix using `list_objects_v2`, which returns
+        up to 1000 keys per request.
+
+        :param s3_prefix: S3 prefix to list (it will not include `s3://BUCKET_NAME/`)
+         :type s3_prefix: str
+        :param bucket_name: name of the bucket to list, the default bucket if not provided
+         :type bucket_name: str
+
+        :return: dictionary of the objects found, indexed by key
+         :rtype: dict[str, S3ObjectInfo]
+        """
+
+        objects = {}
+        paginator = self.s3_client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=bucket_name or self.bucket_name, Prefix=s3_prefix):
+            for obj in page.get('Contents', []):
+                objects[obj['Key']] = S3ObjectInfo(obj['Size'], obj['ETag'].strip('"'))
+
+        return objects
+
+    def list_objects_with_keys(self, keys, bucket_name=None):
+        """
+        List the objects of a bucket that have one of the given keys. The common prefix of the
+        keys of each top-level directory is listed once, so that keys spread across unrelated
+        directories do not result in a listing of the whole bucket.
+
+        :param keys: S3 keys to look for (they will not include `s3://BUCKET_NAME/`)
+         :type keys: list[str]
+        :param bucket_name: name of the bucket to list, the default bucket if not provided
+         :type bucket_name: str
+
+        :return: dictionary of the objects found, indexed by key
+         :rtype: dict[str, S3ObjectInfo]
+        """
+
+        keys_by_top_dir = {}
+        for key in keys:
+            keys_by_top_dir.setdefault(key.split('/', 1)[0], []).append(key)
+
+        objects = {}
+        for top_dir_keys in keys_by_top_dir.values():
+            top_dir_keys = list(dict.fromkeys(top_dir_keys))
+            s3_prefix = top_dir_keys[0] if len(top_dir_keys) == 1 else os.path.commonpath(top_dir_keys) + '/'
+            s3_objects = self.list_objects(s3_prefix, bucket_name)
+            objects.update({key: s3_objects[key] for key in top_dir_keys if key in s3_objects})
+
+        return objects
+
     def upload_dir(self, dir_name, s3_object_name, force=False):
         """
         Upload a directory to an S3 bucket
@@ -128,34 +310,63 @@ class AwsS3:
          :type force: bool
         """
 
-        (s3_bucket_name, s3_bucket, s3_file_name) = self.get_s3_object_path_part(s3_object_name)
+        (s3_bucket_name, _, s3_file_name) = self.get_s3_object_path_part(s3_object_name)
+
+        # list the destination once rather than once per local file
+        s3_objects = self.list_objects(s3_file_name, s3_bucket_name)
 
+        uploads = []
         for (root, dirs, files) in os.walk(dir_name):
             for file in files:
-                s3_prefix = os.path.join(s3_file_name, root.replace(dir_name, "").lstrip('/'), file)
+                file_path = os.path.join(root, file)
+                s3_key = os.path.join(s3_file_name, root.replace(dir_name, "").lstrip('/'), file)
                 s3_dest = os.path.join(
                     's3://',
                     s3_bucket_name,
-                    s3_prefix
+                    s3_key
                 )
 
                 """
                 If the BIDS data already exists on the destination folder
-                delete it first if force is true, otherwise skip it
+                overwrite it if force is true, otherwise skip it
                 """
-                if list(s3_bucket.objects.filter(Prefix=s3_prefix)):
+                s3_object = s3_objects.get(s3_key)
+                if s3_object is not None:
                     if not force:
                         print(
                             f"File {s3_dest} already exists. Rerun the script with"
                             f" option --force if you wish to force update the already inserted file."
                         )
                         continue
-                    self.delete_file(s3_dest)
+                    if s3_object.size == os.path.getsize(file_path) \
+                            and s3_object.etag == self.compute_file_etag(file_path):
+                        print(f"Skipping! Key Content for {s3_key} matches key at {s3_dest}")
+                        continue
 
-                self.upload_file(
-                    os.path.join(root, file),
-                    s3_dest
-                )
+                uploads.append((file_path, s3_bucket_name, s3_key))
+
+        self.run_concurrent_transfers(
+            [lambda upload=upload: self._upload_file_to_key(*upload) for upload in uploads],
+            "upload"
+        )
+
+    def _upload_file_to_key(self, file_name, s3_bucket_name, s3_key):
+        """
+        Upload a file to an S3 key without checking the existing content of that key.
+
+        :param file_name: Full path to the file to upload
+         :type file_name: str
+        :param s3_bucket_name: name of the destination bucket
+         :type s3_bucket_name: str
+        :param s3_key: destination key
+         :type s3_key: str
+        """
+
+        print(f"Uploading {s3_key} to {self.aws_endpoint_url}/{s3_bucket_name}")
+        try:
+            self.s3_client.upload_file(file_name, s3_bucket_name, s3_key, Config=self.transfer_config)
+        except ClientError as err:
+            raise Exception(f"{file_name} upload failure - {format(err)}")
 
     def check_if_file_key_exists_in_bucket(self, file_key):
         """
@@ -177,34 +388,77 @@ class AwsS3:
 
         return True
 
-    def download_file(self, s3_object_name, destination_file):
+    def download_file(self, s3_object_name, destination_file, blake2b_hash=None):
         """
-        Download a file from an S3 bucket
+        Download a file from an S3 bucket. If the BLAKE2b hash of the file is known and a file
+        cache is configured, the file is copied from the cache when present, and added to it
+        otherwise.
 
         :param s3_object_name: S3 object name to download from
          :type s3_object_name: str
         :param destination_file: Full path where the file should be downloaded
          :type destination_file: str
+        :param blake2b_hash: BLAKE2b hash of the file stored in the database, if any
+         :type blake2b_hash: str
         """
 
-        (s3_bucket_name, s3_bucket, s3_file_name) = self.get_s3_object_path_part(s3_object_name)
+        if self.file_cache and blake2b_hash:
+            os.makedirs(os.path.dirname(destination_file), exist_ok=True)
+            if self.file_cache.get(blake2b_hash, destination_file):
+                print(f"Using cached copy of {s3_object_name} for {destination_file}")
+                return
+
+        (s3_bucket_name, _, s3_file_name) = self.get_s3_object_path_part(s3_object_name)
 
         try:
             print(f"Downloading {s3_file_name} from {self.aws_endpoint_url}/{s3_bucket_name} to {destination_file}")
 
-            for obj in s3_bucket.objects.filter(Prefix=s3_file_name):
-                obj_relpath = os.path.relpath(obj.key, s3_file_name)
+            downloads = []
+            for key, s3_object in self.list_objects(s3_file_name, s3_bucket_name).items():
+                obj_relpath = os.path.relpath(key, s3_file_name)
                 target = os.path.join(destination_file, obj_relpath) if obj_relpath != '.' else destination_file
 
-                if not os.path.exists(os.path.dirname(target)):
-                    os.makedirs(os.path.dirname(target))
-                if obj.key[-1] == '/':
+                # Several downloads may create the same directory concurrently.
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                if key[-1] == '/':
                     continue
 
-                s3_bucket.download_file(obj.key, target)
+                # skip the files that are already present locally with the same content
+                if os.path.isfile(target) and os.path.getsize(target) == s3_object.size \
+                        and self.compute_file_etag(target) == s3_object.etag:
+                    continue
+
+                downloads.append((s3_bucket_name, key, target))
         except ClientError as err:
             raise Exception(f"{s3_object_name} download failure = {format(err)}")
 
+        self.run_concurrent_transfers(
+            [
+                lambda download=download: self.s3_client.download_file(*download, Config=self.transfer_config)
+                for download in downloads
+            ],
+            "download"
+        )
+
+        if self.file_cache and blake2b_hash and os.path.isfile(destination_file):
+            self.file_cache.put(blake2b_hash, destination_file)
+
+    def download_files(self, files):
+        """
+        Download several files or directories from S3 buckets concurrently, with at most
+        `max_concurrent_transfers` objects being transferred at the same time. An exception is
+        raised once all the transfers are done if any of them failed.
+
+        :param files: list of (S3 object name, full path where the file should be downloaded) or
+                      (S3 object name, full path, BLAKE2b hash of the file) tuples
+         :type files: list[tuple[str, str] | tuple[str, str, str | None]]
+        """
+
+        self.run_concurrent_transfers(
+            [lambda file=file: self.download_file(*file) for file in files],
+            "download"
+        )
+
     def delete_file(self, s3_object_name):
         """
         Function to delete a s3 file or directory.
@@ -216,19 +470,46 @@ class AwsS3:
         print(f"Deleting {s3_object_name}")
 
         try:
-            (_, s3_bucket, s3_file_name) = self.get_s3_object_path_part(s3_object_name)
-            objects_to_delete = [{'Key': obj.key} for obj in s3_bucket.objects.filter(Prefix=s3_file_name)]
-            s3_bucket.delete_objects(
+            (s3_bucket_name, _, s3_file_name) = self.get_s3_object_path_part(s3_object_name)
+            self.delete_objects(s3_bucket_name, list(self.list_objects(s3_file_name, s3_bucket_name).keys()))
+        except Exception as err:
+            raise Exception(f"{s3_object_name} delete failure = {format(err)}")
+
+    def delete_objects(self, s3_bucket_name, keys):
+        """
+        Delete a list of objects from a bucket, using one `delete_objects` request per 1000 keys.
+        An exception is raised if any of the objects could not be deleted.
+
+        :param s3_bucket_name: name of the bucket
+         :type s3_bucket_name: str
+        :param keys: keys of the objects to delete
+         :type keys: list[str]
+        """
+
+        start_time = time.monotonic()
+        errors = []
+        for i in range(0, len(keys), MAX_DELETE_OBJECTS_KEYS):
+            response = self.s3_client.delete_objects(
+                Bucket=s3_bucket_name,
                 Delete={
-                    'Objects': objects_to_delete
+                    'Objects': [{'Key': key} for key in keys[i:i + MAX_DELETE_OBJECTS_KEYS]],
+                    'Quiet': True,
                 }
             )
-        except Exception as err:
-            raise Exception(f"{s3_object_name} download failure = {format(err)}")
+            errors.extend(response.get('Errors', []))
+            print(f"Delete progress: {min(i + MAX_DELETE_OBJECTS_KEYS, len(keys))}/{len(keys)} object(s)")
+
+        if errors:
+            raise Exception(
+                f"{len(errors)} object(s) delete failure - {errors[0]['Key']}: {errors[0]['Message']}"
+            )
+
+        print(f"Deleted {len(keys)} object(s) in {time.monotonic() - start_time:.1f}s")
 
     def copy_file(self, src_s3_object_name, dst_s3_object_name, delete = False):
         """
-        Function to copy a s3 file or directory.
+        Function to copy a s3 file or directory. The objects are copied concurrently on the server
+        side, using a multipart copy for the objects larger than 5 GB.
 
         :param src_s3_object_name: name of the source s3 file or directory
          :type src_s3_object_name: str
@@ -241,21 +522,66 @@ class AwsS3:
         print(f"Copying {src_s3_object_name} to {dst_s3_object_name}")
 
         try:
-            (_, src_s3_bucket, src_s3_file_name) = self.get_s3_object_path_part(src_s3_object_name)
-            (_, dst_s3_bucket, dst_s3_file_name) = self.get_s3_object_path_part(dst_s3_object_name)
-            for obj in src_s3_bucket.objects.filter(Prefix=src_s3_file_name):
-                subcontent = obj.key.replace(src_s3_file_name, "")
-                dst_s3_bucket.Object(
-                    dst_s3_file_name + subcontent
-                ).copy_from(
-                    CopySource=f'{obj.bucket_name}/{obj.key}'
-                )
-                if delete:
-                    print(f"Deleting {src_s3_object_name}")
-                    src_s3_bucket.Object(obj.key).delete()
+            (src_s3_bucket_name, _, src_s3_file_name) = self.get_s3_object_path_part(src_s3_object_name)
+            (dst_s3_bucket_name, _, dst_s3_file_name) = self.get_s3_object_path_part(dst_s3_object_name)
+
+            # list the source and destination once and skip the objects already copied
+            src_s3_objects = self.list_objects(src_s3_file_name, src_s3_bucket_name)
+            dst_s3_objects = self.list_objects(dst_s3_file_name, dst_s3_bucket_name)
+
+            start_time = time.monotonic()
+            copies = []
+            for key, s3_object in src_s3_objects.items():
+                subcontent = key.replace(src_s3_file_name, "")
+                dst_key = dst_s3_file_name + subcontent
+                if dst_s3_objects.get(dst_key) != s3_object:
+                    copies.append((key, dst_key, s3_object.size))
+
+            self.run_concurrent_transfers(
+                [
+                    lambda copy=copy: self._copy_object(src_s3_bucket_name, copy[0], dst_s3_bucket_name, *copy[1:])
+                    for copy in copies
+                ],
+                "copy",
+                report_progress=True
+            )
+
+            copied_size = sum(size for _, _, size in copies)
+            print(
+                f"Copied {len(copies)} object(s) ({copied_size / 1024 ** 2:.1f} MB) in"
+                f" {time.monotonic() - start_time:.1f}s, {len(src_s3_objects) - len(copies)} object(s)"
+                f" already up to date"
+            )
+
+            if delete:
+                print(f"Deleting {src_s3_object_name}")
+                self.delete_objects(src_s3_bucket_name, list(src_s3_objects.keys()))
         except Exception as err:
             raise Exception(f"{src_s3_object_name} => {dst_s3_object_name} copy failure = {format(err)}")
 
+    def _copy_object(self, src_s3_bucket_name, src_key, dst_s3_bucket_name, dst_key, size):
+        """
+        Copy an object on the server side, with a single `copy_object` request if possible or with
+        a multipart copy otherwise.
+
+        :param src_s3_bucket_name: name of the source bucket
+         :type src_s3_bucket_name: str
+        :param src_key: key of the source object
+         :type src_key: str
+        :param dst_s3_bucket_name: name of the destination bucket
+         :type dst_s3_bucket_name: str
+        :param dst_key: key of the destination object
+         :type dst_key: str
+        :param size: size of the source object in bytes
+         :type size: int
+        """
+
+        copy_source = {'Bucket': src_s3_bucket_name, 'Key': src_key}
+        if size <= MAX_COPY_OBJECT_SIZE:
+            self.s3_client.copy_object(CopySource=copy_source, Bucket=dst_s3_bucket_name, Key=dst_key)
+        else:
+            self.s3_client.copy(copy_source, dst_s3_bucket_name, dst_key, Config=self.transfer_config)
+
     def get_s3_object_path_part(self, s3_object_name):
         """
         Function to dissect a s3 file to extract the file prefix and the bucket name
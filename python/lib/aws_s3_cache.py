@@ -0,0 +1,102 @@
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+from loris_utils.crypto import compute_file_blake2b_hash
+
+
+class S3FileCache:
+    """
+    On-disk cache of the files downloaded from S3, indexed by their BLAKE2b hash. The cache size is
+    capped, and the least recently used files are evicted when the cap is exceeded.
+
+    The files are written in the cache through a temporary file that is atomically renamed once
+    complete, so that several scripts can share the same cache directory.
+    """
+
+    def __init__(self, cache_dir_path: Path | str, max_size: int):
+        """
+        :param cache_dir_path: path of the cache directory, created if it does not exist
+        :param max_size: maximum size of the cache in bytes
+        """
+
+        self.cache_dir_path = Path(cache_dir_path)
+        self.max_size = max_size
+        self.cache_dir_path.mkdir(parents=True, exist_ok=True)
+
+    def get_cached_file_path(self, blake2b_hash: str) -> Path:
+        """
+        Get the path of the cache entry of a file given its BLAKE2b hash.
+        """
+
+        return self.cache_dir_path / blake2b_hash[:2] / blake2b_hash
+
+    def get(self, blake2b_hash: str, destination_path: Path | str) -> bool:
+        """
+        Copy a cached file to a destination path if it is present in the cache. Return whether the
+        file was found in the cache.
+        """
+
+        cached_file_path = self.get_cached_file_path(blake2b_hash)
+        try:
+            shutil.copyfile(cached_file_path, destination_path)
+            # Mark the entry as recently used for the eviction.
+            os.utime(cached_file_path)
+        except FileNotFoundError:
+            return False
+
+        return True
+
+    def put(self, blake2b_hash: str, file_path: Path | str):
+        """
+        Add a downloaded file to the cache, provided that its content matches the BLAKE2b hash, and
+        evict the least recently used files if the cache exceeds its maximum size.
+        """
+
+        if os.path.getsize(file_path) > self.max_size:
+            return
+
+        # The object may have been modified on S3 since its hash was stored in the database.
+        if compute_file_blake2b_hash(file_path) != blake2b_hash:
+            return
+
+        cached_file_path = self.get_cached_file_path(blake2b_hash)
+        cached_file_path.parent.mkdir(exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=cached_file_path.parent, prefix='.', delete=False) as tmp_file:
+            tmp_file_path = tmp_file.name
+
+        try:
+            shutil.copyfile(file_path, tmp_file_path)
+            os.replace(tmp_file_path, cached_file_path)
+        except BaseException:
+            os.unlink(tmp_file_path)
+            raise
+
+        self.evict()
+
+    def evict(self):
+        """
+        Remove the least recently used files of the cache until its size is below its maximum size.
+        """
+
+        entries: list[tuple[float, int, Path]] = []
+        for entry_path in self.cache_dir_path.glob('*/*'):
+            if entry_path.name.startswith('.'):
+                continue
+
+            try:
+                stat = entry_path.stat()
+            except FileNotFoundError:
+                continue
+
+            entries.append((stat.st_mtime, stat.st_size, entry_path))
+
+        cache_size = sum(size for _, size, _ in entries)
+        for _, size, entry_path in sorted(entries):
+            if cache_size <= self.max_size:
+                break
+
+            # Another script sharing the cache may have already removed this entry.
+            entry_path.unlink(missing_ok=True)
+            cache_size -= size
@@ -2,7 +2,7 @@
 
 import random
 
-from lib.db.queries.candidate import try_get_candidate_with_cand_id
+from lib.db.queries.candidate import get_candidates_with_cand_ids, try_get_candidate_with_cand_id
 from lib.env import Env
 
 
@@ -112,3 +112,18 @@ def generate_new_cand_id(env: Env) -> int:
         candidate = try_get_candidate_with_cand_id(env.db, cand_id)
         if candidate is None:
             return cand_id
+
+
+def generate_new_cand_ids(env: Env, count: int) -> list[int]:
+    """
+    Generate a given number of distinct new random CandIDs that are not already present in the
+    database, checking each batch of random CandIDs with a single query.
+    """
+
+    cand_ids: set[int] = set()
+    while len(cand_ids) < count:
+        new_cand_ids = {random.randint(100000, 999999) for _ in range(count - len(cand_ids))} - cand_ids
+        candidates = get_candidates_with_cand_ids(env.db, new_cand_ids)
+        cand_ids |= new_cand_ids - {candidate.cand_id for candidate in candidates}
+
+    return list(cand_ids)
@@ -26,6 +26,9 @@ class DatabaseConfig:
     password: str
     database: str
     port:     int = 3306  # Default database port.
+    pool_size:    int = 5     # Number of connections kept open in the connection pool.
+    max_overflow: int = 5     # Number of connections that can be opened beyond the pool size.
+    pool_recycle: int = 3600  # Number of seconds after which a pooled connection is reopened.
 
 
 @dataclass
@@ -38,6 +41,9 @@ class S3Config:
     aws_secret_access_key: str
     aws_s3_endpoint_url:   str | None = None  # Can also be obtained from the database.
     aws_s3_bucket_name:    str | None = None  # Can also be obtained from the database.
+    max_concurrent_transfers: int = 10  # Number of files transferred to or from S3 at the same time.
+    cache_dir_path: str | None = None  # Directory of the local cache of the downloaded files, if any.
+    cache_max_size: int = 50  # Maximum size of the local cache of the downloaded files in GB.
 
 
 @dataclass
@@ -1,11 +1,15 @@
 """Allows LORIS database connectivity for LORIS-MRI python code base"""
 
 import sys
+import time
 
 import MySQLdb
+from sqlalchemy import Engine
 
 import lib.exitcode
 from lib.config_file import DatabaseConfig
+from lib.db.connect import get_database_engine
+from lib.db.profiling import get_engine_profiler
 
 
 class Database:
@@ -17,7 +21,8 @@ class Database:
 
         from lib.database import Database
 
-        db = Database(config.mysql, verbose)
+        # the database connection is taken from the SQLAlchemy engine pool of the environment
+        db = Database(config.mysql, verbose, env.db_engine)
 
         db.connect()
 
@@ -58,18 +63,30 @@ class Database:
             ('filename.txt', '1')
         )
 
+        # to update multiple rows
+        db.update(
+            "UPDATE media SET file_name = %s WHERE ID = %s,
+            [
+                ('filename.txt', '1'),
+                ('filename2.txt', '2')
+            ]
+        )
+
         db.disconnect()
     """
 
-    def __init__(self, config: DatabaseConfig, verbose: bool):
+    def __init__(self, config: DatabaseConfig, verbose: bool, engine: Engine | None = None):
         """
         Constructor method for the Database class.
 
         :param config:  LORIS database credentials
         :param verbose: whether to be verbose or not
+        :param engine:  SQLAlchemy engine whose connection pool is used, a new
+                        engine is created from the credentials if not provided
         """
 
         self.verbose = verbose
+        self.engine  = engine
 
         # grep database credentials
         self.db_name   = config.database
@@ -77,6 +94,7 @@ class Database:
         self.password  = config.password
         self.host_name = config.host
         self.port      = config.port
+        self.config    = config
 
         if not self.user_name:
             raise Exception("\nUser name cannot be empty string.\n")
@@ -100,17 +118,18 @@ class Database:
         if self.verbose:
             print(connect_statement)
 
+        if self.engine is None:
+            self.engine = get_database_engine(self.config)
+
+        # the queries of this object are recorded if database profiling is enabled
+        self.profiler = get_engine_profiler(self.engine)
+
         try:
-            self.con = MySQLdb.connect(
-                host=self.host_name,
-                user=self.user_name,
-                passwd=self.password,
-                port=self.port,
-                db=self.db_name,
-                autocommit=True,
-            )
-            # self.cnx.cursor = self.cnx.cursor(prepared=True)
-        except MySQLdb.Error as err:
+            # check out a connection from the engine pool, the raw MySQLdb
+            # connection is used to keep the DictCursor and executemany behaviours
+            self.con = self.engine.raw_connection()
+            self.con.driver_connection.autocommit(True)
+        except Exception as err:
             raise Exception("Database connection failure: " + format(err))
 
     def pselect(self, query, args=None):
@@ -133,6 +152,7 @@ class Database:
             if args:
                 print("With arguments:\n\t"  + str(args) + "\n")
 
+        start_time = time.perf_counter()
         try:
             cursor = self.con.cursor(MySQLdb.cursors.DictCursor)
             cursor.execute(query, args) if args else cursor.execute(query)
@@ -141,6 +161,8 @@ class Database:
         except MySQLdb.Error as err:
             raise Exception("Select query failure: " + format(err))
 
+        self._record_query(query, start_time)
+
         return results
 
     def insert(self, table_name, column_names, values, get_last_id=False):
@@ -168,6 +190,7 @@ class Database:
             print("\nExecuting query:\n\t" + query + "\n"
                   + "With arguments:\n\t" + str(values) + "\n")
 
+        start_time = time.perf_counter()
         try:
             cursor = self.con.cursor()
             if isinstance(values, list):
@@ -182,6 +205,8 @@ class Database:
         except MySQLdb.Error as err:
             raise Exception("Insert query failure: " + format(err))
 
+        self._record_query(query, start_time)
+
         if get_last_id:
             return last_id
 
@@ -193,20 +218,42 @@ class Database:
 
         :param query: update query to be run
          :type query: str
-        :param args : arguments to replace the placeholders with
-         :type args : tuple
+        :param args : arguments to replace the placeholders with, or a list of
+                      arguments tuples to run the query once for each of them
+         :type args : tuple | list
         """
 
         if self.verbose:
             print("\nExecuting query:\n\t" + query + "\n"
                   + "With arguments:\n\t"  + str(args) + "\n")
 
+        start_time = time.perf_counter()
         try:
             cursor = self.con.cursor()
-            cursor.execute(query, args)
+            if isinstance(args, list):
+                # if args is a list, use cursor.executemany
+                # (to execute multiple updates at once)
+                cursor.executemany(query, args)
+            else:
+                cursor.execute(query, args)
         except MySQLdb.Error as err:
             raise Exception("Update query failure: " + format(err))
 
+        self._record_query(query, start_time)
+
+    def _record_query(self, query, start_time):
+        """
+        Records the duration of a query if database profiling is enabled.
+
+        :param query     : query that has been executed
+         :type query     : str
+        :param start_time: performance counter value before the query execution
+         :type start_time: float
+        """
+
+        if self.profiler is not None:
+            self.profiler.record(query, time.perf_counter() - start_time)
+
     def grep_id_from_lookup_table(self, id_field_name, table_name, where_field_name,
                                   where_value, insert_if_not_found=None):
         """
@@ -255,15 +302,20 @@ class Database:
     def disconnect(self):
         """
         Terminates the connection previously instantiated to the database if a
-        connection was previously established.
+        connection was previously established. The connection is returned to the
+        engine pool.
         """
 
-        if hasattr(self, 'cnx'):
+        if hasattr(self, 'con'):
             if self.verbose:
                 print("\nDisconnecting from the database")
 
             try:
+                # restore the transactional mode expected by the SQLAlchemy sessions
+                # that will reuse this connection from the pool
+                self.con.driver_connection.autocommit(False)
                 self.con.close()
+                del self.con
             except MySQLdb.Error as err:
                 message = "Database disconnection failure: " + format(err)
                 raise Exception(message)
@@ -117,3 +117,69 @@ class Point3DDB:
         if p is None:
             p = self.insert_point_by_coordinates(x, y, z)
         return p
+
+    def grep_points_by_coordinates(self, coordinates: list[tuple[float, float, float]]):
+        """
+        Grep several points in db by coordinates using a single query.
+        :param coordinates  : list of (x, y, z) coordinates to look for
+         :type coordinates  : list[tuple[float, float, float]]
+        :return: dict of the points found, indexed by their (x, y, z) coordinates
+         :rtype: dict[tuple[float, float, float], Point3D]
+        """
+        if not coordinates:
+            return {}
+
+        placeholders = ', '.join(['(%s, %s, %s)'] * len(coordinates))
+        results = self.db.pselect(
+            query = "SELECT Point3DID, X, Y, Z "
+                    "FROM point_3d "
+                    f"WHERE (X, Y, Z) IN ({placeholders})",
+            args=tuple(value for coordinate in coordinates for value in coordinate)
+        )
+
+        points = {}
+        for row in results:
+            key = (float(row['X']), float(row['Y']), float(row['Z']))
+            # keep the first matching point as grep_point_by_coordinates would
+            if key not in points:
+                points[key] = Point3D(row['Point3DID'], *key)
+
+        return points
+
+    def grep_or_insert_points(self, points: list[Point3D]):
+        """
+        Batched version of grep_or_insert_point.
+        Deduplicate the points by coordinates, grep the existing ones with a single query and
+        insert the missing ones at once.
+        :param points  : list of Point3D objects
+         :type points  : list[Point3D]
+        :return: list of points with their IDs, in the same order as the input points
+         :rtype: list[Point3D]
+        """
+
+        def get_key(p: Point3D):
+            if p.x is None or p.y is None or p.z is None:
+                return (p.x, p.y, p.z)
+            return (float(p.x), float(p.y), float(p.z))
+
+        keys = [get_key(p) for p in points]
+        unique_keys = list(dict.fromkeys(keys))
+
+        # points with a NULL coordinate can never be matched in db, always insert them
+        null_keys = [key for key in unique_keys if None in key]
+        full_keys = [key for key in unique_keys if None not in key]
+
+        found = self.grep_points_by_coordinates(full_keys)
+        missing_keys = [key for key in full_keys if key not in found]
+        if missing_keys:
+            self.db.insert(
+                table_name = 'point_3d',
+                column_names = ('X', 'Y', 'Z'),
+                values = missing_keys
+            )
+            found.update(self.grep_points_by_coordinates(missing_keys))
+
+        for key in null_keys:
+            found[key] = self.insert_point_by_coordinates(*key)
+
+        return [found[key] for key in keys]
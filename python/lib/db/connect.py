@@ -1,11 +1,16 @@
-from sqlalchemy import URL, create_engine
+from sqlalchemy import URL, Engine, create_engine, event
 
 from lib.config_file import DatabaseConfig
 
+# Number of database connections opened by the current script run, across all the engines.
+_opened_connections_count = 0
 
-def get_database_engine(config: DatabaseConfig):
+
+def get_database_engine(config: DatabaseConfig) -> Engine:
     """
-    Connect to the database and return an SQLAlchemy engine using the provided credentials.
+    Connect to the database and return an SQLAlchemy engine using the provided credentials. The
+    engine maintains a pool of connections that is shared by the SQLAlchemy sessions and the legacy
+    database objects of the script.
     """
 
     # The SQLAlchemy URL object notably escapes special characters in the configuration attributes.
@@ -20,4 +25,28 @@ def get_database_engine(config: DatabaseConfig):
 
     # 'READ COMMITTED' means that the records read in a session can be modified by other sessions
     # (such as subscripts or other scripts) during this session's lifetime.
-    return create_engine(url, isolation_level='READ COMMITTED')
+    engine = create_engine(
+        url,
+        isolation_level = 'READ COMMITTED',
+        pool_size       = config.pool_size,
+        max_overflow    = config.max_overflow,
+        pool_recycle    = config.pool_recycle,
+        pool_pre_ping   = True,
+    )
+
+    event.listen(engine, 'connect', _count_opened_connection)
+
+    return engine
+
+
+def get_opened_connections_count() -> int:
+    """
+    Get the number of database connections opened by the current script run.
+    """
+
+    return _opened_connections_count
+
+
+def _count_opened_connection(dbapi_connection: object, connection_record: object):
+    global _opened_connections_count
+    _opened_connections_count += 1
@@ -0,0 +1,154 @@
+import inspect
+import json
+import re
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+from weakref import WeakKeyDictionary
+
+from sqlalchemy import Engine, event
+
+# Name of the environment variable that enables the database profiling of all the scripts.
+PROFILE_DB_ENVIRONMENT_VARIABLE = 'LORIS_PROFILE_DB'
+
+# Modules whose frames are skipped when looking for the pipeline step that runs a query.
+_DATABASE_MODULE_PREFIXES = ('sqlalchemy', 'lib.db.', 'lib.database')
+
+# Profilers of the engines for which database profiling is enabled.
+_engine_profilers: WeakKeyDictionary[Engine, 'DatabaseProfiler'] = WeakKeyDictionary()
+
+
+@dataclass
+class DatabaseTimings:
+    """
+    Durations of the database round-trips of a statement or pipeline step.
+    """
+
+    durations: list[float] = field(default_factory=list[float])
+
+    @property
+    def count(self) -> int:
+        return len(self.durations)
+
+    @property
+    def total_time(self) -> float:
+        return sum(self.durations)
+
+    @property
+    def p95_time(self) -> float:
+        durations = sorted(self.durations)
+        return durations[min(len(durations) - 1, int(len(durations) * 0.95))]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            'count': self.count,
+            'total_time': round(self.total_time, 6),
+            'p95_time': round(self.p95_time, 6),
+        }
+
+
+class DatabaseProfiler:
+    """
+    Records the number and the duration of the database round-trips of a script run, grouped by
+    normalized statement and by pipeline step. The pipeline step of a query is the first function
+    of the call stack that is not part of the database code.
+    """
+
+    def __init__(self):
+        self.statements: dict[str, DatabaseTimings] = {}
+        self.steps: dict[str, DatabaseTimings] = {}
+
+    def listen(self, engine: Engine):
+        """
+        Record the queries executed through an SQLAlchemy engine.
+        """
+
+        event.listen(engine, 'before_cursor_execute', self._before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', self._after_cursor_execute)
+        _engine_profilers[engine] = self
+
+    def record(self, statement: str, duration: float):
+        """
+        Record a database round-trip.
+        """
+
+        normalized_statement = normalize_statement(statement)
+        self.statements.setdefault(normalized_statement, DatabaseTimings()).durations.append(duration)
+        self.steps.setdefault(get_current_step(), DatabaseTimings()).durations.append(duration)
+
+    def get_summary(self, limit: int = 20) -> str:
+        """
+        Get a human-readable summary of the slowest statements and pipeline steps.
+        """
+
+        lines = ['Database profiling summary (count, total time, p95 time):']
+        for title, timings_dict in (('Steps', self.steps), ('Statements', self.statements)):
+            lines.append(f'  {title}:')
+            for name, timings in sorted(timings_dict.items(), key=lambda item: -item[1].total_time)[:limit]:
+                lines.append(
+                    f'    {timings.count:>7} {timings.total_time:>10.3f}s {timings.p95_time * 1000:>10.3f}ms  {name}'
+                )
+
+        return '\n'.join(lines)
+
+    def write_json(self, path: Path):
+        """
+        Write the profiling results in a JSON file.
+        """
+
+        data = {
+            'steps': {name: timings.to_dict() for name, timings in self.steps.items()},
+            'statements': {name: timings.to_dict() for name, timings in self.statements.items()},
+        }
+
+        with open(path, 'w') as file:
+            json.dump(data, file, indent=2)
+
+    def _before_cursor_execute(self, conn: Any, cursor: Any, statement: str, parameters: Any, context: Any,
+                               executemany: bool):
+        conn.info.setdefault('query_start_time', []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn: Any, cursor: Any, statement: str, parameters: Any, context: Any,
+                              executemany: bool):
+        start_time = conn.info['query_start_time'].pop()
+        self.record(statement, time.perf_counter() - start_time)
+
+
+def get_engine_profiler(engine: Engine) -> DatabaseProfiler | None:
+    """
+    Get the database profiler of an SQLAlchemy engine if database profiling is enabled.
+    """
+
+    return _engine_profilers.get(engine)
+
+
+def normalize_statement(statement: str) -> str:
+    """
+    Normalize an SQL statement so that the executions of a same query with different values are
+    grouped together.
+    """
+
+    statement = re.sub(r"'(?:[^'\\]|\\.)*'", '?', statement)
+    statement = re.sub(r'\b\d+(\.\d+)?\b', '?', statement)
+    statement = re.sub(r'%s|%\(\w+\)s', '?', statement)
+    statement = re.sub(r'\(\s*\?(\s*,\s*\?)*\s*\)(\s*,\s*\(\s*\?(\s*,\s*\?)*\s*\))*', '(?)', statement)
+    return re.sub(r'\s+', ' ', statement).strip()
+
+
+def get_current_step() -> str:
+    """
+    Get the name of the pipeline step that is running the current database query, that is, the
+    first function of the call stack that is not part of the database code.
+    """
+
+    frame = inspect.currentframe()
+    frame = frame.f_back if frame is not None else None
+    while frame is not None:
+        module_name = frame.f_globals.get('__name__', '')
+        if not module_name.startswith(_DATABASE_MODULE_PREFIXES):
+            return f'{module_name}.{frame.f_code.co_name}'
+
+        frame = frame.f_back
+
+    return 'unknown'
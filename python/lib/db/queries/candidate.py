@@ -1,3 +1,5 @@
+from collections.abc import Iterable, Sequence
+
 from sqlalchemy import select
 from sqlalchemy.orm import Session as Database
 
@@ -22,3 +24,23 @@ def try_get_candidate_with_psc_id(db: Database, psc_id: str) -> DbCandidate | No
     return db.execute(select(DbCandidate)
         .where(DbCandidate.psc_id == psc_id)
     ).scalar_one_or_none()
+
+
+def get_candidates_with_cand_ids(db: Database, cand_ids: Iterable[int]) -> Sequence[DbCandidate]:
+    """
+    Get the candidates from the database that have one of the given CandIDs.
+    """
+
+    return db.execute(select(DbCandidate)
+        .where(DbCandidate.cand_id.in_(cand_ids))
+    ).scalars().all()
+
+
+def get_candidates_with_psc_ids(db: Database, psc_ids: Iterable[str]) -> Sequence[DbCandidate]:
+    """
+    Get the candidates from the database that have one of the given PSCIDs.
+    """
+
+    return db.execute(select(DbCandidate)
+        .where(DbCandidate.psc_id.in_(psc_ids))
+    ).scalars().all()
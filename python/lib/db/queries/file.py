@@ -1,3 +1,4 @@
+from collections.abc import Iterable, Sequence
 from pathlib import Path
 
 from sqlalchemy import delete, select
@@ -64,6 +65,31 @@ def try_get_file_with_hash(db: Database, file_hash: str) -> DbFile | None:
     ).scalar_one_or_none()
 
 
+def get_files_with_paths(db: Database, paths: Iterable[Path]) -> Sequence[DbFile]:
+    """
+    Get the imaging files from the database that have one of the given paths.
+    """
+
+    return db.execute(select(DbFile)
+        .where(DbFile.path.in_(paths))
+    ).scalars().all()
+
+
+def get_registered_file_hashes(db: Database, file_hashes: Iterable[str]) -> set[str]:
+    """
+    Get the hashes among the given BLAKE2b or MD5 hashes that are registered for an imaging file
+    in the database.
+    """
+
+    registered_file_hashes = db.execute(select(DbFileParameter.value)
+        .join(DbFileParameter.type)
+        .where(DbParameterType.name.in_(['file_blake2b_hash', 'md5hash']))
+        .where(DbFileParameter.value.in_(file_hashes))
+    ).scalars().all()
+
+    return {file_hash for file_hash in registered_file_hashes if file_hash is not None}
+
+
 def delete_file(db: Database, file_id: int):
     """
     Delete from the database a file entry based on a file ID.
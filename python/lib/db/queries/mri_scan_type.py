@@ -1,3 +1,5 @@
+from collections.abc import Sequence
+
 from sqlalchemy import select
 from sqlalchemy.orm import Session as Database
 
@@ -23,3 +25,11 @@ def try_get_mri_scan_type_with_name(db: Database, name: str) -> DbMriScanType |
     return db.execute(select(DbMriScanType)
         .where(DbMriScanType.name == name)
     ).scalar_one_or_none()
+
+
+def get_all_mri_scan_types(db: Database) -> Sequence[DbMriScanType]:
+    """
+    Get all the MRI scan types from the database.
+    """
+
+    return db.execute(select(DbMriScanType)).scalars().all()
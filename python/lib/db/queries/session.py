@@ -1,3 +1,4 @@
+from collections.abc import Iterable, Sequence
 
 from sqlalchemy import select
 from sqlalchemy.orm import Session as Database
@@ -27,3 +28,13 @@ def try_get_session_with_cand_id_visit_label(db: Database, cand_id: int, visit_l
         .where(DbSession.visit_label == visit_label)
         .where(DbCandidate.cand_id == cand_id)
     ).scalar_one_or_none()
+
+
+def get_sessions_with_candidate_ids(db: Database, candidate_ids: Iterable[int]) -> Sequence[DbSession]:
+    """
+    Get the sessions from the database of the candidates that have one of the given IDs.
+    """
+
+    return db.execute(select(DbSession)
+        .where(DbSession.candidate_id.in_(candidate_ids))
+    ).scalars().all()
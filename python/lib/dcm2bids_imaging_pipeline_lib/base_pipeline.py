@@ -4,7 +4,6 @@ from pathlib import Path
 
 import lib.exitcode
 from lib.config import get_data_dir_path_config, get_dicom_archive_dir_path_config
-from lib.database import Database
 from lib.database_lib.config import Config
 from lib.db.queries.dicom_archive import try_get_dicom_archive_with_archive_path
 from lib.db.queries.mri_upload import try_get_mri_upload_with_id
@@ -51,8 +50,7 @@ class BasePipeline:
         # ----------------------------------------------------
         # Establish database connection
         # ----------------------------------------------------
-        self.db = Database(self.config_file.mysql, self.verbose)
-        self.db.connect()
+        self.db = self.loris_getopt_obj.db
 
         # -----------------------------------------------------------------------------------
         # Load the Imaging database class
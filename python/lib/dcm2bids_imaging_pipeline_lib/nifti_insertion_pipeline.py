@@ -9,7 +9,7 @@ from pathlib import Path
 from loris_bids_importer.file_type import get_check_bids_imaging_file_type_from_extension
 from loris_bids_importer.mri.sidecar import add_bids_mri_sidecar_file_parameters, get_bids_mri_sidecar_session_info
 from loris_bids_utils.mri.sidecar import BidsMriSidecarJsonFile
-from loris_utils.crypto import compute_file_blake2b_hash, compute_file_md5_hash
+from loris_utils.crypto import compute_files_hashes
 
 import lib.exitcode
 from lib.db.queries.dicom_archive import try_get_dicom_archive_series_with_series_uid_echo_time
@@ -49,19 +49,29 @@ class NiftiInsertionPipeline(BasePipeline):
         self.nifti_path = self.options_dict["nifti_path"]["value"]
         self.nifti_s3_url = self.options_dict["nifti_path"]["s3_url"] \
             if 's3_url' in self.options_dict["nifti_path"].keys() else None
-        self.nifti_blake2 = compute_file_blake2b_hash(self.nifti_path)
-        self.nifti_md5 = compute_file_md5_hash(self.nifti_path)
         self.sidecar_json = self._load_json_sidecar_file()
+        self.bval_path = self.options_dict["bval_path"]["value"]
+        self.bvec_path = self.options_dict["bvec_path"]["value"]
+
+        # Compute the BLAKE2b and MD5 hashes of all the files concurrently, reading each file once.
+        files_hashes = compute_files_hashes([
+            file_path for file_path in (
+                self.nifti_path,
+                self.sidecar_json.path if self.sidecar_json is not None else None,
+                self.bval_path,
+                self.bvec_path,
+            ) if file_path
+        ])
+        self.nifti_blake2 = files_hashes[self.nifti_path]['blake2b']
+        self.nifti_md5 = files_hashes[self.nifti_path]['md5']
         if self.sidecar_json is not None:
-            self.json_blake2 = compute_file_blake2b_hash(self.sidecar_json.path)
-            self.json_md5 = compute_file_md5_hash(self.sidecar_json.path)
+            self.json_blake2 = files_hashes[self.sidecar_json.path]['blake2b']
+            self.json_md5 = files_hashes[self.sidecar_json.path]['md5']
         else:
             self.json_blake2 = None
             self.json_md5 = None
-        self.bval_path = self.options_dict["bval_path"]["value"]
-        self.bval_blake2 = compute_file_blake2b_hash(self.bval_path) if self.bval_path else None
-        self.bvec_path = self.options_dict["bvec_path"]["value"]
-        self.bvec_blake2 = compute_file_blake2b_hash(self.bvec_path) if self.bval_path else None
+        self.bval_blake2 = files_hashes[self.bval_path]['blake2b'] if self.bval_path else None
+        self.bvec_blake2 = files_hashes[self.bvec_path]['blake2b'] if self.bvec_path else None
         self.loris_scan_type = self.options_dict["loris_scan_type"]["value"]
         self.bypass_extra_checks = self.options_dict["bypass_extra_checks"]["value"]
         self.create_pic_bool = self.options_dict["create_pic"]["value"]
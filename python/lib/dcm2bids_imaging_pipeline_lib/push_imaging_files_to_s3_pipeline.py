@@ -59,15 +59,15 @@ class PushImagingFilesToS3Pipeline(BasePipeline):
         # ------------------------------------------------------------------------------------------
         # Update table file paths and delete file from file system
         # ------------------------------------------------------------------------------------------
-        for file_info in self.files_to_push_list:
+        pushed_files_list = self._get_pushed_files_list()
+        self._update_database_tables_with_s3_paths(pushed_files_list)
+        for file_info in pushed_files_list:
             rel_path = file_info["original_file_path_field_value"]
             full_path = os.path.join(self.data_dir, rel_path)
-            if self.s3_obj.check_if_file_key_exists_in_bucket(rel_path):
-                self._update_database_tables_with_s3_path(file_info)
-                print(f"Deletion of {rel_path} on the local file system")
-                if os.path.isfile(full_path):
-                    # if mri_violations is warning, the file might already have been deleted
-                    os.remove(full_path)
+            print(f"Deletion of {rel_path} on the local file system")
+            if os.path.isfile(full_path):
+                # if mri_violations is warning, the file might already have been deleted
+                os.remove(full_path)
 
         self._clean_up_empty_folders()
         self.mri_upload.inserting = False
@@ -224,45 +224,62 @@ class PushImagingFilesToS3Pipeline(BasePipeline):
 
     def _upload_files_to_s3(self):
         """
-        Loop through the list of files to push to S3 and upload them to the S3 bucket.
+        Upload the list of files to push to S3 to the S3 bucket, several files being transferred
+        concurrently.
         """
 
+        files_to_upload = []
         for file in self.files_to_push_list:
             file_full_path = os.path.join(self.data_dir, file["original_file_path_field_value"])
             s3_path = file["original_file_path_field_value"]
             file["s3_link"] = "/".join(["s3:/", self.s3_obj.bucket_name, s3_path])
+            files_to_upload.append((file_full_path, file["s3_link"]))
 
-            self.s3_obj.upload_file(file_full_path, file["s3_link"])
+        self.s3_obj.upload_files(files_to_upload)
 
-    def _update_database_tables_with_s3_path(self, file_info):
+    def _get_pushed_files_list(self):
+        """
+        Get the list of files to push that are present in the S3 bucket. The upload prefix of the
+        files is listed once rather than checked once per file.
+
+        :return: list of the files to push found in the S3 bucket
+         :rtype: list
+        """
+
+        s3_keys = self.s3_obj.list_objects_with_keys([
+            file["original_file_path_field_value"].lstrip("/") for file in self.files_to_push_list
+        ]).keys()
+
+        return [
+            file for file in self.files_to_push_list
+            if file["original_file_path_field_value"].lstrip("/") in s3_keys
+        ]
+
+    def _update_database_tables_with_s3_paths(self, files_list):
         """
         Update the database tables with the new S3 path for the files that were pushed to the
-        bucket.
+        bucket, using one batched query per table.
 
-        :param file_info: dictionary with the table row information for the file to update
-         :type file_info: dict
+        :param files_list: list of dictionaries with the table row information of the files
+         :type files_list: list
         """
 
-        table_name = file_info["table_name"]
-        s3_link = file_info["s3_link"]
-        entry_id = file_info["id_field_value"] if "id_field_value" in file_info.keys() else None
-        field_to_update = file_info["file_path_field_name"] if "file_path_field_name" in file_info.keys() else None
-
-        if not table_name:
-            # for extra JSON, BVAL and BVEC files in violation tables that are not registered in DB
-            # for now
-            return
-        elif table_name == "parameter_file":
-            print(f"UPDATING TABLE {table_name} with link {s3_link}")
-            self.imaging_obj.param_file_db_obj.update_parameter_file(s3_link, entry_id)
-        elif table_name == "files":
-            self.imaging_obj.files_db_obj.update_files(entry_id, (field_to_update,), (s3_link,))
-        elif table_name == "mri_protocol_violated_scans":
-            self.imaging_obj.mri_prot_viol_scan_db_obj.update_protocol_violated_scans(
-                entry_id, (field_to_update,), (s3_link,)
+        updates = {}
+        for file_info in files_list:
+            if not file_info["table_name"]:
+                # for extra JSON, BVAL and BVEC files in violation tables that are not registered in
+                # DB for now
+                continue
+
+            update_key = (file_info["table_name"], file_info["file_path_field_name"], file_info["id_field_name"])
+            updates.setdefault(update_key, []).append((file_info["s3_link"], file_info["id_field_value"]))
+
+        for (table_name, field_to_update, id_field_name), values in updates.items():
+            print(f"UPDATING TABLE {table_name} with {len(values)} S3 links")
+            self.db.update(
+                query=f"UPDATE {table_name} SET {field_to_update} = %s WHERE {id_field_name} = %s",
+                args=values
             )
-        elif table_name == "mri_violations_log":
-            self.imaging_obj.mri_viol_log_db_obj.update_violations_log(entry_id, (field_to_update,), (s3_link,))
 
     def _clean_up_empty_folders(self):
         """
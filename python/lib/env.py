@@ -7,6 +7,7 @@ from sqlalchemy import Engine
 from sqlalchemy.orm import Session
 
 from lib.db.models.notification_type import DbNotificationType
+from lib.db.profiling import DatabaseProfiler
 from lib.db.queries.notification import try_get_notification_type_with_name
 
 
@@ -43,6 +44,7 @@ class Env:
     verbose: bool
     cleanups: list[Callable[[], None]]
     notifier: Notifier | None = None
+    db_profiler: DatabaseProfiler | None = None
 
     def add_cleanup(self, cleanup: Callable[[], None]):
         """
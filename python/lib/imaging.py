@@ -8,6 +8,7 @@ import tarfile
 
 import nibabel as nib
 from loris_utils.crypto import compute_file_blake2b_hash
+from loris_utils.fs import replace_file_text
 from nilearn import image, plotting
 from typing_extensions import deprecated
 
@@ -1074,40 +1075,73 @@ class Imaging:
          :type tmp_dir: str
         """
 
-        for fmap_dict in sorted_fmap_files_list:
-            if 'IntendedFor' not in fmap_dict:
-                continue
-            json_file_path = ''
+        fmap_dicts = [fmap_dict for fmap_dict in sorted_fmap_files_list if 'IntendedFor' in fmap_dict]
+
+        param_type_id = self.param_type_db_obj.get_parameter_type_id('bids_json_file_blake2b_hash')
+        param_file_dicts = {
+            fmap_dict['FileID']: self.param_file_db_obj.get_parameter_file_for_file_id_param_type_id(
+                fmap_dict['FileID'],
+                param_type_id
+            )
+            for fmap_dict in fmap_dicts
+        }
+
+        # download all the JSON files that are on S3 in one concurrent batch, the stored hashes
+        # allow to reuse the files of the S3 cache if one is configured
+        json_file_paths = {}
+        s3_downloads = []
+        data_dir = self.config_db_obj.get_config('dataDirBasepath')
+        for fmap_dict in fmap_dicts:
             if fmap_dict['json_file_path'].startswith('s3://'):
-                try:
-                    json_file_path = os.path.join(tmp_dir, os.path.basename(fmap_dict['json_file_path']))
-                    s3_obj.download_file(fmap_dict['json_file_path'], json_file_path)
-                except Exception as err:
-                    print(err)
-                    continue
+                json_file_path = os.path.join(tmp_dir, os.path.basename(fmap_dict['json_file_path']))
+                param_file_dict = param_file_dicts[fmap_dict['FileID']]
+                s3_downloads.append((
+                    fmap_dict['json_file_path'],
+                    json_file_path,
+                    param_file_dict['Value'] if param_file_dict else None
+                ))
             else:
-                data_dir = self.config_db_obj.get_config('dataDirBasepath')
                 json_file_path = os.path.join(data_dir, fmap_dict['json_file_path'])
+            json_file_paths[fmap_dict['json_file_path']] = json_file_path
+
+        if s3_downloads:
+            try:
+                s3_obj.download_files(s3_downloads)
+            except Exception as err:
+                print(err)
+
+        s3_uploads = []
+        for fmap_dict in fmap_dicts:
+            json_file_path = json_file_paths[fmap_dict['json_file_path']]
+            # a JSON file on S3 that failed to download is skipped, a missing local JSON file is
+            # an error
+            if fmap_dict['json_file_path'].startswith('s3://') and not os.path.exists(json_file_path):
+                print(f"WARNING: could not download {fmap_dict['json_file_path']}, IntendedFor not updated")
+                continue
 
             with open(json_file_path) as json_file:
                 json_data = json.load(json_file)
             json_data['IntendedFor'] = fmap_dict['IntendedFor']
-            with open(json_file_path, 'w') as json_file:
-                json_file.write(json.dumps(json_data, indent=4))
+            # the file may be linked to a source dataset file, so it is replaced rather than
+            # modified in place
+            replace_file_text(json_file_path, json.dumps(json_data, indent=4))
             json_blake2 = compute_file_blake2b_hash(json_file_path)
-            param_type_id = self.param_type_db_obj.get_parameter_type_id('bids_json_file_blake2b_hash')
-            param_file_dict = self.param_file_db_obj.get_parameter_file_for_file_id_param_type_id(
-                fmap_dict['FileID'],
-                param_type_id
-            )
+            param_file_dict = param_file_dicts[fmap_dict['FileID']]
             self.param_file_db_obj.update_parameter_file(json_blake2, param_file_dict['ParameterFileID'])
 
             if fmap_dict['json_file_path'].startswith('s3://'):
-                try:
-                    s3_obj.upload_file(json_file_path, fmap_dict['json_file_path'])
-                except Exception as err:
-                    print(err)
-                    continue
+                # cache the modified file under its new hash, which is the one the next download of
+                # the file will look for
+                if s3_obj.file_cache:
+                    s3_obj.file_cache.put(json_blake2, json_file_path)
+                s3_uploads.append((json_file_path, fmap_dict['json_file_path']))
+
+        # upload the modified JSON files back to S3 in one concurrent batch
+        if s3_uploads:
+            try:
+                s3_obj.upload_files(s3_uploads)
+            except Exception as err:
+                print(err)
 
     @staticmethod
     def get_intended_for_list_of_scans_after_fieldmap_acquisition_based_on_acq_time(files_list, current_fmap_acq_time,
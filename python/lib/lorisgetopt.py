@@ -5,6 +5,7 @@ import sys
 
 import lib.exitcode
 from lib.aws_s3 import AwsS3
+from lib.aws_s3_cache import S3FileCache
 from lib.config_file import load_config
 from lib.database import Database
 from lib.database_lib.config import Config
@@ -68,6 +69,20 @@ class LorisGetOpt:
         self.usage = usage
         self.script_name = script_name
         self.options_dict = options_dict
+
+        # Option available in all the scripts to record the database queries timings
+        self.options_dict.setdefault("profile-db", {
+            "value": False, "required": False, "expect_arg": False, "short_opt": None, "is_path": False
+        })
+
+        # Options available in all the scripts to disable or verify the persistent hash cache
+        self.options_dict.setdefault("no-hash-cache", {
+            "value": False, "required": False, "expect_arg": False, "short_opt": None, "is_path": False
+        })
+        self.options_dict.setdefault("paranoid-hash-cache", {
+            "value": False, "required": False, "expect_arg": False, "short_opt": None, "is_path": False
+        })
+
         self.long_options = self.get_long_options()
         self.short_options = self.get_short_options()
         self.config_info = None
@@ -98,7 +113,7 @@ class LorisGetOpt:
         # ------------------------------------------------------------------------------------------
         self.config_file = self.config_info
         self.verbose = self.options_dict["verbose"]["value"]
-        self.db = Database(self.config_file.mysql, self.verbose)
+        self.db = Database(self.config_file.mysql, self.verbose, self.env.db_engine)
         self.db.connect()
 
         # ------------------------------------------------------------------------------------------
@@ -118,12 +133,20 @@ class LorisGetOpt:
             if not s3_endpoint or not s3_bucket_name:
                 print('\n[ERROR   ] missing configuration for S3 endpoint URL or S3 bucket name\n')
                 sys.exit(lib.exitcode.S3_SETTINGS_FAILURE)
+            file_cache = None
+            if self.config_file.s3.cache_dir_path:
+                file_cache = S3FileCache(
+                    self.config_file.s3.cache_dir_path,
+                    self.config_file.s3.cache_max_size * 1024 ** 3
+                )
             try:
                 self.s3_obj = AwsS3(
                     aws_access_key_id=self.config_file.s3.aws_access_key_id,
                     aws_secret_access_key=self.config_file.s3.aws_secret_access_key,
                     aws_endpoint_url=s3_endpoint,
-                    bucket_name=s3_bucket_name
+                    bucket_name=s3_bucket_name,
+                    max_concurrent_transfers=self.config_file.s3.max_concurrent_transfers,
+                    file_cache=file_cache
                 )
             except Exception as err:
                 print(
@@ -157,6 +180,8 @@ class LorisGetOpt:
         short_options = []
         for key in self.options_dict:
             short_opt = self.options_dict[key]["short_opt"]
+            if short_opt is None:
+                continue
             option = f"{short_opt}:" if self.options_dict[key]["expect_arg"] else short_opt
             short_options.append(option)
 
@@ -176,7 +201,8 @@ class LorisGetOpt:
                 self.check_option_is_in_the_list_of_possible_options(opt)
                 for key in self.options_dict:
                     long_opt = f"--{key}"
-                    short_opt = f"-{self.options_dict[key]['short_opt']}"
+                    short_opt = f"-{self.options_dict[key]['short_opt']}" \
+                        if self.options_dict[key]['short_opt'] else None
                     if opt in (long_opt, short_opt):
                         if not self.options_dict[key]["expect_arg"]:
                             arg = True
@@ -210,24 +236,11 @@ class LorisGetOpt:
         script is valid. If not, exits with error message and show the script's usage.
         """
 
+        s3_options = {}
         for key in self.options_dict:
             opt_value = self.options_dict[key]["value"]
             if self.options_dict[key]["is_path"] and opt_value and opt_value.startswith('s3://'):
-                if not self.s3_obj:
-                    print(
-                        f"\n[ERROR   ] No valid S3 connection, please check that S3 is correctly configured"
-                        f" in {self.options_dict['profile']['value']} and Config module"
-                    )
-                    sys.exit(lib.exitcode.S3_SETTINGS_FAILURE)
-                try:
-                    file_path = os.path.join(self.tmp_dir, os.path.basename(os.path.normpath(opt_value)))
-                    self.s3_obj.download_file(opt_value, file_path)
-                    self.options_dict[key]["s3_url"] = opt_value
-                    self.options_dict[key]["value"] = file_path
-                except Exception as err:
-                    print(f"[ERROR   ] {opt_value} could not be downloaded from S3 bucket. Error was\n{err}")
-                    print(self.usage)
-                    sys.exit(lib.exitcode.INVALID_PATH)
+                s3_options[key] = opt_value
             elif self.options_dict[key]["is_path"] and opt_value and not (
                 os.path.isfile(opt_value) or os.path.isdir(opt_value)
             ) :
@@ -235,6 +248,51 @@ class LorisGetOpt:
                 print(self.usage)
                 sys.exit(lib.exitcode.INVALID_PATH)
 
+        if s3_options:
+            self.prefetch_s3_options(s3_options)
+
+    def prefetch_s3_options(self, s3_options):
+        """
+        Download concurrently in the temporary directory all the S3 files provided as options to
+        the script (NIfTI file, JSON sidecar, BVAL and BVEC files...), and replace the values of
+        these options by the paths of the downloaded files. If a file cannot be downloaded, exits
+        with error message and show the script's usage.
+
+        :param s3_options: dictionary of the S3 URLs to download, indexed by option name
+         :type s3_options: dict[str, str]
+        """
+
+        if not self.s3_obj:
+            print(
+                f"\n[ERROR   ] No valid S3 connection, please check that S3 is correctly configured"
+                f" in {self.options_dict['profile']['value']} and Config module"
+            )
+            sys.exit(lib.exitcode.S3_SETTINGS_FAILURE)
+
+        file_paths = {
+            key: os.path.join(self.tmp_dir, os.path.basename(os.path.normpath(opt_value)))
+            for key, opt_value in s3_options.items()
+        }
+
+        try:
+            self.s3_obj.download_files([(s3_options[key], file_paths[key]) for key in s3_options])
+        except Exception as err:
+            print(
+                f"[ERROR   ] {', '.join(s3_options.values())} could not be downloaded from S3 bucket."
+                f" Error was\n{err}"
+            )
+            print(self.usage)
+            sys.exit(lib.exitcode.INVALID_PATH)
+
+        for key, opt_value in s3_options.items():
+            if not os.path.exists(file_paths[key]):
+                print(f"[ERROR   ] {opt_value} could not be found in S3 bucket.")
+                print(self.usage)
+                sys.exit(lib.exitcode.INVALID_PATH)
+
+            self.options_dict[key]["s3_url"] = opt_value
+            self.options_dict[key]["value"] = file_paths[key]
+
     def check_option_is_in_the_list_of_possible_options(self, opt):
         """
         Checks that the option provided is indeed in the list of possible options.
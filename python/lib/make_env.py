@@ -1,17 +1,29 @@
+import atexit
+import os
+import sqlite3
 import sys
 import tempfile
 from datetime import datetime
 from pathlib import Path
 from typing import Any, cast
 
+from loris_utils.crypto import set_file_hash_cache
+from loris_utils.hash_cache import FileHashCache
 from sqlalchemy.orm import Session
 
 import lib.exitcode
 from lib.config_file import DatabaseConfig
-from lib.db.connect import get_database_engine
+from lib.db.connect import get_database_engine, get_opened_connections_count
+from lib.db.profiling import PROFILE_DB_ENVIRONMENT_VARIABLE, DatabaseProfiler
 from lib.db.queries.config import try_get_config_with_setting_name
 from lib.env import Env
-from lib.logging import log_verbose, write_to_log_file
+from lib.logging import log_verbose, log_warning, write_to_log_file
+
+# Name of the environment variable that disables the persistent hash cache in all the scripts.
+NO_HASH_CACHE_ENVIRONMENT_VARIABLE = 'LORIS_NO_HASH_CACHE'
+
+# Proportion of the hash cache hits that are verified by hashing the file again in paranoid mode.
+PARANOID_HASH_CACHE_VERIFY_RATE = 0.1
 
 
 def make_env(
@@ -38,6 +50,15 @@ def make_env(
         )
 
     engine = get_database_engine(db_config)
+
+    # Enable the database profiling if requested, before any query is executed
+    profile_db = script_options.get('profile-db', {}).get('value') or os.environ.get(PROFILE_DB_ENVIRONMENT_VARIABLE)
+    if profile_db:
+        db_profiler = DatabaseProfiler()
+        db_profiler.listen(engine)
+    else:
+        db_profiler = None
+
     db = Session(engine)
 
     # Create the log file
@@ -65,6 +86,7 @@ def make_env(
         log_file_path,
         verbose,
         [],
+        db_profiler = db_profiler,
     )
 
     log_file_header = get_log_file_header(env, script_options)
@@ -72,9 +94,56 @@ def make_env(
 
     log_verbose(env, 'Successfully connected to the database')
 
+    # Enable the persistent hash cache unless disabled
+    no_hash_cache = script_options.get('no-hash-cache', {}).get('value') \
+        or os.environ.get(NO_HASH_CACHE_ENVIRONMENT_VARIABLE)
+    if not no_hash_cache:
+        paranoid_hash_cache = script_options.get('paranoid-hash-cache', {}).get('value')
+        try:
+            file_hash_cache = FileHashCache(
+                data_dir / 'hash_cache.sqlite',
+                PARANOID_HASH_CACHE_VERIFY_RATE if paranoid_hash_cache else 0.0,
+                lambda message: log_warning(env, message),
+            )
+        except sqlite3.Error as error:
+            log_warning(env, f"Could not open the hash cache, files will be hashed without it: {error}")
+        else:
+            set_file_hash_cache(file_hash_cache)
+            atexit.register(write_hash_cache_summary, env, file_hash_cache)
+
+    atexit.register(write_database_connections_summary, env)
+    if db_profiler is not None:
+        atexit.register(write_database_profiling_summary, env, db_profiler)
+
     return env
 
 
+def write_database_connections_summary(env: Env):
+    """
+    Write the number of database connections opened by the script run in its log file.
+    """
+
+    write_to_log_file(env, f"Database connections opened during this run: {get_opened_connections_count()}")
+
+
+def write_hash_cache_summary(env: Env, file_hash_cache: FileHashCache):
+    """
+    Write the hash cache usage summary in the log file of the script run.
+    """
+
+    write_to_log_file(env, file_hash_cache.get_summary())
+
+
+def write_database_profiling_summary(env: Env, db_profiler: DatabaseProfiler):
+    """
+    Write the database profiling summary in the log file of the script run, and the full profiling
+    results in a JSON file next to it.
+    """
+
+    write_to_log_file(env, db_profiler.get_summary())
+    db_profiler.write_json(env.log_file_path.with_suffix('.db_profile.json'))
+
+
 def get_log_file_header(env: Env, script_options: dict[str, Any]):
     run_info = env.log_file_path.name[:-13]
     title = run_info.replace('_', ' ').upper()
@@ -7,14 +7,13 @@ from typing import Any
 from lib.db.models.physio_task_event_hed import DbPhysioTaskEventHed
 from lib.db.models.physio_task_event_opt import DbPhysioTaskEventOpt
 from lib.db.models.physio_task_event import DbPhysioTaskEvent
-from lib.db.queries.hed_schema_node import get_all_hed_schema_nodes
 from lib.db.models.bids_event_dataset_mapping import DbBidsEventDatasetMapping
 from lib.db.models.bids_event_file_mapping import DbBidsEventFileMapping
 from lib.db.models.physio_event_file import DbPhysioEventFile
 from lib.db.models.physio_file import DbPhysioFile
 from lib.db.models.project import DbProject
 from lib.env import Env
-from lib.physio.hed import TagGroupMember, build_hed_tag_groups
+from lib.physio.hed import TagGroupMember, build_hed_tag_groups, get_hed_schema_lookup
 
 
 @dataclass
@@ -166,7 +165,7 @@ def parse_and_insert_event_dict(
 
     # This function uses a lot of legacy code and was copied from the `Physiological` class.
 
-    hed_union = get_all_hed_schema_nodes(env.db)
+    hed_schema = get_hed_schema_lookup(env.db)
 
     tag_dict: dict[str, dict[str, list[list[TagGroupMember]]]] = {}
 
@@ -194,7 +193,7 @@ def parse_and_insert_event_dict(
                     else None
 
                 if level_hed:
-                    tag_groups: list[list[TagGroupMember]] = build_hed_tag_groups(hed_union, level_hed)
+                    tag_groups: list[list[TagGroupMember]] = build_hed_tag_groups(hed_schema, level_hed)
                     for tag_group in tag_groups:
                         insert_bids_event_mapping(env, source, event_name, level_name, level_description, tag_group)
                     tag_dict[event_name][level_name] = tag_groups
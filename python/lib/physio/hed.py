@@ -1,16 +1,16 @@
 import csv
-import io
+import json
 import re
-from collections.abc import Sequence
+from collections.abc import Iterator, Sequence
 from dataclasses import dataclass
 from functools import reduce
 from pathlib import Path
-from typing import Any
+from typing import Any, cast
 
-import requests
-from loris_utils.iter import find
+from sqlalchemy.orm import Session as Database
 
 from lib.db.models.hed_schema_node import DbHedSchemaNode
+from lib.db.queries.hed_schema_node import get_all_hed_schema_nodes
 
 
 @dataclass
@@ -30,6 +30,94 @@ class TagGroupMember:
             and self.additional_members == other.additional_members
         )
 
+    def get_key(self) -> tuple[int | None, bool, int]:
+        """
+        Get a hashable key of this tag group member, consistent with its equality.
+        """
+
+        return (self.hed_tag_id, self.has_pairing, self.additional_members)
+
+
+# Top-level nodes of the HED 8 standard schema that do not have the `extensionAllowed` attribute,
+# which is inherited by their descendants. The attributes of the HED schema nodes are not stored in
+# the database.
+HED_NON_EXTENSIBLE_TAGS = {'Event', 'Agent'}
+
+
+class HedSchemaLookup:
+    """
+    Compiled lookup of the HED schema nodes present in the database, indexed by tag name and tag
+    long name. This class also memoises the parsed HED strings, which are often repeated across
+    the rows of an events file.
+    """
+
+    def __init__(self, hed_nodes: Sequence[DbHedSchemaNode]):
+        self.nodes_by_name: dict[str, DbHedSchemaNode] = {}
+        self.nodes_by_long_name: dict[str, DbHedSchemaNode] = {}
+        self.nodes_by_id: dict[int, DbHedSchemaNode] = {}
+        # Nodes indexed by lowercase name, used to validate the short form HED tags.
+        self.nodes_by_lower_name: dict[str, DbHedSchemaNode] = {}
+        # Child nodes indexed by parent node ID and lowercase name, used to validate HED tags.
+        self.children: dict[tuple[int, str], DbHedSchemaNode] = {}
+        self.tag_groups_cache: dict[str, list[list[TagGroupMember]]] = {}
+
+        # Keep the first node found for a given name to match the previous linear search.
+        for hed_node in hed_nodes:
+            self.nodes_by_name.setdefault(hed_node.name, hed_node)
+            self.nodes_by_long_name.setdefault(hed_node.long_name, hed_node)
+            self.nodes_by_lower_name.setdefault(hed_node.name.lower(), hed_node)
+            self.nodes_by_id[hed_node.id] = hed_node
+            if hed_node.parent_id is not None:
+                self.children.setdefault((hed_node.parent_id, hed_node.name.lower()), hed_node)
+
+    def find_node(self, tag_string: str) -> DbHedSchemaNode | None:
+        """
+        Find the HED schema node of a tag using its full path if possible, or its leaf name
+        otherwise.
+        """
+
+        hed_node = self.nodes_by_long_name.get(tag_string)
+        if hed_node is not None:
+            return hed_node
+
+        leaf_node = tag_string.split('/')[-1]  # LIMITED SUPPORT FOR NOW - NO VALUES OR DEFS
+        return self.nodes_by_name.get(leaf_node)
+
+    def takes_value(self, hed_node: DbHedSchemaNode) -> bool:
+        """
+        Check whether a HED schema node takes a value, that is, whether it has a `#` child node.
+        """
+
+        return (hed_node.id, '#') in self.children
+
+    def allows_extension(self, hed_node: DbHedSchemaNode) -> bool:
+        """
+        Check whether a HED schema node can be extended with child tags that are not in the
+        schema. The `extensionAllowed` attribute is inherited from the top-level nodes.
+        """
+
+        if hed_node.name == '#':
+            return False
+
+        while hed_node.parent_id is not None:
+            hed_node = self.nodes_by_id[hed_node.parent_id]
+
+        return hed_node.name not in HED_NON_EXTENSIBLE_TAGS
+
+
+def get_hed_schema_lookup(db: Database) -> HedSchemaLookup:
+    """
+    Get the compiled HED schema lookup of the database. The lookup is built on the first call and
+    then kept in the database session information for the following calls.
+    """
+
+    hed_schema = db.info.get('hed_schema_lookup')
+    if hed_schema is None:
+        hed_schema = HedSchemaLookup(get_all_hed_schema_nodes(db))
+        db.info['hed_schema_lookup'] = hed_schema
+
+    return hed_schema
+
 
 def get_additional_members_from_parenthesis_index(
     string_split: list[str],
@@ -60,17 +148,37 @@ def get_additional_members_from_parenthesis_index(
     return 0
 
 
-def build_hed_tag_groups(hed_union: Sequence[DbHedSchemaNode], hed_string: str) -> list[list[TagGroupMember]]:
+def build_hed_tag_groups(hed_schema: HedSchemaLookup, hed_string: str) -> list[list[TagGroupMember]]:
+    """
+    Assembles physiological event HED tags. The result of each HED string is memoised in the HED
+    schema lookup.
+
+    :param hed_schema: Compiled lookup of the HED schemas
+    :param hed_string: HED string
+
+    :return: List of HEDTagID groups
+    """
+
+    tag_groups = hed_schema.tag_groups_cache.get(hed_string)
+    if tag_groups is None:
+        tag_groups = parse_hed_tag_groups(hed_schema, hed_string)
+        hed_schema.tag_groups_cache[hed_string] = tag_groups
+
+    # Copy the groups so that the memoised value cannot be modified by the caller.
+    return [list(tag_group) for tag_group in tag_groups]
+
+
+def parse_hed_tag_groups(hed_schema: HedSchemaLookup, hed_string: str) -> list[list[TagGroupMember]]:
     """
-    Assembles physiological event HED tags.
+    Parses a HED string into groups of physiological event HED tags.
 
-    :param hed_union : Union of HED schemas
+    :param hed_schema: Compiled lookup of the HED schemas
     :param hed_string: HED string
 
     :return: List of HEDTagID groups
     """
     # TODO: VALIDATE HED TAGS VIA SERVICE
-    # hedDict = utilities.assemble_hed_service(data_dir, event_tsv, event_json)
+    # hedDict = assemble_hed(hed_schema, data_dir, event_tsv, event_json)
 
     # NOT SUPPORTED: DEFS & VALUES
 
@@ -102,7 +210,7 @@ def build_hed_tag_groups(hed_union: Sequence[DbHedSchemaNode], hed_string: str)
             additional_members = \
                 get_additional_members_from_parenthesis_index(string_split, 1, element_index)
 
-        hed_tag_id = get_hed_tag_id_from_name(left_stripped, hed_union)
+        hed_tag_id = get_hed_tag_id_from_name(left_stripped, hed_schema)
         tag_group.append(TagGroupMember(hed_tag_id, has_pairing, additional_members))
 
         for i in range(
@@ -121,6 +229,16 @@ def build_hed_tag_groups(hed_union: Sequence[DbHedSchemaNode], hed_string: str)
     return tag_groups
 
 
+# LORIS-recognized events.tsv columns, indexed by their lowercase name without underscores.
+RECOGNIZED_EVENT_FIELDS = {
+    field.lower(): field for field in [
+        'Onset', 'Duration', 'TrialType',
+        'ResponseTime', 'EventCode',
+        'EventSample', 'EventType'
+    ]
+}
+
+
 def standardize_row_columns(row: dict[str, str | None]) -> dict[str, str]:
     """
     Standardizes LORIS-recognized events.tsv columns to their DB column name
@@ -131,20 +249,13 @@ def standardize_row_columns(row: dict[str, str | None]) -> dict[str, str]:
     """
 
     standardized_row: dict[str, str] = {}
-    recognized_event_fields = [
-        'Onset', 'Duration', 'TrialType',
-        'ResponseTime', 'EventCode',
-        'EventSample', 'EventType'
-    ]
     for column_name, column_value in row.items():
         if column_value is None:
             continue
 
         stripped_name = column_name.replace('_', '')
-        try:
-            field_index = list(map(lambda f: f.lower(), recognized_event_fields)).index(stripped_name)
-            column = recognized_event_fields[field_index]
-        except ValueError:
+        column = RECOGNIZED_EVENT_FIELDS.get(stripped_name)
+        if column is None:
             column = 'EventValue' if (column_name == 'value' or column_name == 'event_value') else column_name
         standardized_row[column] = column_value
 
@@ -176,22 +287,19 @@ def filter_inherited_tags(
         if column_name in dataset_tag_dict
         and standardized_row[column_name] in dataset_tag_dict[column_name]
     ], [])
-    return list(filter(
-        lambda tag_group: not any(
-            len(tag_group) == len(inherited_tag_group) and all(
-                tag_group[i] == inherited_tag_group[i]
-                for i in range(len(tag_group))
-            )
-            for inherited_tag_group in inherited_tag_groups
-        ),
-        tag_groups
-    ))
-
-
-def get_hed_tag_id_from_name(tag_string: str, hed_union: Sequence[DbHedSchemaNode]) -> int | None:
-    leaf_node = tag_string.split('/')[-1]  # LIMITED SUPPORT FOR NOW - NO VALUES OR DEFS
+    inherited_tag_group_keys = {
+        tuple(tag_member.get_key() for tag_member in inherited_tag_group)
+        for inherited_tag_group in inherited_tag_groups
+    }
+    return [
+        tag_group for tag_group in tag_groups
+        if tuple(tag_member.get_key() for tag_member in tag_group) not in inherited_tag_group_keys
+    ]
+
+
+def get_hed_tag_id_from_name(tag_string: str, hed_schema: HedSchemaLookup) -> int | None:
     if len(tag_string) > 0:
-        hed_tag = find(hed_union, lambda tag: tag.name == leaf_node)
+        hed_tag = hed_schema.find_node(tag_string)
         if hed_tag is None:
             print(f'ERROR: UNRECOGNIZED HED TAG: {tag_string}')
             raise
@@ -201,52 +309,249 @@ def get_hed_tag_id_from_name(tag_string: str, hed_union: Sequence[DbHedSchemaNod
     return None
 
 
-def assemble_hed_service(data_dir_path: Path, event_tsv_path: Path, event_json_path: Path):
-    # Using HED Tool Rest Services to assemble the HED Tags
-    # https://hed-examples.readthedocs.io/en/latest/HedToolsOnline.html#hed-restful-services
+@dataclass
+class HedDefinition:
+    """
+    A HED definition declared in an events dictionary, with its optional contents and whether it
+    takes a value placeholder.
+    """
+
+    name: str
+    contents: str | None
+    has_placeholder: bool
 
-    # Request CSRF Token & session cookie
-    request_token_url = 'https://hedtools.ucsd.edu/hed/services'
-    token_response = requests.get(request_token_url)
 
-    cookie = token_response.headers['Set-Cookie']
-    token_match = re.search(r'csrf_token" value="(.+?)"', token_response.text)
-    if token_match is None:
-        raise Exception("No CSRF token found.")
+@dataclass
+class HedSidecar:
+    """
+    The HED annotations of an events dictionary (events.json), compiled for the assembly of the
+    rows of an events file.
+    """
 
-    token = token_match.group(1)
+    # HED strings of the categorical columns, indexed by column name and level.
+    categorical_columns: dict[str, dict[str, str]]
+    # HED strings of the value columns, which contain a '#' placeholder, indexed by column name.
+    value_columns: dict[str, str]
+    # HED definitions, indexed by their lowercase name.
+    definitions: dict[str, HedDefinition]
 
-    # Define headers for assemble POST request, containing token and cookie
-    headers = {
-        "Content-Type": "application/json",
-        "Accept": "application/json",
-        "X-CSRFToken": token,
-        "Cookie": cookie
-    }
 
-    # Read event files as str
-    event_json_text = open(data_dir_path / event_json_path).read()
-    event_tsv_text = open(data_dir_path / event_tsv_path).read()
-
-    # Define request parameters
-    params = {
-        'service': 'events_assemble',
-        'schema_version': '8.0.0',
-        'json_string': event_json_text,
-        'events_string': event_tsv_text,
-        'check_for_warnings': 'off',
-        'expand_defs': 'on',
-        'columns_included': ['onset']
-    }
+def split_hed_string(hed_string: str) -> list[str]:
+    """
+    Split a HED string into its top-level tags and tag groups.
+    """
+
+    elements: list[str] = []
+    depth = 0
+    start = 0
+    for index, char in enumerate(hed_string):
+        match char:
+            case '(':
+                depth += 1
+            case ')':
+                depth -= 1
+            case ',' if depth == 0:
+                elements.append(hed_string[start:index])
+                start = index + 1
+            case _:
+                pass
+
+    elements.append(hed_string[start:])
+    return [element.strip() for element in elements if element.strip() != '']
+
+
+def normalize_hed_string(hed_string: str) -> str:
+    """
+    Normalize a HED string by removing the whitespaces around its commas and parentheses, which is
+    the format used by the HED tools.
+    """
+
+    return re.sub(r'\s*([,()])\s*', r'\1', hed_string).strip()
+
+
+def extract_hed_definitions(hed_string: str, definitions: dict[str, HedDefinition]) -> str:
+    """
+    Extract the HED definitions of a HED string into the provided definitions dictionary, and
+    return the HED string without its definitions.
+    """
+
+    elements: list[str] = []
+    for element in split_hed_string(hed_string):
+        if not element.startswith('('):
+            elements.append(element)
+            continue
+
+        group_elements = split_hed_string(element[1:-1])
+        if group_elements == [] or not group_elements[0].lower().startswith('definition/'):
+            elements.append(element)
+            continue
+
+        name = group_elements[0].split('/', 1)[1]
+        has_placeholder = name.endswith('/#')
+        if has_placeholder:
+            name = name[:-2]
+
+        contents = normalize_hed_string(group_elements[1]) if len(group_elements) > 1 else None
+        definitions[name.lower()] = HedDefinition(name, contents, has_placeholder)
+
+    return ','.join(elements)
+
+
+def load_hed_sidecar(event_dict: dict[str, Any]) -> HedSidecar:
+    """
+    Compile the HED annotations of an events dictionary (events.json).
+    """
+
+    categorical_columns: dict[str, dict[str, str]] = {}
+    value_columns: dict[str, str] = {}
+    definitions: dict[str, HedDefinition] = {}
+
+    for column_name, column in event_dict.items():
+        if not isinstance(column, dict) or 'HED' not in column:
+            continue
+
+        column_hed = cast(dict[str, Any], column)['HED']
+        if isinstance(column_hed, dict):
+            categorical_columns[column_name] = {
+                level: extract_hed_definitions(level_hed, definitions)
+                for level, level_hed in cast(dict[str, str], column_hed).items()
+            }
+        elif isinstance(column_hed, str):
+            if '#' not in column_hed:
+                raise Exception(f"HED string of value column '{column_name}' has no '#' placeholder.")
+
+            value_columns[column_name] = extract_hed_definitions(column_hed, definitions)
+
+    return HedSidecar(categorical_columns, value_columns, definitions)
+
+
+def expand_hed_definitions(hed_string: str, definitions: dict[str, HedDefinition]) -> str:
+    """
+    Replace the `Def/` tags of a HED string by their `Def-expand/` groups.
+    """
+
+    def expand(match: re.Match[str]) -> str:
+        def_name, _, def_value = match.group(1).partition('/')
+        definition = definitions.get(def_name.lower())
+        if definition is None:
+            raise Exception(f"Unknown HED definition '{def_name}'.")
+
+        if definition.has_placeholder != (def_value != ''):
+            raise Exception(f"Invalid value for HED definition '{def_name}'.")
+
+        tag = f'Def-expand/{definition.name}' + (f'/{def_value}' if def_value else '')
+        if definition.contents is None:
+            return f'({tag})'
+
+        contents = definition.contents.replace('#', def_value) if definition.has_placeholder else definition.contents
+        return f'({tag},{contents})'
+
+    return re.sub(r'(?<![\w-])Def/([^,()]+)', lambda match: expand(match).strip(), hed_string, flags=re.IGNORECASE)
+
+
+def validate_hed_string(hed_schema: HedSchemaLookup, hed_string: str):
+    """
+    Check that all the tags of a HED string exist in the HED schema, or are the value of a node
+    that takes a value, or the extension of a node that allows extensions.
+    """
+
+    for tag in re.split(r'[,()]', hed_string):
+        tag = tag.strip()
+        if tag != '':
+            validate_hed_tag(hed_schema, tag)
+
+
+def validate_hed_tag(hed_schema: HedSchemaLookup, tag: str):
+    """
+    Check a HED tag in long or short form against the HED schema. The first component of the tag
+    is looked up by name, and each following component must be a child of the previous one,
+    unless the remaining components are a value or an extension of the last node found.
+    """
+
+    components = tag.split('/')
+    hed_node = hed_schema.nodes_by_lower_name.get(components[0].lower())
+    if hed_node is None:
+        raise Exception(f"Unrecognized HED tag '{tag}'.")
+
+    for index, component in enumerate(components[1:], 1):
+        child_node = hed_schema.children.get((hed_node.id, component.lower()))
+        if child_node is not None:
+            hed_node = child_node
+            continue
+
+        if hed_schema.takes_value(hed_node):
+            return
+
+        if not hed_schema.allows_extension(hed_node):
+            extension = '/'.join(components[index:])
+            raise Exception(f"HED tag '{hed_node.name}' does not allow the extension '{extension}'.")
+
+        return
+
+
+def assemble_hed_row(sidecar: HedSidecar, row: dict[str, str | None]) -> str:
+    """
+    Assemble the HED string of an events file row from its HED column and the HED annotations of
+    the events dictionary, without expanding the definitions.
+    """
+
+    hed_strings: list[str] = []
+    for column_name, value in row.items():
+        if value is None or value == '' or value == 'n/a':
+            continue
+
+        if column_name == 'HED':
+            hed_strings.append(value)
+        elif column_name in sidecar.categorical_columns:
+            level_hed = sidecar.categorical_columns[column_name].get(value)
+            if level_hed:
+                hed_strings.append(level_hed)
+        elif column_name in sidecar.value_columns:
+            hed_strings.append(sidecar.value_columns[column_name].replace('#', value))
+
+    return ','.join(hed_strings)
+
+
+def assemble_hed(
+    hed_schema: HedSchemaLookup,
+    data_dir_path: Path,
+    event_tsv_path: Path,
+    event_json_path: Path,
+    expand_defs: bool = True,
+) -> Iterator[dict[str, str]]:
+    """
+    Assemble the HED strings of an events file (events.tsv) using its events dictionary
+    (events.json) and the HED schema nodes of the database. This is a local replacement for the
+    `events_assemble` HED tools web service, and yields the rows in the same format, that is, an
+    `onset` and a `HED_assembled` field for each row of the events file.
+
+    :param hed_schema     : Compiled lookup of the HED schemas
+    :param data_dir_path  : Directory of the events files
+    :param event_tsv_path : Path of the events file, relative to the data directory
+    :param event_json_path: Path of the events dictionary, relative to the data directory
+    :param expand_defs    : Whether to replace the `Def/` tags by their `Def-expand/` groups
+
+    :return: Iterator of the assembled rows, read from the events file one at a time
+    """
+
+    with open(data_dir_path / event_json_path, encoding='utf-8-sig') as event_json_file:
+        sidecar = load_hed_sidecar(json.load(event_json_file))
+
+    # The 'utf-8-sig' encoding is used to support some datasets where metadata files may contain
+    # a byte-order mark (BOM).
+    with open(data_dir_path / event_tsv_path, encoding='utf-8-sig') as event_tsv_file:
+        for row in csv.DictReader(event_tsv_file, delimiter='\t'):
+            # Skip empty lines (such as trailing newlines).
+            if row == {}:
+                continue
 
-    # Make the request to assemble
-    request_assemble_url = 'https://hedtools.ucsd.edu/hed/services_submit'
-    assemble_response = requests.post(
-        request_assemble_url, headers=headers, json=params
-    )
+            hed_string = normalize_hed_string(assemble_hed_row(sidecar, row))
+            if expand_defs:
+                hed_string = expand_hed_definitions(hed_string, sidecar.definitions)
 
-    # get assembled results as dictionary
-    data = assemble_response.json()['results']['data']
-    results = list(csv.DictReader(io.StringIO(data), delimiter='\t'))
+            validate_hed_string(hed_schema, hed_string)
 
-    return results
+            yield {
+                'onset': row['onset'],
+                'HED_assembled': hed_string,
+            }
@@ -32,12 +32,63 @@ def import_bids_acquisitions(
             log(env, f"Successfully imported acquisition '{bids_info.name}'.")
             import_env.imported_acquisitions_count += 1
         except Exception as exception:
-            log_error(
-                env,
-                (
-                    f"Error while importing acquisition '{bids_info.name}'. Error message:\n"
-                    f"{exception}\n"
-                    "Skipping."
-                )
-            )
-            import_env.failed_acquisitions_count += 1
+            log_acquisition_import_error(env, import_env, bids_info, exception)
+
+
+def import_bids_acquisitions_concurrently(
+    env: Env,
+    import_env: BidsImportEnv,
+    acquisitions: list[tuple[T, BidsAcquisitionInfo]],
+    preparer: Callable[[T, BidsAcquisitionInfo], Callable[[], None] | None]
+):
+    """
+    Run a two-step import function on a list of BIDS acquisitions. The preparation step of each
+    acquisition is run first, which schedules the copies of its files and returns a registration
+    function, or `None` if the acquisition is skipped. The registration functions are then run in
+    order while the copies of the next acquisitions are still in progress. The overall import
+    progress is logged and the eventual exceptions raised during each step are caught.
+    """
+
+    registrations: list[tuple[BidsAcquisitionInfo, Callable[[], None] | None]] = []
+    for acquisition, bids_info in acquisitions:
+        log(
+            env,
+            f"Importing {bids_info.data_type} acquisition '{bids_info.name}'...",
+        )
+
+        try:
+            registrations.append((bids_info, preparer(acquisition, bids_info)))
+        except Exception as exception:
+            log_acquisition_import_error(env, import_env, bids_info, exception)
+
+    for bids_info, registration in registrations:
+        try:
+            if registration is not None:
+                registration()
+
+            log(env, f"Successfully imported acquisition '{bids_info.name}'.")
+            import_env.imported_acquisitions_count += 1
+        except Exception as exception:
+            log_acquisition_import_error(env, import_env, bids_info, exception)
+
+
+def log_acquisition_import_error(
+    env: Env,
+    import_env: BidsImportEnv,
+    bids_info: BidsAcquisitionInfo,
+    exception: Exception,
+):
+    """
+    Log an error raised during the import of a BIDS acquisition and count that acquisition as
+    failed.
+    """
+
+    log_error(
+        env,
+        (
+            f"Error while importing acquisition '{bids_info.name}'. Error message:\n"
+            f"{exception}\n"
+            "Skipping."
+        )
+    )
+    import_env.failed_acquisitions_count += 1
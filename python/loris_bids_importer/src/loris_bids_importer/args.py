@@ -2,6 +2,9 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Literal
 
+from loris_bids_utils.layout_index import BidsLayoutIndexMode
+from loris_utils.fs import FilePlacementStrategy
+
 
 @dataclass
 class Args:
@@ -11,4 +14,12 @@ class Args:
     create_candidate: bool
     create_session: bool
     copy: bool
+    placement: FilePlacementStrategy
+    io_workers: int
+    jobs: int
+    layout_index: BidsLayoutIndexMode
+    native_walker: bool
+    plan: bool
+    plan_json_path: Path | None
+    resume: bool
     verbose: bool
@@ -1,5 +1,6 @@
 import re
-import shutil
+from collections.abc import Sequence
+from concurrent.futures import Future
 from pathlib import Path
 
 from lib.config import get_data_dir_path_config
@@ -8,14 +9,25 @@ from lib.env import Env
 from loris_bids_utils.files.dataset_description import BidsDatasetDescriptionJsonFile
 from loris_bids_utils.files.participants import BidsParticipantsTsvFile
 from loris_bids_utils.files.scans import BidsScansTsvFile
+from loris_utils.crypto import compute_file_hashes
+from loris_utils.fs import place_file, remove_path
 
+from loris_bids_importer.copy_scheduler import get_path_size
 from loris_bids_importer.env import BidsImportEnv
 
+# Extensions of the BIDS metadata files, which are always copied rather than hard or symbolically
+# linked, as a metadata file edited in the LORIS data directory must not modify the source dataset.
+BIDS_METADATA_EXTENSIONS = {'.json', '.tsv', '.bval', '.bvec'}
 
-def get_loris_bids_dataset_path(env: Env, dataset_description: BidsDatasetDescriptionJsonFile) -> Path:
+
+def get_loris_bids_dataset_path(
+    env: Env,
+    dataset_description: BidsDatasetDescriptionJsonFile,
+    create: bool = True,
+) -> Path:
     """
     Get the LORIS BIDS directory path for the BIDS dataset to import, and create that directory if
-    it does not exist yet.
+    it does not exist yet and creation is enabled.
     """
 
     # Sanitize the dataset metadata to have a usable name for the directory.
@@ -25,7 +37,7 @@ def get_loris_bids_dataset_path(env: Env, dataset_description: BidsDatasetDescri
     data_dir_path = get_data_dir_path_config(env)
     loris_bids_path = data_dir_path / 'bids_imports' / f'{dataset_name}_BIDSVersion_{dataset_version}'
 
-    if not loris_bids_path.exists():
+    if create and not loris_bids_path.exists():
         loris_bids_path.mkdir()
 
     return loris_bids_path
@@ -109,25 +121,89 @@ def get_loris_scans_path(import_env: BidsImportEnv, scans_file: BidsScansTsvFile
     )
 
 
-def copy_loris_bids_file(import_env: BidsImportEnv, file_path: Path, loris_file_path: Path):
+def copy_loris_bids_file(
+    import_env: BidsImportEnv,
+    file_path: Path,
+    loris_file_path: Path,
+    hash_algorithms: Sequence[str] = (),
+) -> dict[str, str]:
     """
-    Copy a BIDS file to the LORIS data directory, unless the no-copy mode is enabled.
+    Place a BIDS file in the LORIS data directory using the placement strategy of the import,
+    unless the no-copy mode is enabled. Return the hashes of the file for the requested
+    algorithms, which are computed while copying the file if it is copied.
     """
 
     # Do not copy the file in no-copy mode.
     if import_env.loris_bids_path is None:
-        return
+        return compute_file_hashes(file_path, hash_algorithms) if hash_algorithms else {}
 
     full_loris_file_path = import_env.data_dir_path / loris_file_path
 
+    journal = import_env.journal
+    if journal is not None and journal.resume:
+        # Skip the file if it was completely copied by the interrupted import.
+        copy = journal.get_copy(file_path, loris_file_path, full_loris_file_path)
+        if copy is not None:
+            hashes = {algorithm: copy.hashes[algorithm] for algorithm in hash_algorithms if algorithm in copy.hashes}
+            missing_algorithms = [algorithm for algorithm in hash_algorithms if algorithm not in hashes]
+            if missing_algorithms != []:
+                hashes.update(compute_file_hashes(file_path, missing_algorithms))
+
+            return hashes
+
+        # Otherwise, the file may have been partially copied by the interrupted import, in which
+        # case it is copied again. The files that were not placed by a journaled copy, such as the
+        # files of earlier imports, are never removed.
+        if journal.is_copy_incomplete(loris_file_path):
+            remove_path(full_loris_file_path)
+
     if full_loris_file_path.exists():
         raise Exception(f"File '{loris_file_path}' already exists in the LORIS data directory.")
 
+    strategy = import_env.placement_strategy
+    if strategy in ('hardlink', 'symlink') and file_path.suffix in BIDS_METADATA_EXTENSIONS:
+        strategy = 'copy'
+
+    if journal is not None:
+        journal.record_copy_start(loris_file_path)
+
     full_loris_file_path.parent.mkdir(parents=True, exist_ok=True)
-    if file_path.is_file():
-        shutil.copyfile(file_path, full_loris_file_path)
-    elif file_path.is_dir():
-        shutil.copytree(file_path, full_loris_file_path)
+    strategy, hashes = place_file(file_path, full_loris_file_path, strategy, hash_algorithms)
+    import_env.placed_files[loris_file_path] = strategy
+    if strategy == 'copy' and import_env.copy_scheduler is not None:
+        import_env.copy_scheduler.record_copy(get_path_size(full_loris_file_path))
+
+    if journal is not None:
+        journal.record_copy(file_path, loris_file_path, full_loris_file_path, hashes)
+
+    return hashes
+
+
+def schedule_copy_loris_bids_file(
+    import_env: BidsImportEnv,
+    file_path: Path,
+    loris_file_path: Path,
+    hash_algorithms: Sequence[str] = (),
+) -> Future[dict[str, str]]:
+    """
+    Schedule the placement of a BIDS file in the LORIS data directory on the I/O workers of the
+    import, or place it immediately if the import has no copy scheduler. Return a future of the
+    hashes of the file for the requested algorithms.
+    """
+
+    def copy() -> dict[str, str]:
+        return copy_loris_bids_file(import_env, file_path, loris_file_path, hash_algorithms)
+
+    if import_env.copy_scheduler is not None:
+        return import_env.copy_scheduler.submit(copy)
+
+    future: Future[dict[str, str]] = Future()
+    try:
+        future.set_result(copy())
+    except Exception as exception:
+        future.set_exception(exception)
+
+    return future
 
 
 def copy_bids_static_files(import_env: BidsImportEnv):
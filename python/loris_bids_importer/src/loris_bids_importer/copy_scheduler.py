@@ -0,0 +1,71 @@
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import TypeVar
+
+T = TypeVar('T')
+
+
+class BidsFileCopyScheduler:
+    """
+    Bounded pool of I/O workers that copies the BIDS files to the LORIS data directory in the
+    background, so that the copies of several files and acquisitions run concurrently while the
+    main thread registers the files in the database.
+    """
+
+    def __init__(self, max_workers: int):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='bids_copy')
+        self.copied_files_count = 0
+        self.copied_bytes_count = 0
+        self.start_time = time.monotonic()
+        self._lock = threading.Lock()
+
+    def submit(self, copy: Callable[[], T]) -> Future[T]:
+        """
+        Schedule the copy of a file or directory, and return a future of the result of the copy
+        function.
+        """
+
+        return self.executor.submit(copy)
+
+    def record_copy(self, size: int):
+        """
+        Record a completed copy of a file or directory of a given size in the throughput summary.
+        The files placed as links or skipped are not recorded, as no data is copied for them.
+        """
+
+        with self._lock:
+            self.copied_files_count += 1
+            self.copied_bytes_count += size
+
+    def shutdown(self):
+        """
+        Wait for the scheduled copies to complete and stop the I/O workers.
+        """
+
+        self.executor.shutdown(wait=True)
+
+    def get_summary(self) -> str:
+        """
+        Get a human-readable summary of the copy throughput.
+        """
+
+        duration = max(time.monotonic() - self.start_time, 1e-6)
+        copied_megabytes = self.copied_bytes_count / 1024 ** 2
+        return (
+            f"Copied {self.copied_files_count} files ({copied_megabytes:.1f} MB) in {duration:.1f}s:"
+            f" {copied_megabytes / duration:.1f} MB/s, {self.copied_files_count / duration:.1f} files/s."
+        )
+
+
+def get_path_size(path: Path) -> int:
+    """
+    Get the size of a file, or the total size of the files of a directory.
+    """
+
+    if path.is_dir():
+        return sum(file_path.stat().st_size for file_path in path.rglob('*') if file_path.is_file())
+
+    return path.stat().st_size
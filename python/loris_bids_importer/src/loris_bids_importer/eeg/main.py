@@ -10,13 +10,13 @@ import lib.utilities as utilities
 from lib.config import get_ephys_visualization_enabled_config
 from lib.db.models.physio_file import DbPhysioFile
 from lib.db.models.session import DbSession
-from lib.db.queries.hed_schema_node import get_all_hed_schema_nodes
 from lib.db.queries.physio_file import try_get_physio_file_with_path
 from lib.env import Env
 from lib.logging import log, log_warning
 from lib.physio.chunking import create_physio_channels_chunks
 from lib.physio.events import EventDictFileSource
 from lib.physio.file import insert_physio_file
+from lib.physio.hed import get_hed_schema_lookup
 from lib.physio.parameters import insert_physio_file_parameters
 from loris_bids_utils.eeg.channels import BidsEegChannelsTsvFile
 from loris_bids_utils.eeg.sidecar import BidsEegSidecarJsonFile
@@ -24,7 +24,9 @@ from loris_bids_utils.files.events import BidsEventsTsvFile
 from loris_bids_utils.files.scans import BidsScansTsvFile
 from loris_bids_utils.info import BidsDataTypeInfo
 from loris_bids_utils.json import BidsJsonFile
+from loris_bids_utils.native_layout import BidsAssociatedFiles, BidsNativeLayout
 from loris_utils.crypto import compute_file_blake2b_hash
+from loris_utils.path import remove_path_extension
 
 from loris_bids_importer.archive import import_physio_event_archive, import_physio_file_archive
 from loris_bids_importer.channels import insert_bids_channels_file
@@ -46,13 +48,16 @@ class Eeg:
     into the database by calling the loris_bids_importer.eeg.physiological class.
     """
 
-    def __init__(self, env: Env, import_env: BidsImportEnv, bids_layout, bids_info: BidsDataTypeInfo,
+    def __init__(self, env: Env, import_env: BidsImportEnv, bids_layout, bids_native_layout: BidsNativeLayout,
+                 bids_associated_files: dict[Path, BidsAssociatedFiles], bids_info: BidsDataTypeInfo,
                  session: DbSession, db, dataset_tag_dict, dataset_type):
         """
         Constructor method for the Eeg class.
 
         :param bids_reader  : dictionary with BIDS reader information
          :type bids_reader  : dict
+        :param bids_native_layout    : the native layout of the BIDS dataset
+        :param bids_associated_files : the associated files of the acquisitions of the data type
         :param bids_info    : the BIDS data type information
         :param session      : The LORIS session the EEG datasets are linked to
         :param db           : Database class object
@@ -68,6 +73,8 @@ class Eeg:
 
         # load bids objects
         self.bids_layout = bids_layout
+        self.bids_native_layout = bids_native_layout
+        self.bids_associated_files = bids_associated_files
 
         # load the LORIS BIDS import root directory where the eeg files will
         # be copied
@@ -86,7 +93,7 @@ class Eeg:
         # find corresponding CandID and SessionID in LORIS
         self.session = session
 
-        self.hed_union = get_all_hed_schema_nodes(self.env.db)
+        self.hed_schema = get_hed_schema_lookup(self.env.db)
 
         # check if a tsv with acquisition dates or age is available for the subject
         self.scans_file = None
@@ -261,25 +268,11 @@ class Eeg:
             return None
 
         for eeg_file in eeg_files:
-            bids_sidecar_json = self.bids_layout.get_nearest(
-                eeg_file.path,
-                return_type = 'tuple',
-                strict=False,
-                extension = 'json',
-                suffix = self.bids_info.data_type,
-                all_ = False,
-                full_search = False,
-            )
-            sidecar_json = BidsEegSidecarJsonFile(Path(bids_sidecar_json.path)) if bids_sidecar_json else None
-
-            fdt_file = self.bids_layout.get_nearest(
-                eeg_file.path,
-                return_type = 'tuple',
-                strict=False,
-                extension = 'fdt',
-                all_ = False,
-                full_search = False,
-            )
+            associated_files = self.get_associated_files(eeg_file.path)
+            bids_sidecar_json = associated_files.sidecar
+            sidecar_json = BidsEegSidecarJsonFile(bids_sidecar_json.path) if bids_sidecar_json else None
+
+            fdt_file = associated_files.fdt
 
             # read the json file if it exists
             eeg_file_data = {}
@@ -407,15 +400,8 @@ class Eeg:
         # physiological data into the database
         physiological = Physiological(self.env, self.db, self.env.verbose)
 
-        electrode_files = self.bids_layout.get_nearest(
-            original_physiological_file_path,
-            return_type = 'tuple',
-            strict = False,
-            extension = 'tsv',
-            suffix = 'electrodes',
-            all_ = True,  # get all existing electrode files
-            full_search = False,
-        )
+        # get all existing electrode files
+        electrode_files = self.get_associated_files(original_physiological_file_path).electrodes
 
         if not electrode_files:
             message = "WARNING: no electrode file associated with " \
@@ -444,14 +430,11 @@ class Eeg:
 
                     # get coordsystem.json file
                     # subject-specific metadata
-                    coordsystem_metadata_file = self.bids_layout.get_nearest(
-                        electrode_file.path,
-                        return_type = 'tuple',
-                        strict = False,
-                        extension = 'json',
-                        suffix = 'coordsystem',
-                        all_ = False,
-                        full_search = False,
+                    coordsystem_metadata_file = self.bids_native_layout.get_nearest(
+                        electrode_file,
+                        '.json',
+                        'coordsystem',
+                        strict=False,
                         subject=self.bids_info.subject,
                     )
                     if not coordsystem_metadata_file:
@@ -509,16 +492,8 @@ class Eeg:
          :rtype: str
         """
 
-        bids_channels_file = self.bids_layout.get_nearest(
-            original_physiological_file_path,
-            return_type = 'tuple',
-            strict = False,
-            extension = 'tsv',
-            suffix = 'channels',
-            all_ = False,
-            full_search = False,
-        )
-        channels_file = BidsEegChannelsTsvFile(Path(bids_channels_file.path)) if bids_channels_file else None
+        bids_channels_file = self.get_associated_files(original_physiological_file_path).channels
+        channels_file = BidsEegChannelsTsvFile(bids_channels_file.path) if bids_channels_file else None
 
         if channels_file is None:
             print(f"WARNING: no channel file associated with physiological file ID {physiological_file.id}")
@@ -563,16 +538,8 @@ class Eeg:
          :rtype: str
         """
 
-        bids_events_data_file = self.bids_layout.get_nearest(
-            original_physiological_file_path,
-            return_type = 'tuple',
-            strict = False,
-            extension = 'tsv',
-            suffix = 'events',
-            all_ = False,
-            full_search = False,
-        )
-        events_data_file = BidsEventsTsvFile(Path(bids_events_data_file.path)) if bids_events_data_file else None
+        bids_events_data_file = self.get_associated_files(original_physiological_file_path).events
+        events_data_file = BidsEventsTsvFile(bids_events_data_file.path) if bids_events_data_file else None
 
         if events_data_file is None:
             message = "WARNING: no events file associated with " \
@@ -586,14 +553,11 @@ class Eeg:
             if event_paths == []:
                 # get events.json file and insert
                 # subject-specific metadata
-                event_metadata_file = self.bids_layout.get_nearest(
-                    events_data_file.path,
-                    return_type = 'tuple',
-                    strict = False,
-                    extension = 'json',
-                    suffix = 'events',
-                    all_ = False,
-                    full_search = False,
+                event_metadata_file = self.bids_native_layout.get_nearest(
+                    bids_events_data_file,
+                    '.json',
+                    'events',
+                    strict=False,
                     subject=self.bids_info.subject,
                 )
 
@@ -633,7 +597,7 @@ class Eeg:
                 event_path,
                 self.dataset_tag_dict,
                 file_tag_dict,
-                self.hed_union,
+                self.hed_schema,
             )
 
             self.env.db.commit()
@@ -641,6 +605,20 @@ class Eeg:
 
         return event_paths
 
+    def get_associated_files(self, file_path) -> BidsAssociatedFiles:
+        """
+        Get the associated files of an EEG file from the associated files of the data type, which
+        are resolved once for all its acquisitions.
+
+        :param file_path: path of the EEG file
+         :type file_path: str
+
+        :return: the associated files of the EEG file
+         :rtype: BidsAssociatedFiles
+        """
+
+        return self.bids_associated_files.get(remove_path_extension(Path(file_path)), BidsAssociatedFiles())
+
     def copy_file_to_loris_bids_dir(self, file, derivatives=False):
         """
         Wrapper around the utilities.copy_file function that copies the file
@@ -669,8 +647,12 @@ class Eeg:
         # the same metadata file several times if it is shared acquisitions. A warning has been
         # added.
         # TODO: Properly handle metadata files shared across several acquisitions.
+        # When an import is resumed, the journaled copies are left to the copy function, which skips
+        # the completed copies and copies the incomplete copies again.
         full_file_path = self.info.data_dir_path / loris_file_path
-        if full_file_path.exists():
+        journal = self.info.journal
+        if full_file_path.exists() \
+                and (journal is None or not journal.resume or loris_file_path not in journal.started_copies):
             log_warning(
                 self.env,
                 f"Duplicate import of file '{loris_file_path}', this is a bug in the EEG importer.",
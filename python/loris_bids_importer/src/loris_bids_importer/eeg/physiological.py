@@ -1,5 +1,7 @@
 """This class performs database queries for BIDS physiological dataset (EEG, MEG...)"""
 
+from collections import Counter
+
 from lib.database_lib.physiological_coord_system import PhysiologicalCoordSystem
 from lib.database_lib.point_3d import Point3DDB
 from lib.db.models.physio_file import DbPhysioFile
@@ -109,54 +111,79 @@ class Physiological:
             'Impedance',
             'FilePath'
         )
-        electrode_ids = []
-        optional_fields = ('type', 'material', 'impedance')
-        for row in electrode_data:
-            for field in optional_fields:
-                if field not in row.keys():
-                    continue
-
-                if field == 'type':
-                    row['type_id'] = self.db.grep_id_from_lookup_table(
-                        id_field_name       = 'PhysiologicalElectrodeTypeID',
-                        table_name          = 'physiological_electrode_type',
-                        where_field_name    = 'ElectrodeType',
-                        where_value         = row['type'],
-                        insert_if_not_found = True
-                    )
-                if field == 'material':
-                    row['material_id'] = self.db.grep_id_from_lookup_table(
-                        id_field_name       = 'PhysiologicalElectrodeMaterialID',
-                        table_name          = 'physiological_electrode_material',
-                        where_field_name    = 'ElectrodeMaterial',
-                        where_value         = row['material'],
-                        insert_if_not_found = True
-                    )
-
-            # map the X, Y and Z 'n/a' values to NULL
-            x_value = None if row['x'] == 'n/a' else row['x']
-            y_value = None if row['y'] == 'n/a' else row['y']
-            z_value = None if row['z'] == 'n/a' else row['z']
-            p = Point3D(None, x_value, y_value, z_value)
-            point = self.point_3d_db.grep_or_insert_point(p)
 
-            # insert into physiological_electrode table
-            values_tuple = (
-                row.get('type_id'),
-                row.get('material_id'),
+        # look up each distinct electrode type and material only once
+        type_ids = {
+            electrode_type: self.db.grep_id_from_lookup_table(
+                id_field_name       = 'PhysiologicalElectrodeTypeID',
+                table_name          = 'physiological_electrode_type',
+                where_field_name    = 'ElectrodeType',
+                where_value         = electrode_type,
+                insert_if_not_found = True
+            )
+            for electrode_type in dict.fromkeys(row['type'] for row in electrode_data if 'type' in row)
+        }
+        material_ids = {
+            material: self.db.grep_id_from_lookup_table(
+                id_field_name       = 'PhysiologicalElectrodeMaterialID',
+                table_name          = 'physiological_electrode_material',
+                where_field_name    = 'ElectrodeMaterial',
+                where_value         = material,
+                insert_if_not_found = True
+            )
+            for material in dict.fromkeys(row['material'] for row in electrode_data if 'material' in row)
+        }
+
+        # map the X, Y and Z 'n/a' values to NULL and grep or insert all the points at once
+        points = self.point_3d_db.grep_or_insert_points([
+            Point3D(
+                None,
+                None if row['x'] == 'n/a' else row['x'],
+                None if row['y'] == 'n/a' else row['y'],
+                None if row['z'] == 'n/a' else row['z'],
+            )
+            for row in electrode_data
+        ])
+
+        values = [
+            (
+                type_ids.get(row.get('type')),
+                material_ids.get(row.get('material')),
                 row['name'],
                 point.id,
                 row.get('impedance'),
                 electrode_file
             )
+            for row, point in zip(electrode_data, points)
+        ]
 
-            inserted_electrode_id = self.db.insert(
+        electrode_ids = []
+        if values:
+            # insert into physiological_electrode table
+            self.db.insert(
                 table_name   = 'physiological_electrode',
                 column_names = electrode_fields,
-                values       = values_tuple,
-                get_last_id  = True
+                values       = values
+            )
+
+            # grep back the inserted electrode IDs by name, the IDs of a multi-row insert are not
+            # necessarily consecutive and MySQLdb splits large inserts into several statements
+            results = self.db.pselect(
+                query = "SELECT PhysiologicalElectrodeID, Name "
+                        "FROM physiological_electrode "
+                        "WHERE FilePath = %s "
+                        "ORDER BY PhysiologicalElectrodeID",
+                args  = (str(electrode_file),)
             )
-            electrode_ids.append(inserted_electrode_id)
+
+            ids_by_name = {}
+            for result in results:
+                ids_by_name.setdefault(result['Name'], []).append(result['PhysiologicalElectrodeID'])
+
+            # the electrodes of this file are the last ones inserted with each name
+            names = [row['name'] for row in electrode_data]
+            name_ids = {name: iter(ids_by_name[name][-count:]) for name, count in Counter(names).items()}
+            electrode_ids = [next(name_ids[name]) for name in names]
 
         # insert blake2b hash of electrode file into physiological_parameter_file
         insert_physio_file_parameter(self.env, physiological_file, 'electrode_file_blake2b_hash', blake2)
@@ -257,10 +284,8 @@ class Physiological:
         # insert ref points if found
         if is_ok_ref_coords:
             # insert ref points
-            point_ids = {}
-            for rk, rv in ref_points.items():
-                p = self.point_3d_db.grep_or_insert_point(rv)
-                point_ids[rk] = p.id
+            points = self.point_3d_db.grep_or_insert_points(list(ref_points.values()))
+            point_ids = {rk: p.id for rk, p in zip(ref_points.keys(), points)}
             # insert ref point/coord system relations
             self.physiological_coord_system_db.insert_coord_system_point_3d_relation(coord_system_id, point_ids)
 
@@ -1,5 +1,11 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Any
+
+from loris_utils.fs import FilePlacementStrategy
+
+from loris_bids_importer.copy_scheduler import BidsFileCopyScheduler
+from loris_bids_importer.journal import BidsImportJournal
 
 
 @dataclass
@@ -23,6 +29,40 @@ class BidsImportEnv:
     The LORIS BIDS directory path for this import, relative to the LORIS data directory.
     """
 
+    placement_strategy: FilePlacementStrategy = 'copy'
+    """
+    The strategy used to place the BIDS files in the LORIS data directory.
+    """
+
+    placed_files: dict[Path, FilePlacementStrategy] = field(default_factory=dict[Path, FilePlacementStrategy])
+    """
+    The strategy actually used to place each BIDS file in the LORIS data directory, which may
+    differ from the requested strategy if the file system does not support it.
+    """
+
+    copy_scheduler: BidsFileCopyScheduler | None = None
+    """
+    The scheduler used to copy the BIDS files concurrently, or `None` to copy them serially.
+    """
+
+    journal: BidsImportJournal | None = None
+    """
+    The journal of the completed copies and acquisition imports, used to resume an interrupted
+    import, or `None` if the import is run in no-copy mode.
+    """
+
+    prepared_nifti_parameters: dict[Path, dict[str, Any]] = field(default_factory=dict[Path, dict[str, Any]])
+    """
+    The spatial file parameters of the NIfTI files read ahead of their import by the session
+    preparation workers, indexed by NIfTI file path.
+    """
+
+    registered_file_hashes: set[str] = field(default_factory=set[str])
+    """
+    The hashes of the imaging files registered in the database that are known to the import, which
+    are fetched in bulk for each data type directory and completed as the files are registered.
+    """
+
     imported_acquisitions_count: int = 0
     """
     The number of successfully imported BIDS acquisitions.
@@ -1,9 +1,7 @@
-from collections.abc import Sequence
 from decimal import Decimal
 from pathlib import Path
 from typing import Any
 
-from lib.db.models.hed_schema_node import DbHedSchemaNode
 from lib.db.models.physio_event_file import DbPhysioEventFile
 from lib.db.models.physio_file import DbPhysioFile
 from lib.db.models.project import DbProject
@@ -17,7 +15,7 @@ from lib.physio.events import (
     insert_physio_task_event_opt,
     parse_and_insert_event_dict,
 )
-from lib.physio.hed import TagGroupMember, build_hed_tag_groups, filter_inherited_tags
+from lib.physio.hed import HedSchemaLookup, TagGroupMember, build_hed_tag_groups, filter_inherited_tags
 from lib.physio.parameters import insert_physio_file_parameter, insert_physio_project_parameter
 from loris_bids_utils.files.events import OPTIONAL_EVENT_FIELDS, BidsEventsTsvFile
 from loris_bids_utils.json import BidsJsonFile
@@ -85,7 +83,7 @@ def insert_bids_events_file(
     loris_events_file_path: Path,
     dataset_tag_dict: dict[str, Any],
     file_tag_dict: dict[str, Any],
-    hed_union: Sequence[DbHedSchemaNode],
+    hed_schema: HedSchemaLookup,
 ):
     """
     Inserts the event information read from the file *events.tsv
@@ -94,9 +92,13 @@ def insert_bids_events_file(
 
     :param dataset_tag_dict: Dict of dataset-inherited HED tags
     :param file_tag_dict   : Dict of subject-inherited HED tags
-    :param hed_union       : Union of HED schemas
+    :param hed_schema      : Compiled lookup of the HED schemas
     """
 
+    # The rows are read lazily during the insertion, so the file is checked beforehand to not insert
+    # some of its events if it is malformed.
+    events_file.validate()
+
     blake2_hash = compute_file_blake2b_hash(events_file.path)
 
     event_file = insert_events_file(env, physio_file, loris_events_file_path)
@@ -113,7 +115,7 @@ def insert_bids_events_file(
     # all listed fields
     known_fields = {*event_fields, *OPTIONAL_EVENT_FIELDS}
 
-    for row in events_file.rows:
+    for row in events_file:
         # has additional fields?
         additional_fields: dict[str, str] = {}
         for field, value in row.data.items():
@@ -139,7 +141,7 @@ def insert_bids_events_file(
         # not "duplicated"
         hed = row.data.get('HED')
         if hed is not None and len(hed) > 0 and hed != 'n/a':
-            tag_groups = build_hed_tag_groups(hed_union, hed)
+            tag_groups = build_hed_tag_groups(hed_schema, hed)
             tag_groups_without_inherited = filter_inherited_tags(
                 row.data, tag_groups, dataset_tag_dict, file_tag_dict
             )
@@ -0,0 +1,235 @@
+import json
+import os
+import threading
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from loris_bids_importer.copy_scheduler import get_path_size
+
+# Name of the journal file of the imports of a BIDS dataset, which is located at the root of the
+# LORIS BIDS dataset. The file name starts with a dot so that it is ignored by the BIDS readers.
+BIDS_IMPORT_JOURNAL_FILE_NAME = '.loris_import_journal.jsonl'
+
+
+@dataclass
+class BidsJournalCopy:
+    """
+    A BIDS file copy recorded in the import journal.
+    """
+
+    source_size: int
+    """
+    The size of the source file when it was copied.
+    """
+
+    source_mtime_ns: int
+    """
+    The modification time of the source file when it was copied, in nanoseconds.
+    """
+
+    size: int
+    """
+    The size of the copied file.
+    """
+
+    hashes: dict[str, str]
+    """
+    The hashes of the file computed during its copy, indexed by algorithm name.
+    """
+
+
+@dataclass
+class BidsJournalAcquisition:
+    """
+    A BIDS acquisition import recorded in the import journal.
+    """
+
+    source_size: int
+    """
+    The size of the source acquisition file when it was imported.
+    """
+
+    source_mtime_ns: int
+    """
+    The modification time of the source acquisition file when it was imported, in nanoseconds.
+    """
+
+    file_hash: str | None
+    """
+    The BLAKE2b hash of the acquisition file, if it is known.
+    """
+
+
+class BidsImportJournal:
+    """
+    Append-only journal of the file copies and acquisition imports completed by the imports of a
+    BIDS dataset, written as JSON lines so that an interrupted import can be resumed without
+    copying, hashing or checking the completed files again. The start of each file copy is also
+    recorded, so that only the copies left incomplete by an interrupted import are redone.
+
+    The records of the previous imports are only loaded if the import is resumed, but the records
+    of the current import are always written. The source files are identified by their size and
+    modification time, so a source file that changed since it was recorded is imported again.
+    """
+
+    def __init__(self, path: Path, resume: bool):
+        self.path = path
+        self.resume = resume
+        self.started_copies: set[Path] = set()
+        self.copies: dict[Path, BidsJournalCopy] = {}
+        self.acquisitions: dict[Path, BidsJournalAcquisition] = {}
+        self.data_types: set[Path] = set()
+        self._lock = threading.Lock()
+
+        if resume and path.exists():
+            self._load()
+
+        terminated = not path.exists() or is_file_terminated(path)
+        self._file = open(path, 'a')
+
+        # Terminate the record truncated by an interrupted import, if any, so that it does not
+        # corrupt the next record.
+        if not terminated:
+            self._file.write('\n')
+
+    def get_copy(self, file_path: Path, loris_file_path: Path, full_loris_file_path: Path) -> BidsJournalCopy | None:
+        """
+        Get the recorded copy of a source file to a LORIS path, or return `None` if that copy is
+        not recorded, if the source file changed since, or if the copied file is incomplete.
+        """
+
+        copy = self.copies.get(loris_file_path)
+        if copy is None or not is_source_unchanged(file_path, copy.source_size, copy.source_mtime_ns):
+            return None
+
+        if not full_loris_file_path.exists() or get_path_size(full_loris_file_path) != copy.size:
+            return None
+
+        return copy
+
+    def is_copy_incomplete(self, loris_file_path: Path) -> bool:
+        """
+        Check whether a copy to a LORIS path was started but not completed.
+        """
+
+        return loris_file_path in self.started_copies and loris_file_path not in self.copies
+
+    def record_copy_start(self, loris_file_path: Path):
+        """
+        Record the start of the copy of a source file to a LORIS path.
+        """
+
+        with self._lock:
+            self.started_copies.add(loris_file_path)
+            self._write({'type': 'copy_start', 'path': str(loris_file_path)})
+
+    def record_copy(self, file_path: Path, loris_file_path: Path, full_loris_file_path: Path, hashes: dict[str, str]):
+        """
+        Record the completed copy of a source file to a LORIS path.
+        """
+
+        stat = os.stat(file_path)
+        copy = BidsJournalCopy(stat.st_size, stat.st_mtime_ns, get_path_size(full_loris_file_path), hashes)
+        with self._lock:
+            self.copies[loris_file_path] = copy
+            self._write({'type': 'copy', 'path': str(loris_file_path), **asdict(copy)})
+
+    def is_acquisition_imported(self, file_path: Path) -> bool:
+        """
+        Check whether the import of an acquisition file is recorded and its source is unchanged.
+        """
+
+        acquisition = self.acquisitions.get(file_path)
+        return acquisition is not None \
+            and is_source_unchanged(file_path, acquisition.source_size, acquisition.source_mtime_ns)
+
+    def record_acquisition(self, file_path: Path, file_hash: str | None):
+        """
+        Record the completed import of an acquisition file.
+        """
+
+        stat = os.stat(file_path)
+        acquisition = BidsJournalAcquisition(stat.st_size, stat.st_mtime_ns, file_hash)
+        with self._lock:
+            self.acquisitions[file_path] = acquisition
+            self._write({'type': 'acquisition', 'path': str(file_path), **asdict(acquisition)})
+
+    def is_data_type_imported(self, data_type_path: Path) -> bool:
+        """
+        Check whether the import of a data type directory, whose files are not recorded one by one,
+        is recorded.
+        """
+
+        return data_type_path in self.data_types
+
+    def record_data_type(self, data_type_path: Path):
+        """
+        Record the completed import of a data type directory.
+        """
+
+        with self._lock:
+            self.data_types.add(data_type_path)
+            self._write({'type': 'data_type', 'path': str(data_type_path)})
+
+    def close(self):
+        """
+        Close the journal file.
+        """
+
+        self._file.close()
+
+    def _write(self, record: dict[str, Any]):
+        # The journal is flushed after each record so that the record survives a crash of the
+        # import process.
+        self._file.write(json.dumps(record) + '\n')
+        self._file.flush()
+
+    def _load(self):
+        with open(self.path) as file:
+            for line in file:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # The last record is truncated if the import was interrupted while writing it.
+                    continue
+
+                path = Path(record.pop('path'))
+                record_type = record.pop('type')
+                match record_type:
+                    case 'copy_start':
+                        self.started_copies.add(path)
+                    case 'copy':
+                        self.copies[path] = BidsJournalCopy(**record)
+                    case 'acquisition':
+                        self.acquisitions[path] = BidsJournalAcquisition(**record)
+                    case 'data_type':
+                        self.data_types.add(path)
+                    case _:
+                        raise Exception(f"Unknown record type '{record_type}' in import journal '{self.path}'.")
+
+
+def is_source_unchanged(file_path: Path, size: int, mtime_ns: int) -> bool:
+    """
+    Check whether a source file still has a given size and modification time.
+    """
+
+    try:
+        stat = os.stat(file_path)
+    except FileNotFoundError:
+        return False
+
+    return stat.st_size == size and stat.st_mtime_ns == mtime_ns
+
+
+def is_file_terminated(path: Path) -> bool:
+    """
+    Check whether a file is empty or ends with a newline.
+    """
+
+    with open(path, 'rb') as file:
+        if file.seek(0, os.SEEK_END) == 0:
+            return True
+
+        file.seek(-1, os.SEEK_END)
+        return file.read(1) == b'\n'
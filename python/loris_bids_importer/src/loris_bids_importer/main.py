@@ -1,14 +1,14 @@
+from pathlib import Path
 from typing import Any
 
-from lib.config import get_data_dir_path_config, get_default_bids_visit_label_config
+from lib.config import get_data_dir_path_config
 from lib.database import Database
 from lib.db.models.session import DbSession
-from lib.db.queries.candidate import try_get_candidate_with_psc_id
-from lib.db.queries.session import try_get_session_with_cand_id_visit_label
 from lib.env import Env
 from lib.logging import log, log_error, log_error_exit, log_warning
 from loris_bids_utils.mri.reader import BidsMriDataTypeReader
 from loris_bids_utils.reader import BidsDatasetReader, BidsDataTypeReader, BidsSessionReader
+from loris_utils.crypto import get_file_hash_cache
 
 from loris_bids_importer.args import Args
 from loris_bids_importer.copy_files import (
@@ -19,11 +19,15 @@ from loris_bids_importer.copy_files import (
     get_loris_bids_root_file_path,
     get_loris_scans_path,
 )
+from loris_bids_importer.copy_scheduler import BidsFileCopyScheduler
 from loris_bids_importer.eeg.main import Eeg
 from loris_bids_importer.env import BidsImportEnv
 from loris_bids_importer.events import import_bids_root_event_dict_file
-from loris_bids_importer.mri.main import import_bids_mri_data_type
-from loris_bids_importer.print import print_bids_import_summary, print_bids_info
+from loris_bids_importer.journal import BIDS_IMPORT_JOURNAL_FILE_NAME, BidsImportJournal
+from loris_bids_importer.mri.main import get_registered_bids_nifti_paths, import_bids_mri_data_type
+from loris_bids_importer.plan import plan_bids_dataset_import, write_bids_import_plan_json
+from loris_bids_importer.print import print_bids_import_plan, print_bids_import_summary, print_bids_info
+from loris_bids_importer.session_preparer import BidsSessionPreparer
 from loris_bids_importer.validation.sessions import validate_bids_sessions
 from loris_bids_importer.validation.subjects import validate_bids_subjects
 
@@ -37,14 +41,27 @@ def import_bids_dataset(env: Env, args: Args, legacy_db: Database):
 
     log(env, "Parsing BIDS dataset...")
 
-    bids = BidsDatasetReader(args.source_bids_path, args.type == 'derivative', args.bids_validation)
+    bids = BidsDatasetReader(
+        args.source_bids_path,
+        args.type == 'derivative',
+        args.bids_validation,
+        data_dir_path / 'bids_imports' / '.pybids_index',
+        args.layout_index,
+        args.native_walker,
+        # The plan does not write anything, so it only reuses an existing layout index.
+        args.plan,
+    )
 
     print_bids_info(env, bids)
 
+    if args.plan:
+        plan_bids_dataset(env, args, bids)
+        return
+
     # Check the BIDS subject and session labels and create their candidates and sessions in LORIS
     # if needed.
 
-    validate_bids_subjects(
+    candidates = validate_bids_subjects(
         env,
         [subject.info for subject in bids.subjects],
         args.create_candidate,
@@ -53,11 +70,12 @@ def import_bids_dataset(env: Env, args: Args, legacy_db: Database):
     sessions = validate_bids_sessions(
         env,
         [session.info for session in bids.sessions],
+        candidates,
         args.create_session,
     )
 
     # Assumption all same project (for project-wide tags)
-    single_project = sessions[0].project
+    single_project = next(iter(sessions.values())).project
 
     env.db.commit()
 
@@ -80,9 +98,12 @@ def import_bids_dataset(env: Env, args: Args, legacy_db: Database):
         loris_bids_path = None
 
     import_env = BidsImportEnv(
-        data_dir_path     = data_dir_path,
-        loris_bids_path   = loris_bids_path.relative_to(data_dir_path) if loris_bids_path is not None else None,
-        source_bids_path  = args.source_bids_path,
+        data_dir_path      = data_dir_path,
+        loris_bids_path    = loris_bids_path.relative_to(data_dir_path) if loris_bids_path is not None else None,
+        source_bids_path   = args.source_bids_path,
+        placement_strategy = args.placement,
+        copy_scheduler     = BidsFileCopyScheduler(args.io_workers) if loris_bids_path is not None else None,
+        journal            = get_bids_import_journal(env, args, loris_bids_path),
     )
 
     # Copy the static BIDS files.
@@ -110,47 +131,155 @@ def import_bids_dataset(env: Env, args: Args, legacy_db: Database):
 
     # Process each session directory.
 
-    for bids_session in bids.sessions:
-        import_bids_session(env, import_env, args, bids_session, dataset_tag_dict, legacy_db)
+    if args.jobs > 1:
+        import_bids_sessions_concurrently(
+            env, import_env, args, bids.sessions, sessions, dataset_tag_dict, legacy_db,
+        )
+    else:
+        for bids_session in bids.sessions:
+            session = sessions[bids_session.subject.label, bids_session.label]
+            import_bids_session(env, import_env, args, bids_session, session, dataset_tag_dict, legacy_db)
+
+    if import_env.copy_scheduler is not None:
+        import_env.copy_scheduler.shutdown()
+
+    if import_env.journal is not None:
+        import_env.journal.close()
 
     # Print import summary.
 
     print_bids_import_summary(env, import_env)
 
 
-def import_bids_session(
+def get_bids_import_journal(env: Env, args: Args, loris_bids_path: Path | None) -> BidsImportJournal | None:
+    """
+    Open the journal of the imports of a BIDS dataset, which is located in the LORIS BIDS dataset,
+    loading its previous records if the import is resumed.
+    """
+
+    if loris_bids_path is None:
+        return None
+
+    journal_path = loris_bids_path / BIDS_IMPORT_JOURNAL_FILE_NAME
+    journal = BidsImportJournal(journal_path, args.resume)
+    if args.resume:
+        log(
+            env,
+            (
+                f"Resuming the import using the journal '{journal_path}', which records"
+                f" {len(journal.acquisitions)} imported acquisitions and {len(journal.copies)} copied files."
+            ),
+        )
+
+    return journal
+
+
+def plan_bids_dataset(env: Env, args: Args, bids: BidsDatasetReader):
+    """
+    Plan the import of a BIDS dataset and print that plan, without writing anything in LORIS.
+    """
+
+    data_dir_path = get_data_dir_path_config(env)
+
+    # The plan reads the hashes from the persistent hash cache if it is enabled, but does not
+    # store the hashes it computes.
+    file_hash_cache = get_file_hash_cache()
+    if file_hash_cache is not None:
+        file_hash_cache.read_only = True
+
+    if args.copy:
+        try:
+            dataset_description = bids.dataset_description_file
+        except Exception as error:
+            log_error_exit(env, str(error))
+
+        if dataset_description is None:
+            log_error_exit(env, "No file 'dataset_description.json' found in the input BIDS dataset.")
+
+        loris_bids_path = get_loris_bids_dataset_path(env, dataset_description, create=False)
+    else:
+        loris_bids_path = None
+
+    import_env = BidsImportEnv(
+        data_dir_path      = data_dir_path,
+        loris_bids_path    = loris_bids_path.relative_to(data_dir_path) if loris_bids_path is not None else None,
+        source_bids_path   = args.source_bids_path,
+        placement_strategy = args.placement,
+    )
+
+    plan = plan_bids_dataset_import(env, import_env, bids, args.copy, args.io_workers)
+
+    print_bids_import_plan(env, plan)
+
+    if args.plan_json_path is not None:
+        write_bids_import_plan_json(plan, args.plan_json_path)
+        log(env, f"Wrote the import plan to '{args.plan_json_path}'.")
+
+
+def import_bids_sessions_concurrently(
     env: Env,
     import_env: BidsImportEnv,
     args: Args,
-    bids_session: BidsSessionReader,
+    bids_sessions: list[BidsSessionReader],
+    sessions: dict[tuple[str, str | None], DbSession],
     dataset_tag_dict: dict[Any, Any],
     legacy_db: Database,
 ):
     """
-    Read the provided BIDS session directory and import it into LORIS.
+    Import BIDS session directories into LORIS, preparing the next sessions on worker threads while
+    the current session is imported. The sessions are imported, and written in the database, in
+    order by the main thread.
     """
 
-    log(env, f"Importing files for subject '{bids_session.subject.label}' and session '{bids_session.label}'.")
+    def get_registered_paths(bids_session: BidsSessionReader) -> set[Path]:
+        return get_registered_bids_nifti_paths(
+            env,
+            import_env,
+            sessions[bids_session.subject.label, bids_session.label],
+            [data_type for data_type in bids_session.data_types if isinstance(data_type, BidsMriDataTypeReader)],
+        )
 
-    candidate = try_get_candidate_with_psc_id(env.db, bids_session.subject.label)
-    if candidate is None:
-        # This should not happen as BIDS subject labels should have been checked previously.
-        log_error_exit(env, f"Candidate not found for PSCID '{bids_session.subject.label}'.")
+    session_preparer = BidsSessionPreparer(args.jobs, import_env.journal, get_registered_paths)
 
-    if bids_session.label is not None:
-        visit_label = bids_session.label
-    else:
-        visit_label = get_default_bids_visit_label_config(env)
-        if visit_label is None:
-            log_error_exit(
-                env,
-                "Missing BIDS session in the dataset or default BIDS visit label in the LORIS configuration.",
-            )
+    try:
+        for bids_session, prepared_session_future in session_preparer.iter_prepared_sessions(bids_sessions):
+            try:
+                prepared_session = prepared_session_future.result()
+                import_env.prepared_nifti_parameters.update(prepared_session.nifti_parameters)
+            except Exception as exception:
+                # The session is still imported, in which case the error is raised again in the
+                # step that it affects.
+                log_warning(
+                    env,
+                    (
+                        f"Error while preparing files for subject '{bids_session.subject.label}' and session"
+                        f" '{bids_session.label}', the files will be prepared during the import. Error message:\n"
+                        f"{exception}"
+                    )
+                )
+
+            session = sessions[bids_session.subject.label, bids_session.label]
+            import_bids_session(env, import_env, args, bids_session, session, dataset_tag_dict, legacy_db)
+            import_env.prepared_nifti_parameters.clear()
+    finally:
+        session_preparer.shutdown()
 
-    session = try_get_session_with_cand_id_visit_label(env.db, candidate.cand_id, visit_label)
-    if session is None:
-        # This should not happen as BIDS session labels should have been checked previously.
-        log_error_exit(env, f"Visit not found for visit label '{visit_label}'.")
+
+def import_bids_session(
+    env: Env,
+    import_env: BidsImportEnv,
+    args: Args,
+    bids_session: BidsSessionReader,
+    session: DbSession,
+    dataset_tag_dict: dict[Any, Any],
+    legacy_db: Database,
+):
+    """
+    Read the provided BIDS session directory and import it into LORIS, using the LORIS session
+    obtained during the validation of the dataset.
+    """
+
+    log(env, f"Importing files for subject '{bids_session.subject.label}' and session '{bids_session.label}'.")
 
     try:
         # Read the scans.tsv property to raise an exception if the file is incorrect.
@@ -189,7 +318,7 @@ def import_bids_data_type(
 
     match data_type:
         case BidsMriDataTypeReader():
-            import_bids_mri_data_type(env, import_env, session, data_type)
+            import_bids_mri_data_type(env, import_env, session, data_type, args.io_workers)
         case BidsDataTypeReader():
             import_bids_eeg_data_type_files(env, import_env, args, session, data_type, dataset_tag_dict, legacy_db)
 
@@ -207,17 +336,27 @@ def import_bids_eeg_data_type_files(
     Read the provided BIDS EEG data type directory and import it into LORIS.
     """
 
+    data_type_path = data_type.path
+    if import_env.journal is not None and import_env.journal.is_data_type_imported(data_type_path):
+        log(env, f"Directory '{data_type_path}' was already imported according to the import journal. Skipping.")
+        return
+
     try:
         Eeg(
-            env              = env,
-            import_env       = import_env,
-            bids_layout      = data_type.session.subject.dataset.layout,
-            bids_info        = data_type.info,
-            db               = legacy_db,
-            session          = session,
-            dataset_tag_dict = dataset_tag_dict,
-            dataset_type     = args.type,
+            env                   = env,
+            import_env            = import_env,
+            bids_layout           = data_type.session.subject.dataset.layout,
+            bids_native_layout    = data_type.session.subject.dataset.native_layout,
+            bids_associated_files = data_type.associated_files,
+            bids_info             = data_type.info,
+            db                    = legacy_db,
+            session               = session,
+            dataset_tag_dict      = dataset_tag_dict,
+            dataset_type          = args.type,
         )
+
+        if import_env.journal is not None:
+            import_env.journal.record_data_type(data_type_path)
     except Exception as exception:
         log_error(
             env,
@@ -1,9 +1,12 @@
+from collections.abc import Callable, Iterable
+from concurrent.futures import Future
 from pathlib import Path
 from typing import Any
 
+from lib.db.models.imaging_file_type import DbImagingFileType
 from lib.db.models.mri_scan_type import DbMriScanType
 from lib.db.models.session import DbSession
-from lib.db.queries.file import try_get_file_with_hash, try_get_file_with_path
+from lib.db.queries.file import get_files_with_paths, get_registered_file_hashes
 from lib.db.queries.mri_scan_type import try_get_mri_scan_type_with_name
 from lib.env import Env
 from lib.imaging_lib.file import register_mri_file
@@ -15,11 +18,11 @@ from lib.logging import log
 from loris_bids_utils.info import BidsAcquisitionInfo
 from loris_bids_utils.mri.acquisition import MriAcquisition
 from loris_bids_utils.mri.reader import BidsMriDataTypeReader
-from loris_utils.crypto import compute_file_blake2b_hash
+from loris_utils.crypto import compute_file_blake2b_hash, compute_files_hashes
 from loris_utils.error import group_errors_tuple
 
-from loris_bids_importer.acquisitions import import_bids_acquisitions
-from loris_bids_importer.copy_files import copy_loris_bids_file, get_loris_bids_file_path
+from loris_bids_importer.acquisitions import import_bids_acquisitions_concurrently
+from loris_bids_importer.copy_files import get_loris_bids_file_path, schedule_copy_loris_bids_file
 from loris_bids_importer.env import BidsImportEnv
 from loris_bids_importer.file_type import get_check_bids_imaging_file_type_from_extension
 from loris_bids_importer.mri.sidecar import add_bids_mri_sidecar_file_parameters
@@ -47,12 +50,39 @@ def import_bids_mri_data_type(
     import_env: BidsImportEnv,
     session: DbSession,
     data_type: BidsMriDataTypeReader,
+    io_workers: int,
 ):
     """
     Import the MRI acquisitions found in a BIDS MRI data type directory.
+
+    :param io_workers: The maximum number of NIfTI files hashed concurrently.
     """
 
-    import_bids_acquisitions(
+    # Check the acquisitions of the data type directory against the database in bulk, with one
+    # query for their paths and one query for their hashes.
+
+    registered_paths = get_registered_bids_nifti_paths(env, import_env, session, [data_type])
+
+    # Only the NIfTI files that are not already registered or imported are hashed.
+    hashed_paths = [
+        acquisition.nifti_path for acquisition, _ in data_type.acquisitions
+        if acquisition.nifti_path not in registered_paths
+        and (import_env.journal is None or not import_env.journal.is_acquisition_imported(acquisition.nifti_path))
+    ]
+
+    file_hashes = {
+        nifti_path: hashes['blake2b']
+        for nifti_path, hashes in compute_files_hashes(hashed_paths, ('blake2b',), io_workers).items()
+    }
+
+    if file_hashes != {}:
+        import_env.registered_file_hashes.update(get_registered_file_hashes(env.db, file_hashes.values()))
+
+    # The hashes of the NIfTI files of the acquisitions prepared so far, which are not registered
+    # until all the acquisitions of the data type directory are prepared.
+    prepared_file_hashes: set[str] = set()
+
+    import_bids_acquisitions_concurrently(
         env,
         import_env,
         data_type.acquisitions,
@@ -62,21 +92,74 @@ def import_bids_mri_data_type(
             session,
             acquisition,
             bids_info,
+            acquisition.nifti_path in registered_paths,
+            file_hashes.get(acquisition.nifti_path),
+            prepared_file_hashes,
         ),
     )
 
 
+def get_registered_bids_nifti_paths(
+    env: Env,
+    import_env: BidsImportEnv,
+    session: DbSession,
+    data_types: Iterable[BidsMriDataTypeReader],
+) -> set[Path]:
+    """
+    Get the NIfTI files of some BIDS MRI data type directories of a session whose LORIS path is
+    already registered in the database, using a single query.
+    """
+
+    loris_file_paths = {
+        acquisition.nifti_path: get_loris_bids_file_path(
+            import_env,
+            session,
+            bids_info.data_type,
+            acquisition.nifti_path,
+        )
+        for data_type in data_types
+        for acquisition, bids_info in data_type.acquisitions
+    }
+
+    if loris_file_paths == {}:
+        return set()
+
+    registered_paths = {file.path for file in get_files_with_paths(env.db, loris_file_paths.values())}
+    return {
+        nifti_path for nifti_path, loris_file_path in loris_file_paths.items()
+        if loris_file_path in registered_paths
+    }
+
+
 def import_bids_mri_acquisition(
     env: Env,
     import_env: BidsImportEnv,
     session: DbSession,
     acquisition: MriAcquisition,
     bids_info: BidsAcquisitionInfo,
-):
+    registered: bool,
+    file_hash: str | None,
+    prepared_file_hashes: set[str],
+) -> Callable[[], None] | None:
     """
-    Import a BIDS NIfTI file and its associated files in LORIS.
+    Import a BIDS NIfTI file and its associated files in LORIS. The copies of the files are
+    scheduled on the I/O workers of the import, and a function that registers the files in the
+    database once they are copied is returned, or `None` if the acquisition is skipped.
+
+    :param registered: Whether the NIfTI file path is already registered in the database.
+    :param file_hash:  The BLAKE2b hash of the NIfTI file if it has already been computed.
+    :param prepared_file_hashes: The hashes of the NIfTI files of the acquisitions of the same
+                                 batch that are already prepared, which is completed with the hash
+                                 of this acquisition.
     """
 
+    # Check whether the acquisition was imported by an interrupted import that is resumed.
+
+    if import_env.journal is not None and import_env.journal.is_acquisition_imported(acquisition.nifti_path):
+        import_env.ignored_acquisitions_count += 1
+        log(env, f"File '{acquisition.nifti_path}' was already imported according to the import journal. Skipping.")
+        return None
+
     # The files to copy to LORIS, with the source path on the left and the LORIS path on the right.
     files_to_copy: list[tuple[Path, Path]] = []
 
@@ -85,21 +168,27 @@ def import_bids_mri_acquisition(
 
     # Check whether the file is already registered in LORIS.
 
-    loris_file = try_get_file_with_path(env.db, loris_file_path)
-    if loris_file is not None:
+    if registered:
         import_env.ignored_acquisitions_count += 1
         log(env, f"File '{loris_file_path}' is already registered in LORIS. Skipping.")
-        return
+        return None
 
     # Get information about the file.
 
     file_type, file_hash, scan_type = group_errors_tuple(
         f"Error while checking database information for MRI acquisition '{bids_info.name}'.",
         lambda: get_check_bids_imaging_file_type_from_extension(env, acquisition.nifti_path),
-        lambda: get_check_bids_nifti_file_hash(env, acquisition),
+        lambda: get_check_bids_nifti_file_hash(import_env, acquisition, file_hash),
         lambda: get_check_bids_nifti_mri_scan_type(env, bids_info),
     )
 
+    # Another acquisition of the batch with the same NIfTI file may already be prepared, in which
+    # case the files of this acquisition must not be copied.
+    if file_hash in prepared_file_hashes:
+        raise Exception(f"File with hash '{file_hash}' already imported by another acquisition.")
+
+    prepared_file_hashes.add(file_hash)
+
     # Get the auxiliary files.
 
     # The auxiliary files to the NIfTI file and its sidecar, with the file type on the left and the
@@ -132,25 +221,80 @@ def import_bids_mri_acquisition(
         )
 
         files_to_copy.append((acquisition.sidecar_file.path, json_loris_path))
-        file_parameters['bids_json_file']              = json_loris_path
-        file_parameters['bids_json_file_blake2b_hash'] = compute_file_blake2b_hash(acquisition.sidecar_file.path)
+        file_parameters['bids_json_file'] = json_loris_path
 
-    add_nifti_spatial_file_parameters(acquisition.nifti_path, file_parameters)
+    nifti_parameters = import_env.prepared_nifti_parameters.pop(acquisition.nifti_path, None)
+    if nifti_parameters is not None:
+        file_parameters.update(nifti_parameters)
+    else:
+        add_nifti_spatial_file_parameters(acquisition.nifti_path, file_parameters)
     file_parameters['file_blake2b_hash'] = file_hash
 
     if bids_info.scans_file is not None and bids_info.scan_row is not None:
         add_bids_scans_file_parameters(bids_info.scans_file, bids_info.scan_row, file_parameters)
 
     for aux_file_type, aux_file_path in aux_file_paths:
-        aux_file_hash = compute_file_blake2b_hash(aux_file_path)
         aux_file_loris_path = get_loris_bids_file_path(import_env, session, bids_info.data_type, aux_file_path)
         files_to_copy.append((aux_file_path, aux_file_loris_path))
-        file_parameters[f'bids_{aux_file_type}']              = str(aux_file_loris_path)
-        file_parameters[f'bids_{aux_file_type}_blake2b_hash'] = aux_file_hash
+        file_parameters[f'bids_{aux_file_type}'] = str(aux_file_loris_path)
+
+    # Schedule the copies of the files on the file system, hashing the sidecar and auxiliary files
+    # during the copy (the NIfTI file is already hashed).
+    copy_futures = {
+        copied_file_path: schedule_copy_loris_bids_file(
+            import_env,
+            copied_file_path,
+            loris_copied_file_path,
+            ('blake2b',) if copied_file_path != acquisition.nifti_path else (),
+        )
+        for copied_file_path, loris_copied_file_path in files_to_copy
+    }
 
-    # Copy the files on the file system.
-    for copied_file_path, loris_copied_file_path in files_to_copy:
-        copy_loris_bids_file(import_env, copied_file_path, loris_copied_file_path)
+    return lambda: register_bids_mri_acquisition(
+        env,
+        import_env,
+        session,
+        acquisition,
+        bids_info,
+        loris_file_path,
+        file_type,
+        scan_type,
+        aux_file_paths,
+        file_parameters,
+        copy_futures,
+    )
+
+
+def register_bids_mri_acquisition(
+    env: Env,
+    import_env: BidsImportEnv,
+    session: DbSession,
+    acquisition: MriAcquisition,
+    bids_info: BidsAcquisitionInfo,
+    loris_file_path: Path,
+    file_type: DbImagingFileType,
+    scan_type: DbMriScanType,
+    aux_file_paths: list[tuple[str, Path]],
+    file_parameters: dict[str, Any],
+    copy_futures: dict[Path, Future[dict[str, str]]],
+):
+    """
+    Wait for the files of a BIDS MRI acquisition to be copied and register them in the database.
+    """
+
+    files_hashes = {copied_file_path: future.result() for copied_file_path, future in copy_futures.items()}
+
+    if acquisition.sidecar_file is not None:
+        file_parameters['bids_json_file_blake2b_hash'] = files_hashes[acquisition.sidecar_file.path]['blake2b']
+
+    for aux_file_type, aux_file_path in aux_file_paths:
+        file_parameters[f'bids_{aux_file_type}_blake2b_hash'] = files_hashes[aux_file_path]['blake2b']
+
+    # Another acquisition of this import with the same NIfTI file may have been registered since
+    # this acquisition was checked.
+    file_hash = file_parameters['file_blake2b_hash']
+    if file_hash in import_env.registered_file_hashes:
+        raise Exception(f"File with hash '{file_hash}' already present in the database.")
 
     # Register the file and its parameters in the database.
 
@@ -174,21 +318,31 @@ def import_bids_mri_acquisition(
 
     env.db.commit()
 
+    import_env.registered_file_hashes.add(file_hash)
+
+    if import_env.journal is not None:
+        import_env.journal.record_acquisition(acquisition.nifti_path, file_hash)
+
     # Create and register the file picture.
 
     create_nifti_preview_picture(env, file)
 
 
-def get_check_bids_nifti_file_hash(env: Env, acquisition: MriAcquisition) -> str:
+def get_check_bids_nifti_file_hash(
+    import_env: BidsImportEnv,
+    acquisition: MriAcquisition,
+    file_hash: str | None,
+) -> str:
     """
-    Compute the BLAKE2b hash of a NIfTI file and raise an exception if that hash is already
-    registered in the database.
+    Get the BLAKE2b hash of a NIfTI file, computing it if it is not already known, and raise an
+    exception if that hash is already registered in the database according to the hashes fetched
+    by the import.
     """
 
-    file_hash = compute_file_blake2b_hash(acquisition.nifti_path)
+    if file_hash is None:
+        file_hash = compute_file_blake2b_hash(acquisition.nifti_path)
 
-    file = try_get_file_with_hash(env.db, file_hash)
-    if file is not None:
+    if file_hash in import_env.registered_file_hashes:
         raise Exception(f"File with hash '{file_hash}' already present in the database.")
 
     return file_hash
@@ -0,0 +1,394 @@
+import json
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from lib.config import get_default_bids_visit_label_config
+from lib.db.queries.file import get_files_with_paths, get_registered_file_hashes
+from lib.db.queries.mri_scan_type import get_all_mri_scan_types
+from lib.env import Env
+from loris_bids_utils.info import BidsAcquisitionInfo
+from loris_bids_utils.mri.acquisition import MriAcquisition
+from loris_bids_utils.mri.reader import BidsMriDataTypeReader
+from loris_bids_utils.native_layout import BIDS_EEG_EXTENSIONS
+from loris_bids_utils.reader import BidsDatasetReader, BidsDataTypeReader
+from loris_utils.crypto import HASH_CHUNK_SIZE, compute_files_hashes
+from loris_utils.path import remove_path_extension
+
+from loris_bids_importer.copy_files import get_loris_bids_file_path
+from loris_bids_importer.env import BidsImportEnv
+from loris_bids_importer.mri.main import KNOWN_SUFFIXES_PER_MRI_DATA_TYPE
+from loris_bids_importer.validation.sessions import get_candidates_sessions
+from loris_bids_importer.validation.subjects import get_bids_subjects_candidates
+
+# Maximum number of bytes read from the dataset files to measure the read throughput.
+THROUGHPUT_SAMPLE_SIZE = 256 * 1048576
+
+
+@dataclass
+class BidsSkippedFile:
+    """
+    A BIDS file that will be skipped by the import.
+    """
+
+    path: Path
+    """
+    The path of the skipped file in the source BIDS dataset.
+    """
+
+    reason: str
+    """
+    The reason why the file will be skipped.
+    """
+
+
+@dataclass
+class BidsSessionImportPlan:
+    """
+    The planned import of a BIDS session.
+    """
+
+    subject: str
+    """
+    The BIDS subject label.
+    """
+
+    session: str | None
+    """
+    The BIDS session label, if any.
+    """
+
+    acquisitions_count: int = 0
+    """
+    The number of MRI acquisitions and electrophysiology recordings that will be imported.
+    """
+
+    copied_files_count: int = 0
+    """
+    The number of files that will be copied to the LORIS BIDS dataset.
+    """
+
+    copied_bytes: int = 0
+    """
+    The number of bytes that will be copied to the LORIS BIDS dataset.
+    """
+
+    skipped_files: list[BidsSkippedFile] = field(default_factory=list[BidsSkippedFile])
+    """
+    The acquisition files that will be skipped by the import.
+    """
+
+
+@dataclass
+class BidsImportPlan:
+    """
+    The planned import of a BIDS dataset, computed without writing anything.
+    """
+
+    sessions: list[BidsSessionImportPlan] = field(default_factory=list[BidsSessionImportPlan])
+    """
+    The planned imports of the sessions of the dataset.
+    """
+
+    missing_candidates: list[str] = field(default_factory=list[str])
+    """
+    The BIDS subject labels that have no candidate in LORIS yet.
+    """
+
+    missing_sessions: list[tuple[str, str | None]] = field(default_factory=list[tuple[str, str | None]])
+    """
+    The BIDS subject and session labels that have no session in LORIS yet.
+    """
+
+    missing_scan_types: list[str] = field(default_factory=list[str])
+    """
+    The standard BIDS suffixes that have no MRI scan type in LORIS yet, and that will be created.
+    """
+
+    hashed_bytes: int = 0
+    """
+    The number of bytes that will be read to hash the NIfTI files before they are copied.
+    """
+
+    read_throughput: float | None = None
+    """
+    The read throughput of the source BIDS dataset measured while planning, in bytes per second.
+    """
+
+    estimated_runtime: float | None = None
+    """
+    The estimated duration of the file reads and copies of the import, in seconds.
+    """
+
+
+def plan_bids_dataset_import(
+    env: Env,
+    import_env: BidsImportEnv,
+    bids: BidsDatasetReader,
+    copy: bool,
+    max_workers: int,
+) -> BidsImportPlan:
+    """
+    Plan the import of a BIDS dataset without writing anything, using bulk database queries to
+    find the missing candidates, sessions and scan types, and the acquisitions that are already
+    registered in LORIS by path or by hash.
+    """
+
+    plan = BidsImportPlan()
+
+    candidates = get_bids_subjects_candidates(env, [subject.label for subject in bids.subjects])
+    sessions = get_candidates_sessions(env, candidates)
+    scan_type_names = {scan_type.name for scan_type in get_all_mri_scan_types(env.db)}
+    default_visit_label = get_default_bids_visit_label_config(env)
+
+    plan.missing_candidates = [subject.label for subject in bids.subjects if subject.label not in candidates]
+
+    # The MRI acquisitions to check in the database, with their LORIS path if their session
+    # already exists in LORIS.
+    mri_acquisitions: list[tuple[BidsSessionImportPlan, MriAcquisition, Path | None]] = []
+
+    for bids_session in bids.sessions:
+        session_plan = BidsSessionImportPlan(bids_session.subject.label, bids_session.label)
+        plan.sessions.append(session_plan)
+
+        candidate = candidates.get(bids_session.subject.label)
+        visit_label = bids_session.label if bids_session.label is not None else default_visit_label
+        if candidate is not None and visit_label is not None:
+            session = sessions.get((candidate.id, visit_label.lower()))
+        else:
+            session = None
+
+        if session is None:
+            plan.missing_sessions.append((bids_session.subject.label, bids_session.label))
+
+        for data_type in bids_session.data_types:
+            match data_type:
+                case BidsMriDataTypeReader():
+                    for acquisition, bids_info in data_type.acquisitions:
+                        skip_reason = get_bids_mri_acquisition_skip_reason(plan, bids_info, scan_type_names)
+                        if skip_reason is not None:
+                            session_plan.skipped_files.append(BidsSkippedFile(acquisition.nifti_path, skip_reason))
+                            continue
+
+                        if session is not None:
+                            loris_file_path = get_loris_bids_file_path(
+                                import_env,
+                                session,
+                                bids_info.data_type,
+                                acquisition.nifti_path,
+                            )
+                        else:
+                            loris_file_path = None
+
+                        mri_acquisitions.append((session_plan, acquisition, loris_file_path))
+                case BidsDataTypeReader():
+                    plan_bids_eeg_data_type(session_plan, data_type, copy)
+
+    # The throughput is measured before the files are hashed, which would put them in the page
+    # cache of the system.
+    plan.read_throughput = measure_read_throughput(
+        [acquisition.nifti_path for _, acquisition, _ in mri_acquisitions],
+    )
+
+    plan_bids_mri_acquisitions(env, plan, mri_acquisitions, copy, max_workers)
+
+    if plan.read_throughput is not None:
+        # A file placed with another strategy than a copy is not read.
+        copied_bytes = sum(session_plan.copied_bytes for session_plan in plan.sessions)
+        if import_env.placement_strategy != 'copy':
+            copied_bytes = 0
+
+        plan.estimated_runtime = (plan.hashed_bytes + copied_bytes) / plan.read_throughput
+
+    return plan
+
+
+def get_bids_mri_acquisition_skip_reason(
+    plan: BidsImportPlan,
+    bids_info: BidsAcquisitionInfo,
+    scan_type_names: set[str],
+) -> str | None:
+    """
+    Get the reason why a BIDS MRI acquisition will be skipped because of its scan type, or return
+    `None` if it will not be skipped. The missing standard scan types are added to the plan.
+    """
+
+    if bids_info.suffix is None:
+        return "No BIDS suffix found in the NIfTI file name."
+
+    if bids_info.suffix in scan_type_names:
+        return None
+
+    if bids_info.suffix not in KNOWN_SUFFIXES_PER_MRI_DATA_TYPE[bids_info.data_type]:
+        return f"Unknown MRI file suffix '{bids_info.suffix}'."
+
+    if bids_info.suffix not in plan.missing_scan_types:
+        plan.missing_scan_types.append(bids_info.suffix)
+
+    return None
+
+
+def plan_bids_mri_acquisitions(
+    env: Env,
+    plan: BidsImportPlan,
+    mri_acquisitions: list[tuple[BidsSessionImportPlan, MriAcquisition, Path | None]],
+    copy: bool,
+    max_workers: int,
+):
+    """
+    Check the MRI acquisitions of a BIDS dataset against the database with one query for their
+    paths and one query for their hashes, and add them to the plan.
+    """
+
+    loris_file_paths = [loris_file_path for _, _, loris_file_path in mri_acquisitions if loris_file_path is not None]
+    registered_paths: set[Path] = set()
+    if loris_file_paths != []:
+        registered_paths = {file.path for file in get_files_with_paths(env.db, loris_file_paths)}
+
+    new_acquisitions: list[tuple[BidsSessionImportPlan, MriAcquisition]] = []
+    for session_plan, acquisition, loris_file_path in mri_acquisitions:
+        if loris_file_path in registered_paths:
+            session_plan.skipped_files.append(
+                BidsSkippedFile(acquisition.nifti_path, f"File '{loris_file_path}' is already registered in LORIS.")
+            )
+        else:
+            new_acquisitions.append((session_plan, acquisition))
+
+    # The NIfTI files are hashed in the same way as during the import, using the hashes of the
+    # persistent hash cache if one is configured.
+    files_hashes = compute_files_hashes(
+        [acquisition.nifti_path for _, acquisition in new_acquisitions],
+        ('blake2b',),
+        max_workers,
+    )
+
+    file_hashes = {file_path: hashes['blake2b'] for file_path, hashes in files_hashes.items()}
+
+    registered_hashes: set[str] = set()
+    if file_hashes != {}:
+        registered_hashes = get_registered_file_hashes(env.db, file_hashes.values())
+
+    for session_plan, acquisition in new_acquisitions:
+        file_hash = file_hashes[acquisition.nifti_path]
+        if file_hash in registered_hashes:
+            session_plan.skipped_files.append(
+                BidsSkippedFile(acquisition.nifti_path, f"File with hash '{file_hash}' is already registered in LORIS.")
+            )
+            continue
+
+        # Two files of the dataset with the same content cannot both be registered.
+        registered_hashes.add(file_hash)
+
+        session_plan.acquisitions_count += 1
+        plan.hashed_bytes += os.path.getsize(acquisition.nifti_path)
+
+        if copy:
+            for file_path in get_mri_acquisition_file_paths(acquisition):
+                session_plan.copied_files_count += 1
+                session_plan.copied_bytes += os.path.getsize(file_path)
+
+
+def plan_bids_eeg_data_type(session_plan: BidsSessionImportPlan, data_type: BidsDataTypeReader, copy: bool):
+    """
+    Add the electrophysiology recordings of a BIDS data type directory to the plan of its session.
+    These recordings are not checked against the database.
+    """
+
+    session = data_type.session
+    native_layout = session.subject.dataset.native_layout
+
+    recording_paths: set[Path] = set()
+    copied_paths: set[Path] = set()
+    for file in native_layout.get_files(session.subject.label, session.label, data_type.name):
+        if file.extension in BIDS_EEG_EXTENSIONS and file.suffix == data_type.name:
+            recording_paths.add(remove_path_extension(file.path))
+            copied_paths.add(file.path)
+
+    for recording_path in recording_paths:
+        associated_files = data_type.associated_files.get(recording_path)
+        if associated_files is None:
+            continue
+
+        for associated_file in [
+            associated_files.sidecar,
+            associated_files.events,
+            associated_files.channels,
+            associated_files.fdt,
+            *associated_files.electrodes,
+        ]:
+            if associated_file is not None:
+                copied_paths.add(associated_file.path)
+
+    session_plan.acquisitions_count += len(recording_paths)
+    if copy:
+        session_plan.copied_files_count += len(copied_paths)
+        session_plan.copied_bytes += sum(os.path.getsize(copied_path) for copied_path in copied_paths)
+
+
+def get_mri_acquisition_file_paths(acquisition: MriAcquisition) -> list[Path]:
+    """
+    Get the paths of the files of an MRI acquisition that are copied during its import.
+    """
+
+    file_paths = [acquisition.nifti_path]
+    if acquisition.sidecar_file is not None:
+        file_paths.append(acquisition.sidecar_file.path)
+
+    for aux_file_path in [
+        acquisition.bval_path,
+        acquisition.bvec_path,
+        acquisition.physio_path,
+        acquisition.events_path,
+    ]:
+        if aux_file_path is not None:
+            file_paths.append(aux_file_path)
+
+    return file_paths
+
+
+def measure_read_throughput(file_paths: list[Path], sample_size: int = THROUGHPUT_SAMPLE_SIZE) -> float | None:
+    """
+    Measure the read throughput of some files in bytes per second, by reading at most a given
+    number of bytes from them, or return `None` if nothing can be read.
+    """
+
+    read_bytes = 0
+    start_time = time.monotonic()
+    for file_path in file_paths:
+        with open(file_path, 'rb') as file:
+            while read_bytes < sample_size and (chunk := file.read(HASH_CHUNK_SIZE)):
+                read_bytes += len(chunk)
+
+        if read_bytes >= sample_size:
+            break
+
+    elapsed_time = time.monotonic() - start_time
+    if read_bytes == 0 or elapsed_time <= 0:
+        return None
+
+    return read_bytes / elapsed_time
+
+
+def get_bids_import_plan_json(plan: BidsImportPlan) -> dict[str, Any]:
+    """
+    Get the JSON representation of a BIDS import plan, including the totals of its sessions.
+    """
+
+    return {
+        'acquisitions_count': sum(session_plan.acquisitions_count for session_plan in plan.sessions),
+        'copied_files_count': sum(session_plan.copied_files_count for session_plan in plan.sessions),
+        'copied_bytes':       sum(session_plan.copied_bytes for session_plan in plan.sessions),
+        'skipped_files_count': sum(len(session_plan.skipped_files) for session_plan in plan.sessions),
+        **asdict(plan),
+    }
+
+
+def write_bids_import_plan_json(plan: BidsImportPlan, path: Path):
+    """
+    Write a BIDS import plan to a JSON file.
+    """
+
+    with open(path, 'w') as file:
+        json.dump(get_bids_import_plan_json(plan), file, indent=2, default=str)
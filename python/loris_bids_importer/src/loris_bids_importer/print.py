@@ -1,8 +1,12 @@
+from collections import Counter
+from datetime import timedelta
+
 from lib.env import Env
 from lib.logging import log
 from loris_bids_utils.reader import BidsDatasetReader
 
 from loris_bids_importer.env import BidsImportEnv
+from loris_bids_importer.plan import BidsImportPlan
 
 
 def print_bids_info(env: Env, bids: BidsDatasetReader):
@@ -36,3 +40,79 @@ def print_bids_import_summary(env: Env, import_env: BidsImportEnv):
             f" {import_env.failed_acquisitions_count} errors."
         ),
     )
+
+    if import_env.placed_files:
+        strategy_counts = Counter(import_env.placed_files.values())
+        log(
+            env,
+            "Placed files by strategy: "
+            + ", ".join(f"{strategy}: {count}" for strategy, count in sorted(strategy_counts.items())),
+        )
+
+    if import_env.copy_scheduler is not None:
+        log(env, import_env.copy_scheduler.get_summary())
+
+
+def print_bids_import_plan(env: Env, plan: BidsImportPlan):
+    """
+    Print a planned BIDS import.
+    """
+
+    for session_plan in plan.sessions:
+        log(
+            env,
+            (
+                f"Subject '{session_plan.subject}' session '{session_plan.session}':"
+                f" {session_plan.acquisitions_count} acquisitions to import,"
+                f" {session_plan.copied_files_count} files to copy ({format_bytes(session_plan.copied_bytes)}),"
+                f" {len(session_plan.skipped_files)} files to skip."
+            ),
+        )
+
+        for skipped_file in session_plan.skipped_files:
+            log(env, f"- Skip '{skipped_file.path}': {skipped_file.reason}")
+
+    if plan.missing_candidates != []:
+        log(env, f"Missing candidates: {', '.join(plan.missing_candidates)}")
+
+    if plan.missing_sessions != []:
+        log(
+            env,
+            "Missing sessions: "
+            + ", ".join(f"{subject} {session}" for subject, session in plan.missing_sessions),
+        )
+
+    if plan.missing_scan_types != []:
+        log(env, f"Missing MRI scan types (created by the import): {', '.join(plan.missing_scan_types)}")
+
+    log(
+        env,
+        (
+            f"Total: {sum(session_plan.acquisitions_count for session_plan in plan.sessions)} acquisitions to import,"
+            f" {format_bytes(sum(session_plan.copied_bytes for session_plan in plan.sessions))} to copy,"
+            f" {format_bytes(plan.hashed_bytes)} to hash."
+        ),
+    )
+
+    if plan.read_throughput is not None and plan.estimated_runtime is not None:
+        log(
+            env,
+            (
+                f"Measured read throughput: {format_bytes(round(plan.read_throughput))}/s,"
+                f" estimated file processing time: {timedelta(seconds=round(plan.estimated_runtime))}."
+            ),
+        )
+
+
+def format_bytes(size: float) -> str:
+    """
+    Format a number of bytes in a human-readable way.
+    """
+
+    for unit in ['B', 'KiB', 'MiB', 'GiB']:
+        if size < 1024:
+            return f"{size:.1f} {unit}" if unit != 'B' else f"{size:.0f} {unit}"
+
+        size /= 1024
+
+    return f"{size:.1f} TiB"
@@ -6,12 +6,15 @@ from typing import Any
 import lib.exitcode
 from lib.logging import log_error_exit
 from lib.lorisgetopt import LorisGetOpt
+from loris_bids_utils.layout_index import BIDS_LAYOUT_INDEX_MODES
+from loris_utils.fs import FILE_PLACEMENT_FALLBACKS
+from loris_utils.parse import try_parse_int
 
 from loris_bids_importer.args import Args
 from loris_bids_importer.main import import_bids_dataset
 
 
-def pack_args(options_dict: dict[str, Any]) -> Args:
+def pack_args(options_dict: dict[str, Any], io_workers: int, jobs: int) -> Args:
     return Args(
         source_bids_path = Path(options_dict['directory']['value']),
         type             = options_dict['type']['value'],
@@ -19,6 +22,14 @@ def pack_args(options_dict: dict[str, Any]) -> Args:
         create_candidate = options_dict['create-candidate']['value'],
         create_session   = options_dict['create-session']['value'],
         copy             = not options_dict['no-copy']['value'],
+        placement        = options_dict['placement']['value'],
+        io_workers       = io_workers,
+        jobs             = jobs,
+        layout_index     = options_dict['layout-index']['value'],
+        native_walker    = options_dict['native-walker']['value'],
+        plan             = options_dict['plan']['value'] or options_dict['plan-json']['value'] is not None,
+        plan_json_path   = Path(options_dict['plan-json']['value']) if options_dict['plan-json']['value'] else None,
+        resume           = options_dict['resume']['value'],
         verbose          = options_dict['verbose']['value'],
     )
 
@@ -36,6 +47,27 @@ def main():
         "\t-s, --create-session     : to create BIDS sessions in LORIS (optional)\n"
         "\t-b, --no-bids-validation : to disable BIDS validation for BIDS compliance\n"
         "\t-a, --no-copy            : to disable dataset copy in data assembly_bids\n"
+        "\t-l, --placement          : copy | reflink | hardlink | symlink. Specify how the files are placed\n"
+        "\t                           in the LORIS data directory (default: copy). If the file system does\n"
+        "\t                           not support the strategy, the files are copied. The metadata files\n"
+        "\t                           (JSON, TSV, bval, bvec) are always copied, as linked files would be\n"
+        "\t                           modified in the source dataset if edited in LORIS.\n"
+        "\t-w, --io-workers         : number of files copied concurrently to the LORIS data directory\n"
+        "\t                           (default: 4)\n"
+        "\t-j, --jobs               : number of sessions prepared concurrently (hashing, NIfTI header reading)\n"
+        "\t                           while the sessions are imported in order (default: 1)\n"
+        "\t-i, --layout-index       : reuse | refresh | rebuild. Specify how the persisted PyBIDS index of\n"
+        "\t                           the dataset is used (default: refresh). 'reuse' uses the existing\n"
+        "\t                           index as is, 'refresh' rebuilds it if the dataset has changed, and\n"
+        "\t                           'rebuild' always rebuilds it.\n"
+        "\t-n, --native-walker      : to read the dataset with the native BIDS walker instead of PyBIDS,\n"
+        "\t                           which is faster on large datasets. PyBIDS is still used for EEG.\n"
+        "\t    --plan               : to print the plan of the import (acquisitions, bytes to copy, skipped files,\n"
+        "\t                           estimated runtime) without writing anything in LORIS\n"
+        "\t    --plan-json          : path of a JSON file in which to write the plan of the import, implies --plan\n"
+        "\t-r, --resume             : to resume an interrupted import using the journal of the LORIS BIDS\n"
+        "\t                           dataset, skipping the completed acquisitions and copies and copying\n"
+        "\t                           the incomplete files again. Not available with --no-copy.\n"
         "\t-t, --type               : raw | derivative. Specify the dataset type.\n"
         "\t                           If not set, the pipeline will look for both raw and derivative files.\n"
         "\t                           Required if no dataset_description.json is found.\n"
@@ -61,6 +93,30 @@ def main():
         "no-copy": {
             "value": False, "required": False, "expect_arg": False, "short_opt": "a", "is_path": False
         },
+        "placement": {
+            "value": 'copy', "required": False, "expect_arg": True, "short_opt": "l", "is_path": False
+        },
+        "io-workers": {
+            "value": 4, "required": False, "expect_arg": True, "short_opt": "w", "is_path": False
+        },
+        "jobs": {
+            "value": 1, "required": False, "expect_arg": True, "short_opt": "j", "is_path": False
+        },
+        "layout-index": {
+            "value": 'refresh', "required": False, "expect_arg": True, "short_opt": "i", "is_path": False
+        },
+        "native-walker": {
+            "value": False, "required": False, "expect_arg": False, "short_opt": "n", "is_path": False
+        },
+        "plan": {
+            "value": False, "required": False, "expect_arg": False, "short_opt": None, "is_path": False
+        },
+        "plan-json": {
+            "value": None, "required": False, "expect_arg": True, "short_opt": None, "is_path": False
+        },
+        "resume": {
+            "value": False, "required": False, "expect_arg": False, "short_opt": "r", "is_path": False
+        },
         "type": {
             "value": None, "required": False, "expect_arg": True, "short_opt": "t", "is_path": False
         },
@@ -88,7 +144,46 @@ def main():
             lib.exitcode.MISSING_ARG,
         )
 
-    args = pack_args(loris_getopt_obj.options_dict)
+    placement = loris_getopt_obj.options_dict['placement']['value']
+    if placement not in FILE_PLACEMENT_FALLBACKS:
+        log_error_exit(
+            env,
+            f"--placement must be one of {', '.join(FILE_PLACEMENT_FALLBACKS)}\n{usage}",
+            lib.exitcode.INVALID_ARG,
+        )
+
+    io_workers = try_parse_int(str(loris_getopt_obj.options_dict['io-workers']['value']))
+    if io_workers is None or io_workers < 1:
+        log_error_exit(
+            env,
+            f"--io-workers must be a positive integer\n{usage}",
+            lib.exitcode.INVALID_ARG,
+        )
+
+    jobs = try_parse_int(str(loris_getopt_obj.options_dict['jobs']['value']))
+    if jobs is None or jobs < 1:
+        log_error_exit(
+            env,
+            f"--jobs must be a positive integer\n{usage}",
+            lib.exitcode.INVALID_ARG,
+        )
+
+    layout_index = loris_getopt_obj.options_dict['layout-index']['value']
+    if layout_index not in BIDS_LAYOUT_INDEX_MODES:
+        log_error_exit(
+            env,
+            f"--layout-index must be one of {', '.join(BIDS_LAYOUT_INDEX_MODES)}\n{usage}",
+            lib.exitcode.INVALID_ARG,
+        )
+
+    if loris_getopt_obj.options_dict['resume']['value'] and loris_getopt_obj.options_dict['no-copy']['value']:
+        log_error_exit(
+            env,
+            f"--resume cannot be used with --no-copy\n{usage}",
+            lib.exitcode.INVALID_ARG,
+        )
+
+    args = pack_args(loris_getopt_obj.options_dict, io_workers, jobs)
 
     # read and insert BIDS data
     import_bids_dataset(
@@ -0,0 +1,160 @@
+from collections import deque
+from collections.abc import Callable, Collection, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from lib.imaging_lib.nifti import add_nifti_spatial_file_parameters
+from loris_bids_utils.mri.reader import BidsMriDataTypeReader
+from loris_bids_utils.native_layout import BIDS_EEG_EXTENSIONS
+from loris_bids_utils.reader import BidsSessionReader
+from loris_utils.crypto import compute_file_blake2b_hash
+
+from loris_bids_importer.journal import BidsImportJournal
+
+
+@dataclass
+class BidsSessionFiles:
+    """
+    The files of a BIDS session that are prepared before the session is imported.
+    """
+
+    nifti_paths: list[Path] = field(default_factory=list[Path])
+    """
+    The NIfTI files of the MRI acquisitions of the session.
+    """
+
+    hashed_paths: list[Path] = field(default_factory=list[Path])
+    """
+    The files of the session that are hashed during the import, including the NIfTI files.
+    """
+
+
+@dataclass
+class BidsPreparedSession:
+    """
+    The result of the preparation of a BIDS session, which does not depend on the database.
+    """
+
+    nifti_parameters: dict[Path, dict[str, Any]]
+    """
+    The spatial file parameters of the NIfTI files of the session, indexed by NIfTI file path.
+    """
+
+
+class BidsSessionPreparer:
+    """
+    Pool of workers that prepares the BIDS sessions ahead of their import, by hashing their files
+    and reading their NIfTI headers, so that several sessions are prepared concurrently while the
+    main thread, which is the only one that writes to the database, imports the sessions in order.
+
+    The file hashes are memoized by the hashing functions, so the import of a prepared session
+    does not read its files again to hash them. The NIfTI files that are already registered in the
+    database, which are skipped by the import, are not prepared.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        journal: BidsImportJournal | None = None,
+        get_registered_paths: Callable[[BidsSessionReader], set[Path]] | None = None,
+    ):
+        """
+        :param journal: the import journal, whose imported files are not prepared
+        :param get_registered_paths: function that returns the NIfTI files of a session that are
+            already registered in the database, which is called in the main thread
+        """
+
+        self.max_workers = max_workers
+        self.journal = journal
+        self.get_registered_paths = get_registered_paths
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='bids_session')
+
+    def iter_prepared_sessions(
+        self,
+        bids_sessions: Iterable[BidsSessionReader],
+    ) -> Iterator[tuple[BidsSessionReader, Future[BidsPreparedSession]]]:
+        """
+        Iterate over BIDS sessions in order along with the futures of their preparation, keeping
+        the preparation of at most as many sessions as workers ahead of the iteration.
+        """
+
+        pending: deque[tuple[BidsSessionReader, Future[BidsPreparedSession]]] = deque()
+        for bids_session in bids_sessions:
+            # The BIDS readers and the database session are not thread-safe, so the files of the
+            # session are read and checked in the main thread.
+            registered_paths: set[Path] = set()
+            if self.get_registered_paths is not None:
+                registered_paths = self.get_registered_paths(bids_session)
+
+            session_files = get_bids_session_files(bids_session, self.journal, registered_paths)
+            pending.append((bids_session, self.executor.submit(prepare_bids_session, session_files)))
+            if len(pending) > self.max_workers:
+                yield pending.popleft()
+
+        while pending:
+            yield pending.popleft()
+
+    def shutdown(self):
+        """
+        Cancel the pending preparations and stop the workers.
+        """
+
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+
+def get_bids_session_files(
+    bids_session: BidsSessionReader,
+    journal: BidsImportJournal | None = None,
+    registered_paths: Collection[Path] = (),
+) -> BidsSessionFiles:
+    """
+    Get the files of a BIDS session that are prepared before the session is imported, excluding
+    the NIfTI files already registered in the database and the files already imported according to
+    the import journal if there is one.
+    """
+
+    session_files = BidsSessionFiles()
+    for data_type in bids_session.data_types:
+        if journal is not None and journal.is_data_type_imported(data_type.path):
+            continue
+
+        if isinstance(data_type, BidsMriDataTypeReader):
+            for acquisition, _ in data_type.acquisitions:
+                if acquisition.nifti_path in registered_paths:
+                    continue
+
+                if journal is not None and journal.is_acquisition_imported(acquisition.nifti_path):
+                    continue
+
+                session_files.nifti_paths.append(acquisition.nifti_path)
+                session_files.hashed_paths.append(acquisition.nifti_path)
+        else:
+            native_layout = bids_session.subject.dataset.native_layout
+            for file in native_layout.get_files(
+                bids_session.subject.label,
+                bids_session.label,
+                data_type  = data_type.name,
+                extensions = BIDS_EEG_EXTENSIONS | {'.fdt'},
+            ):
+                session_files.hashed_paths.append(file.path)
+
+    return session_files
+
+
+def prepare_bids_session(session_files: BidsSessionFiles) -> BidsPreparedSession:
+    """
+    Hash the files of a BIDS session and read its NIfTI headers.
+    """
+
+    # The sessions are already prepared concurrently, so the files of a session are hashed serially.
+    for hashed_path in session_files.hashed_paths:
+        compute_file_blake2b_hash(hashed_path)
+
+    nifti_parameters: dict[Path, dict[str, Any]] = {}
+    for nifti_path in session_files.nifti_paths:
+        nifti_parameters[nifti_path] = {}
+        add_nifti_spatial_file_parameters(nifti_path, nifti_parameters[nifti_path])
+
+    return BidsPreparedSession(nifti_parameters)
@@ -3,57 +3,108 @@ from lib.db.models.candidate import DbCandidate
 from lib.db.models.cohort import DbCohort
 from lib.db.models.session import DbSession
 from lib.db.queries.cohort import try_get_cohort_with_name
-from lib.db.queries.session import try_get_session_with_cand_id_visit_label
+from lib.db.queries.session import get_sessions_with_candidate_ids
 from lib.env import Env
 from lib.logging import log
 from loris_bids_utils.files.participants import BidsParticipantTsvRow
 from loris_bids_utils.info import BidsSessionInfo
 from loris_utils.error import group_errors
 
-from loris_bids_importer.validation.subjects import validate_bids_subject
-
 
 def validate_bids_sessions(
     env: Env,
     session_infos: list[BidsSessionInfo],
+    candidates: dict[str, DbCandidate],
     create_session: bool,
-) -> list[DbSession]:
+) -> dict[tuple[str, str | None], DbSession]:
     """
     Check that the sessions of a BIDS dataset exist in LORIS, or create then using their BIDS
     `participants.tsv` row information if candidate creation is enabled. Raise an exception if any
-    candidate does not exist and cannot be created.
+    candidate does not exist and cannot be created. Return the sessions indexed by BIDS subject
+    and session labels.
+
+    The existing sessions of the candidates, which are indexed by BIDS subject label, are fetched
+    with a single query and the missing sessions are created together.
     """
 
-    return group_errors(
+    if any(session_info.session is None for session_info in session_infos):
+        default_visit_label = get_default_bids_visit_label_config(env)
+    else:
+        default_visit_label = None
+
+    existing_sessions = get_candidates_sessions(env, candidates)
+    new_sessions: list[DbSession] = []
+
+    sessions = group_errors(
         "Could not get or create the LORIS sessions for the BIDS dataset.",
-        (lambda: validate_bids_session(env, session_info, create_session) for session_info in session_infos),
+        (
+            lambda: validate_bids_session(
+                env,
+                session_info,
+                candidates[session_info.subject],
+                default_visit_label,
+                existing_sessions,
+                new_sessions,
+                create_session,
+            ) for session_info in session_infos
+        ),
     )
 
+    # The new sessions are only added once they have all been built, so that they are inserted
+    # together in the database.
+    if new_sessions != []:
+        env.db.add_all(new_sessions)
+        env.db.flush()
+
+    return {
+        (session_info.subject, session_info.session): session
+        for session_info, session in zip(session_infos, sessions)
+    }
+
+
+def get_candidates_sessions(env: Env, candidates: dict[str, DbCandidate]) -> dict[tuple[int, str], DbSession]:
+    """
+    Get the existing sessions of some candidates with a single query, and return them indexed by
+    candidate ID and lowercase visit label, since the visit labels are compared case-insensitively
+    by the database.
+    """
+
+    if candidates == {}:
+        return {}
+
+    candidate_ids = {candidate.id for candidate in candidates.values()}
+    return {
+        (session.candidate_id, session.visit_label.lower()): session
+        for session in get_sessions_with_candidate_ids(env.db, candidate_ids)
+    }
+
 
 def validate_bids_session(
     env: Env,
     session_info: BidsSessionInfo,
+    candidate: DbCandidate,
+    default_visit_label: str | None,
+    existing_sessions: dict[tuple[int, str], DbSession],
+    new_sessions: list[DbSession],
     create_session: bool,
 ) -> DbSession:
     """
-    Check that a BIDS session exists in LORIS, or create it using information previously obtained
-    from the BIDS dataset if the relevant argument is passed. Raise an exception if the session
-    does not exist or cannot be created.
+    Check that a BIDS session exists in LORIS, or build it using information previously obtained
+    from the BIDS dataset if the relevant argument is passed, in which case the session is added
+    to the new sessions. Raise an exception if the session does not exist or cannot be created.
     """
 
-    candidate = validate_bids_subject(env, session_info)
-
     if session_info.session is not None:
         visit_label = session_info.session
     else:
-        visit_label = get_default_bids_visit_label_config(env)
+        visit_label = default_visit_label
 
     if visit_label is None:
         raise Exception(
             "No session label found in the BIDS dataset, and no default session found in the LORIS configuration."
         )
 
-    session = try_get_session_with_cand_id_visit_label(env.db, candidate.cand_id, visit_label)
+    session = existing_sessions.get((candidate.id, visit_label.lower()))
     if session is not None:
         return session
 
@@ -68,18 +119,20 @@ def validate_bids_session(
             " BIDS `participants.tsv` file."
         )
 
-    return create_bids_session(env, candidate, session_info.participant_row, visit_label)
+    session = build_bids_session(env, candidate, session_info.participant_row, visit_label)
+    new_sessions.append(session)
+    return session
 
 
-def create_bids_session(
+def build_bids_session(
     env: Env,
     candidate: DbCandidate,
     participant: BidsParticipantTsvRow,
     visit_label: str,
 ) -> DbSession:
     """
-    Create a session using information obtained from a BIDS dataset, or raise an exception if the
-    session does not exist or cannot be created.
+    Build a session using information obtained from a BIDS dataset, or raise an exception if the
+    session cannot be created.
     """
 
     cohort = get_bids_participant_row_cohort(env, participant)
@@ -93,7 +146,7 @@ def create_bids_session(
         )
     )
 
-    session = DbSession(
+    return DbSession(
         candidate_id     = candidate.id,
         visit_label      = visit_label,
         current_stage    = 'Not Started',
@@ -109,11 +162,6 @@ def create_bids_session(
         mri_caveat       = True,
     )
 
-    env.db.add(session)
-    env.db.flush()
-
-    return session
-
 
 def get_bids_participant_row_cohort(env: Env, participant: BidsParticipantTsvRow) -> DbCohort:
     """
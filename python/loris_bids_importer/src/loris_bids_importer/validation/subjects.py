@@ -1,10 +1,10 @@
 from datetime import datetime
 
-from lib.candidate import generate_new_cand_id
+from lib.candidate import generate_new_cand_ids
 from lib.db.models.candidate import DbCandidate
 from lib.db.models.project import DbProject
 from lib.db.models.site import DbSite
-from lib.db.queries.candidate import try_get_candidate_with_cand_id, try_get_candidate_with_psc_id
+from lib.db.queries.candidate import get_candidates_with_cand_ids, get_candidates_with_psc_ids
 from lib.db.queries.project import try_get_project_with_alias, try_get_project_with_name
 from lib.db.queries.sex import try_get_sex_with_name
 from lib.db.queries.site import try_get_site_with_alias, try_get_site_with_name
@@ -20,44 +20,81 @@ def validate_bids_subjects(
     env: Env,
     subject_infos: list[BidsSubjectInfo],
     create_candidate: bool = False,
-) -> list[DbCandidate]:
+) -> dict[str, DbCandidate]:
     """
     Check that the candidates of a BIDS dataset exist in LORIS, or create then using the BIDS
     metadata information if candidate creation is enabled. Raise an exception if any candidate
-    does not exist and cannot be created.
+    does not exist and cannot be created. Return the candidates indexed by BIDS subject label.
+
+    The existing candidates are fetched with bulk queries and the missing candidates are created
+    together.
     """
 
-    return group_errors(
+    candidates = get_bids_subjects_candidates(env, [subject_info.subject for subject_info in subject_infos])
+
+    missing_subject_infos = [
+        subject_info for subject_info in subject_infos if subject_info.subject not in candidates
+    ]
+
+    participants = group_errors(
         "Could not get or create the LORIS candidates for the BIDS dataset.",
-        (lambda: validate_bids_subject(env, subject_info, create_candidate) for subject_info in subject_infos),
+        (
+            lambda: get_bids_subject_creation_participant(subject_info, create_candidate)
+            for subject_info in missing_subject_infos
+        ),
     )
 
+    new_candidates = create_bids_candidates(env, participants)
+    for subject_info, candidate in zip(missing_subject_infos, new_candidates):
+        candidates[subject_info.subject] = candidate
 
-def validate_bids_subject(
-    env: Env,
-    subject_info: BidsSubjectInfo,
-    create_candidate: bool = False,
-) -> DbCandidate:
+    return candidates
+
+
+def get_bids_subjects_candidates(env: Env, subject_labels: list[str]) -> dict[str, DbCandidate]:
     """
-    Check that the candidate of a BIDS dataset exists in LORIS, or create them using its BIDS
-    metadata information if candidate creation is enabled. Raise an exception if the candidate
-    does not exist and cannot be created.
+    Get the existing LORIS candidates of some BIDS subject labels, which are identified either as
+    CandIDs or PSCIDs, using one query for each kind of identifier. Return the candidates indexed
+    by BIDS subject label.
     """
 
-    cand_id = try_parse_int(subject_info.subject)
-    if cand_id is not None:
-        candidate = try_get_candidate_with_cand_id(env.db, cand_id)
-        if candidate is None:
-            raise Exception(
-                f"No LORIS candidate found for the BIDS subject label '{subject_info.subject}'"
-                " (identified as a CandID)."
-            )
+    cand_id_labels: dict[int, str] = {}
+    psc_id_labels: dict[str, str] = {}
+    for subject_label in subject_labels:
+        cand_id = try_parse_int(subject_label)
+        if cand_id is not None:
+            cand_id_labels[cand_id] = subject_label
+        else:
+            # The PSCIDs are compared case-insensitively by the database.
+            psc_id_labels[subject_label.lower()] = subject_label
 
-        return candidate
+    candidates: dict[str, DbCandidate] = {}
+
+    if cand_id_labels != {}:
+        for candidate in get_candidates_with_cand_ids(env.db, cand_id_labels.keys()):
+            candidates[cand_id_labels[candidate.cand_id]] = candidate
+
+    if psc_id_labels != {}:
+        for candidate in get_candidates_with_psc_ids(env.db, psc_id_labels.values()):
+            candidates[psc_id_labels.get(candidate.psc_id.lower(), candidate.psc_id)] = candidate
+
+    return candidates
+
+
+def get_bids_subject_creation_participant(
+    subject_info: BidsSubjectInfo,
+    create_candidate: bool = False,
+) -> BidsParticipantTsvRow:
+    """
+    Get the BIDS `participants.tsv` row used to create the candidate of a BIDS subject that does
+    not exist in LORIS. Raise an exception if the candidate cannot be created.
+    """
 
-    candidate = try_get_candidate_with_psc_id(env.db, subject_info.subject)
-    if candidate is not None:
-        return candidate
+    if try_parse_int(subject_info.subject) is not None:
+        raise Exception(
+            f"No LORIS candidate found for the BIDS subject label '{subject_info.subject}'"
+            " (identified as a CandID)."
+        )
 
     if not create_candidate:
         raise Exception(
@@ -71,19 +108,45 @@ def validate_bids_subject(
             " BIDS `participants.tsv` file."
         )
 
-    return create_bids_candidate(env, subject_info.participant_row)
+    return subject_info.participant_row
+
+
+def create_bids_candidates(env: Env, participants: list[BidsParticipantTsvRow]) -> list[DbCandidate]:
+    """
+    Create candidates using the information obtained from BIDS `participants.tsv` rows, or raise
+    an exception if any of these candidates cannot be created.
+    """
+
+    if participants == []:
+        return []
+
+    cand_ids = generate_new_cand_ids(env, len(participants))
 
+    candidates = group_errors(
+        "Could not create the LORIS candidates for the BIDS dataset.",
+        (
+            lambda: build_bids_candidate(env, participant, cand_id)
+            for participant, cand_id in zip(participants, cand_ids)
+        ),
+    )
+
+    # The candidates are only added once they have all been built, so that they are inserted
+    # together in the database.
+    env.db.add_all(candidates)
+    env.db.flush()
+
+    return candidates
 
-def create_bids_candidate(env: Env, participant: BidsParticipantTsvRow) -> DbCandidate:
+
+def build_bids_candidate(env: Env, participant: BidsParticipantTsvRow, cand_id: int) -> DbCandidate:
     """
-    Create a candidate using the information obtained from a BIDS `participants.tsv` row, or raise
+    Build a candidate using the information obtained from a BIDS `participants.tsv` row, or raise
     an exception if that candidate cannot be created.
     """
 
     log(env, f"Creating LORIS candidate for BIDS subject '{participant.participant_id}'...")
 
     psc_id = participant.participant_id
-    cand_id = generate_new_cand_id(env)
 
     project, site, sex = group_errors_tuple(
         f"Could not get information to create candidate '{participant.participant_id}'.",
@@ -105,7 +168,7 @@ def create_bids_candidate(env: Env, participant: BidsParticipantTsvRow) -> DbCan
 
     now = datetime.now()
 
-    candidate = DbCandidate(
+    return DbCandidate(
         cand_id                 = cand_id,
         psc_id                  = psc_id,
         date_of_birth           = participant.birth_date,
@@ -119,11 +182,6 @@ def create_bids_candidate(env: Env, participant: BidsParticipantTsvRow) -> DbCan
         active                  = True,
     )
 
-    env.db.add(candidate)
-    env.db.flush()
-
-    return candidate
-
 
 def get_bids_participant_row_sex(env: Env, participant: BidsParticipantTsvRow) -> str | None:
     """
@@ -1,10 +1,11 @@
+from collections.abc import Iterator
 from decimal import Decimal
 from pathlib import Path
 
 from loris_utils.iter import map_non_none
 from loris_utils.parse import try_parse_decimal
 
-from loris_bids_utils.tsv import BidsTsvFile, BidsTsvRow
+from loris_bids_utils.tsv import BidsTsvRow, iter_bids_tsv_rows
 
 
 class BidsEventTsvRow(BidsTsvRow):
@@ -58,15 +59,38 @@ class BidsEventTsvRow(BidsTsvRow):
         self.trial_type = data.get('trial_type')
 
 
-class BidsEventsTsvFile(BidsTsvFile[BidsEventTsvRow]):
+class BidsEventsTsvFile:
     """
-    Class representing a BIDS events.tsv file.
+    Class representing a BIDS events.tsv file, whose rows are read lazily since events files can
+    be large.
 
     Documentation: https://bids-specification.readthedocs.io/en/stable/modality-agnostic-files/events.html
     """
 
+    path: Path
+
     def __init__(self, path: Path):
-        super().__init__(BidsEventTsvRow, path)
+        self.path = path
+
+    def __iter__(self) -> Iterator[BidsEventTsvRow]:
+        """
+        Iterate over the rows of this file without reading the whole file in memory.
+        """
+
+        for row in iter_bids_tsv_rows(self.path):
+            yield BidsEventTsvRow(row)
+
+    def validate(self):
+        """
+        Parse all the rows of this file without keeping them in memory, and raise an exception if
+        one of them is malformed.
+        """
+
+        for row_number, row in enumerate(iter_bids_tsv_rows(self.path), 1):
+            try:
+                BidsEventTsvRow(row)
+            except ValueError as error:
+                raise Exception(f"Malformed row {row_number} in events file '{self.path}': {error}")
 
 
 # known opt fields
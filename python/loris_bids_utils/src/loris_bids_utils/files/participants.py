@@ -3,7 +3,6 @@ from pathlib import Path
 
 import dateutil.parser
 from dateutil.parser import ParserError
-from loris_utils.iter import find, replace_or_append
 
 from loris_bids_utils.tsv import BidsTsvFile, BidsTsvRow
 
@@ -72,12 +71,18 @@ class BidsParticipantsTsvFile(BidsTsvFile[BidsParticipantTsvRow]):
     def __init__(self, path: Path):
         super().__init__(BidsParticipantTsvRow, path)
 
+        # Index of the first row of each participant ID.
+        self._row_indexes: dict[str, int] = {}
+        for index, row in enumerate(self.rows):
+            self._row_indexes.setdefault(row.participant_id, index)
+
     def get_row(self, participant_id: str) -> BidsParticipantTsvRow | None:
         """
         Get the row corresponding to the given participant ID.
         """
 
-        return find(self.rows, lambda row: row.participant_id == participant_id)
+        index = self._row_indexes.get(participant_id)
+        return self.rows[index] if index is not None else None
 
     def set_row(self, participant: BidsParticipantTsvRow):
         """
@@ -85,7 +90,11 @@ class BidsParticipantsTsvFile(BidsTsvFile[BidsParticipantTsvRow]):
         participant ID.
         """
 
-        replace_or_append(self.rows, participant, lambda row: row.participant_id == participant.participant_id)
+        index = self._row_indexes.get(participant.participant_id)
+        if index is not None:
+            self._replace_row(index, participant)
+        else:
+            self._row_indexes[participant.participant_id] = self._append_row(participant)
 
     def merge(self, other: 'BidsParticipantsTsvFile'):
         """
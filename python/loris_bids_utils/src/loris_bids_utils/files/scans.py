@@ -2,7 +2,6 @@ from datetime import datetime
 from pathlib import Path
 
 import dateutil.parser
-from loris_utils.iter import find, replace_or_append
 
 from loris_bids_utils.tsv import BidsTsvFile, BidsTsvRow
 
@@ -58,19 +57,29 @@ class BidsScansTsvFile(BidsTsvFile[BidsScanTsvRow]):
     def __init__(self, path: Path):
         super().__init__(BidsScanTsvRow, path)
 
+        # Index of the first row of each file name.
+        self._row_indexes: dict[str | None, int] = {}
+        for index, row in enumerate(self.rows):
+            self._row_indexes.setdefault(row.data['filename'], index)
+
     def get_row(self, file_path: Path) -> BidsScanTsvRow | None:
         """
         Get the row corresponding to the given file path.
         """
 
-        return find(self.rows, lambda row: file_path.name == row.data['filename'])
+        index = self._row_indexes.get(file_path.name)
+        return self.rows[index] if index is not None else None
 
     def set_row(self, scan: BidsScanTsvRow):
         """
         Add a row in the `scans.tsv` file, replacing it if a row already exists for its file name.
         """
 
-        replace_or_append(self.rows, scan, lambda row: row.data['filename'] == scan.data['filename'])
+        index = self._row_indexes.get(scan.data['filename'])
+        if index is not None:
+            self._replace_row(index, scan)
+        else:
+            self._row_indexes[scan.data['filename']] = self._append_row(scan)
 
     def merge(self, other: 'BidsScansTsvFile'):
         """
@@ -0,0 +1,84 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Literal
+
+BidsLayoutIndexMode = Literal['reuse', 'refresh', 'rebuild']
+"""
+Mode of use of a persistent PyBIDS layout index:
+- `reuse`: use the existing index without checking whether the dataset has changed.
+- `refresh`: use the existing index if the dataset has not changed, rebuild it otherwise.
+- `rebuild`: always rebuild the index.
+"""
+
+BIDS_LAYOUT_INDEX_MODES: tuple[BidsLayoutIndexMode, ...] = ('reuse', 'refresh', 'rebuild')
+
+# Name of the file that contains the fingerprint of the dataset of a layout index. This file is
+# written once the index is complete, so an index without fingerprint is always rebuilt.
+FINGERPRINT_FILE_NAME = 'fingerprint.json'
+
+# Directories at the root of the dataset that are not indexed by PyBIDS, and are therefore ignored
+# in the fingerprint. The directories with these names deeper in the dataset are indexed.
+FINGERPRINT_IGNORE = {'.git', 'code', 'log', 'sourcedata'}
+
+
+def get_bids_layout_index_path(index_root_path: Path, dataset_path: Path, derivatives: bool, validate: bool) -> Path:
+    """
+    Get the directory of the persistent layout index of a BIDS dataset. Each dataset and layout
+    configuration has its own index, since PyBIDS stores that configuration in the index.
+    """
+
+    key = f'{dataset_path.resolve()}:{derivatives}:{validate}'
+    return index_root_path / hashlib.sha256(key.encode()).hexdigest()[:16]
+
+
+def compute_bids_dataset_fingerprint(dataset_path: Path) -> str:
+    """
+    Compute a fingerprint of the structure of a BIDS dataset, based on the modification times of
+    its directories and the sizes and modification times of its files. Reading this information is
+    much faster than indexing the dataset with PyBIDS, which parses every file name and sidecar.
+    """
+
+    fingerprint = hashlib.sha256()
+    for dir_path, dir_names, file_names in os.walk(dataset_path):
+        is_root = dir_path == str(dataset_path)
+        dir_names[:] = sorted(dir_name for dir_name in dir_names if not (is_root and dir_name in FINGERPRINT_IGNORE))
+        dir_stat = os.stat(dir_path)
+        fingerprint.update(f'{os.path.relpath(dir_path, dataset_path)}/:{dir_stat.st_mtime_ns}\n'.encode())
+        for file_name in sorted(file_names):
+            file_stat = os.stat(os.path.join(dir_path, file_name))
+            fingerprint.update(f'{file_name}:{file_stat.st_size}:{file_stat.st_mtime_ns}\n'.encode())
+
+    return fingerprint.hexdigest()
+
+
+def read_bids_layout_index_fingerprint(index_path: Path) -> str | None:
+    """
+    Read the dataset fingerprint of a persistent layout index, or return `None` if the index does
+    not exist or is incomplete.
+    """
+
+    fingerprint_path = index_path / FINGERPRINT_FILE_NAME
+    if not fingerprint_path.is_file():
+        return None
+
+    with open(fingerprint_path) as fingerprint_file:
+        return json.load(fingerprint_file).get('fingerprint')
+
+
+def write_bids_layout_index_fingerprint(index_path: Path, fingerprint: str):
+    """
+    Mark a persistent layout index as complete by writing the fingerprint of its dataset.
+    """
+
+    with open(index_path / FINGERPRINT_FILE_NAME, 'w') as fingerprint_file:
+        json.dump({'fingerprint': fingerprint}, fingerprint_file)
+
+
+def remove_bids_layout_index_fingerprint(index_path: Path):
+    """
+    Mark a persistent layout index as incomplete before it is rebuilt.
+    """
+
+    (index_path / FINGERPRINT_FILE_NAME).unlink(missing_ok=True)
@@ -1,60 +1,41 @@
-
 from dataclasses import dataclass
 from functools import cached_property
-from pathlib import Path
 
-from bids.layout import BIDSFile
 from loris_utils.path import remove_path_extension
 
 from loris_bids_utils.info import BidsAcquisitionInfo
 from loris_bids_utils.mri.acquisition import MriAcquisition
 from loris_bids_utils.mri.sidecar import BidsMriSidecarJsonFile
+from loris_bids_utils.native_layout import BIDS_MRI_EXTENSIONS
 from loris_bids_utils.reader import BidsDataTypeReader
-from loris_bids_utils.utils import find_pybids_file_path, get_pybids_file_path
 
 
 @dataclass
 class BidsMriDataTypeReader(BidsDataTypeReader):
     @cached_property
     def acquisitions(self) -> list[tuple[MriAcquisition, BidsAcquisitionInfo]]:
-        pybids_layout = self.session.subject.dataset.layout
-        pybids_files: list[BIDSFile] = pybids_layout.get(  # type: ignore
-            subject     = self.session.subject.label,
-            session     = self.session.label,
-            datatype    = self.name,
-            extension   = ['.nii', '.nii.gz'],
+        native_files = self.session.subject.dataset.native_layout.get_files(
+            self.session.subject.label,
+            self.session.label,
+            data_type  = self.name,
+            extensions = BIDS_MRI_EXTENSIONS,
         )
 
         acquisitions: list[tuple[MriAcquisition, BidsAcquisitionInfo]] = []
-        for pybids_file in pybids_files:
-            nifti_path = get_pybids_file_path(pybids_file)
-
-            # Get all associated files
-            associations: list[BIDSFile] = pybids_file.get_associations()  # type: ignore
-
-            # Find associated files using predicates
-            sidecar_path = find_pybids_file_path(associations, lambda file: file.entities.get('extension') == '.json')
-
-            pybids_bval_path = pybids_layout.get_nearest(pybids_file, extension='.bval')  # type: ignore
-            bval_path = Path(pybids_bval_path) if pybids_bval_path is not None else None  # type: ignore
-
-            pybids_bvec_path = pybids_layout.get_nearest(pybids_file, extension='.bvec')  # type: ignore
-            bvec_path = Path(pybids_bvec_path) if pybids_bvec_path is not None else None  # type: ignore
-
-            events_path = find_pybids_file_path(
-                associations,
-                lambda file: file.entities.get('suffix') == 'events' and file.entities.get('extension') == '.tsv',
-            )
-
-            physio_path = find_pybids_file_path(
-                associations,
-                lambda file: file.entities.get('suffix') in ['physio', 'stim']
-                    and file.entities.get('extension') in ['.tsv.gz', '.tsv'],
-            )
-
-            sidecar_file = BidsMriSidecarJsonFile(sidecar_path) if sidecar_path is not None else None
+        for native_file in native_files:
+            nifti_path = native_file.path
+            acquisition_path = remove_path_extension(nifti_path)
+
+            # The associated files are resolved once for all the acquisitions of the data type.
+            associated_files = self.associated_files[acquisition_path]
+            sidecar = associated_files.sidecar
+            bval    = associated_files.bval
+            bvec    = associated_files.bvec
+            events  = associated_files.events
+            physio  = associated_files.physio
+
+            sidecar_file = BidsMriSidecarJsonFile(sidecar.path) if sidecar is not None else None
             scan_row = self.session.scans_file.get_row(nifti_path) if self.session.scans_file is not None else None
-            acquisition_name = remove_path_extension(nifti_path).name
 
             bids_info = BidsAcquisitionInfo(
                 subject         = self.session.subject.label,
@@ -63,17 +44,17 @@ class BidsMriDataTypeReader(BidsDataTypeReader):
                 scans_file      = self.session.scans_file,
                 data_type       = self.name,
                 scan_row        = scan_row,
-                name            = acquisition_name,
-                suffix          = pybids_file.entities.get('suffix'),
+                name            = acquisition_path.name,
+                suffix          = native_file.suffix,
             )
 
             acquisition = MriAcquisition(
                 nifti_path   = nifti_path,
                 sidecar_file = sidecar_file,
-                bval_path    = bval_path,
-                bvec_path    = bvec_path,
-                physio_path  = physio_path,
-                events_path  = events_path,
+                bval_path    = bval.path if bval is not None else None,
+                bvec_path    = bvec.path if bvec is not None else None,
+                physio_path  = physio.path if physio is not None else None,
+                events_path  = events.path if events is not None else None,
             )
 
             acquisitions.append((acquisition, bids_info))
@@ -0,0 +1,461 @@
+import os
+import re
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from loris_utils.path import remove_path_extension
+
+# Regex of a BIDS file name, which is a sequence of `key-value` entities, a suffix and an
+# extension, such as `sub-01_ses-01_T1w.nii.gz`.
+BIDS_FILE_NAME_REGEX = re.compile(r'^((?:[a-zA-Z0-9]+-[a-zA-Z0-9]+_)*)([a-zA-Z0-9]+)(\.[^/]+)$')
+
+# Regex of a single `key-value` entity of a BIDS file name.
+BIDS_ENTITY_REGEX = re.compile(r'([a-zA-Z0-9]+)-([a-zA-Z0-9]+)_')
+
+# Data type directories recognized in the BIDS datasets, matching the PyBIDS configuration.
+BIDS_DATA_TYPES = {
+    'anat', 'beh', 'dwi', 'eeg', 'fmap', 'func', 'ieeg', 'meg', 'micr', 'motion', 'mrs', 'nirs', 'perf', 'pet',
+}
+
+# Directories of the dataset root that are not indexed, matching the PyBIDS ignore list of the
+# dataset reader. The derivatives directory is indexed separately if derivatives are requested.
+BIDS_ROOT_IGNORE = {'code', 'derivatives', 'log', 'sourcedata'}
+
+# Entities whose values are integers, such that `run-01` and `run-1` are the same run.
+BIDS_INTEGER_ENTITIES = {'run'}
+
+# Extensions of the MRI and EEG acquisition files, whose associated files are indexed.
+BIDS_MRI_EXTENSIONS = {'.nii', '.nii.gz'}
+BIDS_EEG_EXTENSIONS = {'.set', '.edf', '.vhdr', '.vmrk', '.eeg', '.bdf'}
+
+
+@dataclass(frozen=True)
+class BidsNativeFile:
+    """
+    A file of a BIDS dataset indexed by the native layout.
+    """
+
+    path: Path
+    """
+    The path of this file.
+    """
+
+    root_path: Path
+    """
+    The root path of the dataset of this file, which is the path of the derivative dataset for
+    derivative files.
+    """
+
+    entities: dict[str, str]
+    """
+    The entities of this file, indexed by their BIDS key (`sub`, `ses`, `run`...), including the
+    `datatype` of its directory.
+    """
+
+    suffix: str
+    """
+    The suffix of this file, such as `T1w` or `bold`.
+    """
+
+    extension: str
+    """
+    The extension of this file, such as `.nii.gz`.
+    """
+
+    @property
+    def subject(self) -> str | None:
+        return self.entities.get('sub')
+
+    @property
+    def session(self) -> str | None:
+        return self.entities.get('ses')
+
+
+@dataclass
+class BidsAssociatedFiles:
+    """
+    The files associated with an acquisition, resolved following the BIDS inheritance principle.
+    """
+
+    sidecar: BidsNativeFile | None = None
+    bval: BidsNativeFile | None = None
+    bvec: BidsNativeFile | None = None
+    events: BidsNativeFile | None = None
+    physio: BidsNativeFile | None = None
+    channels: BidsNativeFile | None = None
+    electrodes: list[BidsNativeFile] = field(default_factory=list[BidsNativeFile])
+    fdt: BidsNativeFile | None = None
+
+
+class BidsNativeLayout:
+    """
+    Lightweight index of a BIDS dataset, built in a single pass over the dataset directories. This
+    class is a faster alternative to the PyBIDS layout for the queries of the dataset readers, as
+    it does not read any sidecar nor store its index in a database.
+
+    The sidecar and nearest file lookups follow the PyBIDS inheritance rules, so that both layouts
+    find the same files in a valid BIDS dataset.
+    """
+
+    def __init__(self, path: Path, derivatives: bool = True, file_paths: Iterable[Path] | None = None):
+        """
+        :param file_paths: paths of the files of the dataset if they are already known, such as
+            from a PyBIDS layout, in which case the dataset directories are not scanned.
+        """
+
+        self.path = path
+        self.files: list[BidsNativeFile] = []
+
+        if file_paths is not None:
+            for file_path in file_paths:
+                file = parse_bids_file(file_path, get_bids_file_root_path(file_path, path))
+                if file is not None:
+                    self.files.append(file)
+        else:
+            self._scan_dataset(path, BIDS_ROOT_IGNORE)
+            if derivatives and (path / 'derivatives').is_dir():
+                for derivative_path in sorted((path / 'derivatives').iterdir()):
+                    if (derivative_path / 'dataset_description.json').is_file():
+                        self._scan_dataset(derivative_path, BIDS_ROOT_IGNORE)
+
+        self.files.sort(key=lambda file: natural_sort_key(str(file.path)))
+
+        # Index of the files by directory, suffix and extension, used to look up the sidecars and
+        # nearest files while walking up the directories.
+        self._dir_files: dict[tuple[Path, str, str], list[BidsNativeFile]] = defaultdict(list)
+        # Index of the files by subject and session.
+        self._session_files: dict[tuple[str | None, str | None], list[BidsNativeFile]] = defaultdict(list)
+        for file in self.files:
+            self._dir_files[file.path.parent, file.suffix, file.extension].append(file)
+            self._session_files[file.subject, file.session].append(file)
+
+        self.subject_labels = natural_sort(file.subject for file in self.files if file.subject is not None)
+        self.session_labels = natural_sort(file.session for file in self.files if file.session is not None)
+        self.data_type_names = natural_sort(
+            file.entities['datatype'] for file in self.files if 'datatype' in file.entities
+        )
+
+    def _scan_dataset(self, root_path: Path, ignore: set[str]):
+        """
+        Index the files of a dataset directory tree using `os.scandir`.
+        """
+
+        dir_paths = [root_path]
+        while dir_paths:
+            dir_path = dir_paths.pop()
+            with os.scandir(dir_path) as entries:
+                for entry in entries:
+                    if entry.name.startswith('.'):
+                        continue
+
+                    if entry.is_dir():
+                        if dir_path != root_path or entry.name not in ignore:
+                            dir_paths.append(Path(entry.path))
+                        continue
+
+                    file = parse_bids_file(Path(entry.path), root_path)
+                    if file is not None:
+                        self.files.append(file)
+
+    def get_session_labels(self, subject: str) -> list[str]:
+        """
+        Get the session labels of a subject.
+        """
+
+        return natural_sort(
+            session for subject_, session in self._session_files if subject_ == subject and session is not None
+        )
+
+    def get_data_type_names(self, subject: str, session: str | None, data_types: Iterable[str]) -> list[str]:
+        """
+        Get the names of the data types of a session among the given data types.
+        """
+
+        data_types = set(data_types)
+        return natural_sort(
+            file.entities['datatype'] for file in self._session_files.get((subject, session), [])
+            if file.entities.get('datatype') in data_types
+        )
+
+    def get_files(
+        self,
+        subject: str,
+        session: str | None,
+        data_type: str | None = None,
+        suffix: str | None = None,
+        extensions: Iterable[str] | None = None,
+    ) -> list[BidsNativeFile]:
+        """
+        Get the files of a session, optionally filtered by data type, suffix and extensions.
+        """
+
+        extensions = set(extensions) if extensions is not None else None
+        return [
+            file for file in self._session_files.get((subject, session), [])
+            if (data_type is None or file.entities.get('datatype') == data_type)
+                and (suffix is None or file.suffix == suffix)
+                and (extensions is None or file.extension in extensions)
+        ]
+
+    def get_root_file(self, suffix: str, extension: str) -> BidsNativeFile | None:
+        """
+        Get the first file of the dataset root directory with a given suffix and extension, and
+        without subject or session.
+        """
+
+        for file in self._dir_files.get((self.path, suffix, extension), []):
+            if file.subject is None and file.session is None:
+                return file
+
+        return None
+
+    def get_sidecar(self, file: BidsNativeFile) -> BidsNativeFile | None:
+        """
+        Get the sidecar JSON file of a file, which is the nearest JSON file with the same suffix
+        whose entities are all entities of that file, following the BIDS inheritance principle.
+        """
+
+        for dir_path in iter_parent_dirs(file):
+            for json_file in self._dir_files.get((dir_path, file.suffix, '.json'), []):
+                if is_entities_subset(json_file.entities, file.entities):
+                    return json_file
+
+        return None
+
+    def get_nearest(
+        self,
+        file: BidsNativeFile,
+        extension: str,
+        suffix: str | None = None,
+        strict: bool = True,
+        subject: str | None = None,
+    ) -> BidsNativeFile | None:
+        """
+        Get the nearest file with a given suffix (by default, the suffix of the file) and extension,
+        following the PyBIDS `get_nearest` rules. Only the nearest directory that contains candidate
+        files is searched, and the candidates are ordered by number of entities matching the file.
+        In strict mode, the entities shared by both files must all have the same values.
+        """
+
+        for matches in self._iter_nearest_matches(file, extension, suffix, strict, subject):
+            return matches[0] if matches != [] else None
+
+        return None
+
+    def get_all_nearest(
+        self,
+        file: BidsNativeFile,
+        extension: str,
+        suffix: str | None = None,
+        strict: bool = True,
+        subject: str | None = None,
+    ) -> list[BidsNativeFile]:
+        """
+        Get all the files with a given suffix and extension in the directories of a file, from the
+        nearest to the farthest, following the PyBIDS `get_nearest` rules.
+        """
+
+        return [
+            match
+            for matches in self._iter_nearest_matches(file, extension, suffix, strict, subject)
+            for match in matches
+        ]
+
+    def _iter_nearest_matches(
+        self,
+        file: BidsNativeFile,
+        extension: str,
+        suffix: str | None,
+        strict: bool,
+        subject: str | None,
+    ) -> Iterator[list[BidsNativeFile]]:
+        """
+        Iterate over the directories of a file that contain candidate files, and yield the matching
+        candidates of each directory ordered by number of entities matching the file.
+        """
+
+        suffix = suffix if suffix is not None else file.suffix
+        for dir_path in iter_parent_dirs(file):
+            candidates = [
+                candidate for candidate in self._dir_files.get((dir_path, suffix, extension), [])
+                if subject is None or candidate.subject == subject
+            ]
+
+            if candidates == []:
+                continue
+
+            if strict:
+                candidates = [
+                    candidate for candidate in candidates if is_entities_match(candidate.entities, file.entities)
+                ]
+
+            candidates.sort(
+                key=lambda candidate: count_entities_matches(candidate.entities, file.entities),
+                reverse=True,
+            )
+            yield candidates
+
+    def get_informing_file(
+        self,
+        file: BidsNativeFile,
+        suffixes: Iterable[str],
+        extensions: Iterable[str],
+    ) -> BidsNativeFile | None:
+        """
+        Get the first file with one of the given suffixes and extensions that informs a BOLD image,
+        such as its events or physiological recording files. Like in PyBIDS, such a file must have
+        a sidecar and all its entities must be entities of the image.
+        """
+
+        if file.suffix != 'bold':
+            return None
+
+        suffixes = set(suffixes)
+        extensions = set(extensions)
+        for candidate in self._session_files.get((file.subject, file.session), []):
+            if candidate.suffix in suffixes \
+                    and candidate.extension in extensions \
+                    and is_entities_subset(candidate.entities, file.entities) \
+                    and self.get_sidecar(candidate) is not None:
+                return candidate
+
+        return None
+
+    def get_associated_files(
+        self,
+        subject: str,
+        session: str | None,
+        data_type: str,
+    ) -> dict[Path, BidsAssociatedFiles]:
+        """
+        Resolve the associated files of all the MRI and EEG acquisitions of a data type directory
+        at once, and return them indexed by acquisition path without extension. The MRI files are
+        associated following the PyBIDS associations, and the EEG files following the nearest
+        file lookups of the EEG importer.
+        """
+
+        associated_files: dict[Path, BidsAssociatedFiles] = {}
+        for file in self.get_files(subject, session, data_type):
+            acquisition_path = remove_path_extension(file.path)
+            if acquisition_path in associated_files:
+                continue
+
+            if file.extension in BIDS_MRI_EXTENSIONS:
+                associated_files[acquisition_path] = BidsAssociatedFiles(
+                    sidecar = self.get_sidecar(file),
+                    bval    = self.get_nearest(file, '.bval'),
+                    bvec    = self.get_nearest(file, '.bvec'),
+                    events  = self.get_informing_file(file, ['events'], ['.tsv']),
+                    physio  = self.get_informing_file(file, ['physio', 'stim'], ['.tsv.gz', '.tsv']),
+                )
+            elif file.extension in BIDS_EEG_EXTENSIONS and file.suffix == data_type:
+                associated_files[acquisition_path] = BidsAssociatedFiles(
+                    sidecar    = self.get_nearest(file, '.json', strict=False),
+                    events     = self.get_nearest(file, '.tsv', 'events', strict=False),
+                    channels   = self.get_nearest(file, '.tsv', 'channels', strict=False),
+                    electrodes = self.get_all_nearest(file, '.tsv', 'electrodes', strict=False),
+                    fdt        = self.get_nearest(file, '.fdt', strict=False),
+                )
+
+        return associated_files
+
+
+def get_bids_file_root_path(file_path: Path, dataset_path: Path) -> Path:
+    """
+    Get the root path of the dataset of a file, which is the path of its derivative dataset if it
+    is a derivative file.
+    """
+
+    derivatives_path = dataset_path / 'derivatives'
+    if file_path.is_relative_to(derivatives_path) and len(file_path.relative_to(derivatives_path).parts) > 1:
+        return derivatives_path / file_path.relative_to(derivatives_path).parts[0]
+
+    return dataset_path
+
+
+def parse_bids_file(path: Path, root_path: Path) -> BidsNativeFile | None:
+    """
+    Parse the entities, suffix and extension of a BIDS file, or return `None` if the file name is
+    not a BIDS file name.
+    """
+
+    match = BIDS_FILE_NAME_REGEX.match(path.name)
+    if match is None:
+        return None
+
+    entities: dict[str, str] = {}
+
+    # The subject, session and data type are also given by the directories of the file.
+    for dir_name in path.parent.relative_to(root_path).parts:
+        if dir_name.startswith('sub-'):
+            entities['sub'] = dir_name[4:]
+        elif dir_name.startswith('ses-'):
+            entities['ses'] = dir_name[4:]
+        elif dir_name in BIDS_DATA_TYPES:
+            entities['datatype'] = dir_name
+
+    for key, value in BIDS_ENTITY_REGEX.findall(match.group(1)):
+        entities[key] = str(int(value)) if key in BIDS_INTEGER_ENTITIES and value.isdigit() else value
+
+    return BidsNativeFile(
+        path      = path,
+        root_path = root_path,
+        entities  = entities,
+        suffix    = match.group(2),
+        extension = match.group(3),
+    )
+
+
+def iter_parent_dirs(file: BidsNativeFile) -> Iterable[Path]:
+    """
+    Iterate over the directories of a file, from its parent directory up to the root directory of
+    its dataset.
+    """
+
+    dir_path = file.path.parent
+    yield dir_path
+    while dir_path != file.root_path and dir_path != dir_path.parent:
+        dir_path = dir_path.parent
+        yield dir_path
+
+
+def is_entities_subset(entities: dict[str, str], other_entities: dict[str, str]) -> bool:
+    """
+    Check whether all the entities of a file are entities of another file with the same values.
+    """
+
+    return all(other_entities.get(key) == value for key, value in entities.items())
+
+
+def is_entities_match(entities: dict[str, str], other_entities: dict[str, str]) -> bool:
+    """
+    Check whether the entities shared by two files have the same values.
+    """
+
+    return all(other_entities[key] == value for key, value in entities.items() if key in other_entities)
+
+
+def count_entities_matches(entities: dict[str, str], other_entities: dict[str, str]) -> int:
+    """
+    Count the entities shared by two files that have the same values.
+    """
+
+    return sum(other_entities.get(key) == value for key, value in entities.items())
+
+
+def natural_sort_key(string: str) -> list[int | str]:
+    """
+    Get the key of a string for a natural sort, in which `run-2` comes before `run-10`.
+    """
+
+    return [int(part) if part.isdigit() else part.lower() for part in re.split(r'(\d+)', string)]
+
+
+def natural_sort(strings: Iterable[str]) -> list[str]:
+    """
+    Sort unique strings in natural order.
+    """
+
+    return sorted(set(strings), key=natural_sort_key)
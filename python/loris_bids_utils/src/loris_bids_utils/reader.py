@@ -12,6 +12,15 @@ from loris_bids_utils.files.participants import BidsParticipantsTsvFile, BidsPar
 from loris_bids_utils.files.scans import BidsScansTsvFile
 from loris_bids_utils.info import BidsDataTypeInfo, BidsSessionInfo, BidsSubjectInfo
 from loris_bids_utils.json import BidsJsonFile
+from loris_bids_utils.layout_index import (
+    BidsLayoutIndexMode,
+    compute_bids_dataset_fingerprint,
+    get_bids_layout_index_path,
+    read_bids_layout_index_fingerprint,
+    remove_bids_layout_index_fingerprint,
+    write_bids_layout_index_fingerprint,
+)
+from loris_bids_utils.native_layout import BidsAssociatedFiles, BidsNativeLayout
 from loris_bids_utils.utils import get_pybids_file_path
 
 # Circular imports
@@ -25,26 +34,113 @@ PYBIDS_FORCE_INDEX = [re.compile(r"_annotations\.(tsv|json)$")]
 @dataclass
 class BidsDatasetReader:
     """
-    A hierarchical BIDS dataset reader. This class is a wrapper around PyBIDS that allows to easily
-    read a BIDS dataset one directory level at the time.
+    A hierarchical BIDS dataset reader. This class is a wrapper around PyBIDS, or around the native
+    BIDS walker, that allows to easily read a BIDS dataset one directory level at the time.
     """
 
-    layout: BIDSLayout
+    path: Path
     """
-    The PyBIDS layout object of this BIDS dataset.
+    The path of this BIDS dataset.
     """
 
-    path: Path
+    native: bool
     """
-    The path of this BIDS dataset.
+    Whether this BIDS dataset is read using the native walker instead of PyBIDS.
     """
 
-    def __init__(self, path: Path, derivatives: bool = True, validate: bool = True):
+    def __init__(
+        self,
+        path: Path,
+        derivatives: bool = True,
+        validate: bool = True,
+        index_root_path: Path | None = None,
+        index_mode: BidsLayoutIndexMode = 'refresh',
+        native: bool = False,
+        read_only_index: bool = False,
+    ):
+        """
+        :param index_root_path: directory in which the PyBIDS layout index of the dataset is
+            persisted between runs, or `None` to index the dataset in memory.
+        :param index_mode: how to use the persisted layout index if it exists.
+        :param native: whether to read the dataset using the native walker instead of PyBIDS, in
+            which case the PyBIDS layout is only built if it is used.
+        :param read_only_index: whether the persisted layout index must not be written, in which
+            case an existing index is reused as is and the dataset is otherwise indexed in memory.
+        """
+
         self.path = path
-        self.layout = BIDSLayout(
-            path,
+        self._derivatives = derivatives
+        self._validate = validate
+        self._index_root_path = index_root_path
+        self._index_mode: BidsLayoutIndexMode = index_mode
+        self._read_only_index = read_only_index
+
+        # Index the dataset right away, as the dataset readers depend on it.
+        self.native = native
+        if native:
+            self.native_layout
+        else:
+            self.layout
+
+    @cached_property
+    def layout(self) -> BIDSLayout:
+        """
+        The PyBIDS layout object of this BIDS dataset.
+        """
+
+        derivatives = self._derivatives
+        validate = self._validate
+
+        if self._index_root_path is None:
+            return self._create_layout(derivatives, validate, None, True)
+
+        index_path = get_bids_layout_index_path(self._index_root_path, self.path, derivatives, validate)
+        index_fingerprint = read_bids_layout_index_fingerprint(index_path)
+
+        # The fingerprint is computed before indexing the dataset, so that a modification of the
+        # dataset during the indexing is detected on the next run.
+        if (self._index_mode == 'reuse' or self._read_only_index) and index_fingerprint is not None:
+            return self._create_layout(derivatives, validate, index_path, False)
+
+        if self._read_only_index:
+            return self._create_layout(derivatives, validate, None, True)
+
+        dataset_fingerprint = compute_bids_dataset_fingerprint(self.path)
+        if self._index_mode == 'refresh' and index_fingerprint == dataset_fingerprint:
+            return self._create_layout(derivatives, validate, index_path, False)
+
+        remove_bids_layout_index_fingerprint(index_path)
+        layout = self._create_layout(derivatives, validate, index_path, True)
+        write_bids_layout_index_fingerprint(index_path, dataset_fingerprint)
+        return layout
+
+    @cached_property
+    def native_layout(self) -> BidsNativeLayout:
+        """
+        The native layout of this BIDS dataset, which indexes its files in memory to resolve their
+        associated files. If the dataset is read using PyBIDS, this layout is built from the files
+        of the PyBIDS layout.
+        """
+
+        if self.native:
+            return BidsNativeLayout(self.path, self._derivatives)
+
+        file_paths: list[str] = self.layout.get(return_type='filename')  # type: ignore
+        return BidsNativeLayout(self.path, self._derivatives, map(Path, file_paths))
+
+    def _create_layout(
+        self,
+        derivatives: bool,
+        validate: bool,
+        database_path: Path | None,
+        reset_database: bool,
+    ) -> BIDSLayout:
+        return BIDSLayout(
+            self.path,
             validate=validate,
             derivatives=derivatives,
+            database_path=database_path,
+            reset_database=reset_database,
             indexer=BIDSLayoutIndexer(
                 ignore=PYBIDS_IGNORE,
                 force_index=PYBIDS_FORCE_INDEX,
@@ -81,6 +177,10 @@ class BidsDatasetReader:
         The root event dictionary file of this BIDS dataset, if it exists.
         """
 
+        if self.native:
+            native_event_dict_file = self.native_layout.get_root_file('events', '.json')
+            return BidsJsonFile(native_event_dict_file.path) if native_event_dict_file is not None else None
+
         pybids_event_dict_file = self.layout.get_nearest(  # type: ignore
             self.path,
             return_type='tuple',
@@ -104,6 +204,9 @@ class BidsDatasetReader:
         The subject labels present in this BIDS dataset (without the `sub-` prefix).
         """
 
+        if self.native:
+            return self.native_layout.subject_labels
+
         return self.layout.get_subjects()  # type: ignore
 
     @cached_property
@@ -112,6 +215,9 @@ class BidsDatasetReader:
         The session labels present in this BIDS dataset (without the `ses-` prefix).
         """
 
+        if self.native:
+            return self.native_layout.session_labels
+
         return self.layout.get_sessions()  # type: ignore
 
     @cached_property
@@ -120,6 +226,9 @@ class BidsDatasetReader:
         The names of the data types present in this BIDS dataset.
         """
 
+        if self.native:
+            return self.native_layout.data_type_names
+
         return self.layout.get_datatypes()  # type: ignore
 
     @cached_property
@@ -132,7 +241,7 @@ class BidsDatasetReader:
             BidsSubjectReader(
                 dataset=self,
                 label=subject  # type: ignore
-            ) for subject in self.layout.get_subjects()  # type: ignore
+            ) for subject in self.subject_labels
         ]
 
     @cached_property
@@ -177,6 +286,14 @@ class BidsSubjectReader:
     The subject label of this directory (without the `sub-` prefix).
     """
 
+    @property
+    def path(self) -> Path:
+        """
+        The path of this subject directory.
+        """
+
+        return self.dataset.path / f'sub-{self.label}'
+
     @cached_property
     def participant_row(self) -> BidsParticipantTsvRow | None:
         """
@@ -194,7 +311,11 @@ class BidsSubjectReader:
         Get the session directory readers of this subject.
         """
 
-        session_labels = self.dataset.layout.get_sessions(subject=self.label)  # type: ignore
+        if self.dataset.native:
+            session_labels = self.dataset.native_layout.get_session_labels(self.label)
+        else:
+            session_labels = self.dataset.layout.get_sessions(subject=self.label)  # type: ignore
+
         if session_labels == []:
             return [BidsSessionReader(subject=self, label=None)]
 
@@ -247,8 +368,29 @@ class BidsSessionReader:
     sessionless BIDS dataset.
     """
 
+    @property
+    def path(self) -> Path:
+        """
+        The path of this session directory.
+        """
+
+        if self.label is None:
+            return self.subject.path
+
+        return self.subject.path / f'ses-{self.label}'
+
     @cached_property
     def scans_file(self) -> BidsScansTsvFile | None:
+        if self.subject.dataset.native:
+            native_scans_files = self.subject.dataset.native_layout.get_files(
+                self.subject.label,
+                self.label,
+                suffix='scans',
+                extensions=['.tsv'],
+            )
+
+            return BidsScansTsvFile(native_scans_files[0].path) if native_scans_files != [] else None
+
         scans_paths: list[str] = self.subject.dataset.layout.get(  # type: ignore
             subject=self.subject.label,
             session=self.label,
@@ -273,11 +415,7 @@ class BidsSessionReader:
             BidsMriDataTypeReader(
                 session=self,
                 name=data_type,  # type: ignore
-            ) for data_type in self.subject.dataset.layout.get_datatypes(  # type: ignore
-                subject=self.subject.label,
-                session=self.label,
-                datatype=['anat', 'dwi', 'fmap', 'func'],
-            )
+            ) for data_type in self._get_data_type_names(['anat', 'dwi', 'fmap', 'func'])
         ]
 
     @cached_property
@@ -290,13 +428,19 @@ class BidsSessionReader:
             BidsDataTypeReader(
                 session=self,
                 name=data_type,  # type: ignore
-            ) for data_type in self.subject.dataset.layout.get_datatypes(  # type: ignore
-                subject=self.subject.label,
-                session=self.label,
-                datatype=['eeg', 'ieeg'],
-            )
+            ) for data_type in self._get_data_type_names(['eeg', 'ieeg'])
         ]
 
+    def _get_data_type_names(self, data_types: list[str]) -> list[str]:
+        if self.subject.dataset.native:
+            return self.subject.dataset.native_layout.get_data_type_names(self.subject.label, self.label, data_types)
+
+        return self.subject.dataset.layout.get_datatypes(  # type: ignore
+            subject=self.subject.label,
+            session=self.label,
+            datatype=data_types,
+        )
+
     @cached_property
     def data_types(self) -> Sequence['BidsDataTypeReader']:
         """
@@ -335,6 +479,27 @@ class BidsDataTypeReader:
     The data type name of this directory.
     """
 
+    @property
+    def path(self) -> Path:
+        """
+        The path of this data type directory.
+        """
+
+        return self.session.path / self.name
+
+    @cached_property
+    def associated_files(self) -> dict[Path, BidsAssociatedFiles]:
+        """
+        The associated files of the acquisitions of this data type directory, indexed by
+        acquisition path without extension.
+        """
+
+        return self.session.subject.dataset.native_layout.get_associated_files(
+            self.session.subject.label,
+            self.session.label,
+            self.name,
+        )
+
     @cached_property
     def info(self) -> BidsDataTypeInfo:
         """
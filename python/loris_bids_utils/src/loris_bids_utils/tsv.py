@@ -1,6 +1,8 @@
 import csv
+import gzip
+from collections.abc import Iterable, Iterator, Sequence
 from pathlib import Path
-from typing import Generic, TypeVar
+from typing import Generic, TextIO, TypeVar, cast
 
 from loris_utils.parse import nullify_empty_string
 
@@ -28,46 +30,131 @@ class BidsTsvFile(Generic[T]):
 
     path: Path
     rows: list[T]
+    """
+    The rows of this file, which should only be modified using the methods of this class to keep
+    the field names up to date.
+    """
 
     def __init__(self, model: type[T], path: Path):
         self.path = path
         self.rows = []
+        self._field_names: list[str] | None = None
 
-        # The 'utf-8-sig' encoding is used to support some datasets where metadata files may contain
-        # a byte-order mark (BOM).
-        with open(self.path, encoding='utf-8-sig') as file:
-            reader = csv.DictReader(file, delimiter='\t')
-            for row in reader:
-                # Skip empty lines (such as trailing newlines).
-                if row == {}:
-                    continue
-
-                row = {key: nullify_empty_string(value) for key, value in row.items()}
-                self.rows.append(model(row))
+        for row in iter_bids_tsv_rows(self.path):
+            self.rows.append(model(row))
 
     def get_field_names(self) -> list[str]:
         """
         Get the names of the fields of this file.
         """
 
-        fields: list[str] = []
-        for row in self.rows:
-            for field in row.data.keys():
-                if field not in fields:
-                    fields.append(field)
+        # The field names are cached and kept up to date when a row is added.
+        if self._field_names is None:
+            self._field_names = list(dict.fromkeys(field for row in self.rows for field in row.data.keys()))
 
-        return fields
+        return self._field_names.copy()
+
+    def _append_row(self, row: T) -> int:
+        """
+        Append a row to this file and return its index.
+        """
+
+        self.rows.append(row)
+        if self._field_names is not None:
+            self._field_names.extend(field for field in row.data.keys() if field not in self._field_names)
+
+        return len(self.rows) - 1
+
+    def _replace_row(self, index: int, row: T):
+        """
+        Replace the row at a given index of this file.
+        """
+
+        old_row = self.rows[index]
+        self.rows[index] = row
+        if self._field_names is None:
+            return
+
+        # The replaced row may be the only one with some fields, in which case the field names are
+        # computed again on the next access.
+        if not old_row.data.keys() <= row.data.keys():
+            self._field_names = None
+        else:
+            self._field_names.extend(field for field in row.data.keys() if field not in self._field_names)
 
     def write(self, path: Path):
         """
         Write the TSV file to a file at the given path, creating it if necessary.
         """
 
-        fields = self.get_field_names()
+        write_bids_tsv_rows(path, self.get_field_names(), (row.data for row in self.rows))
+
+
+def open_bids_tsv_file(path: Path, mode: str = 'r') -> TextIO:
+    """
+    Open a BIDS TSV file in text mode, compressing or decompressing it transparently if its name
+    ends with '.gz' (such as the physio.tsv.gz and stim.tsv.gz files).
+    """
+
+    # The 'utf-8-sig' encoding is used to support some datasets where metadata files may contain
+    # a byte-order mark (BOM).
+    encoding = 'utf-8-sig' if mode == 'r' else 'utf-8'
+
+    # The mode is not a literal, so the type checkers cannot infer that the file is opened in text
+    # mode.
+    if path.name.endswith('.gz'):
+        return cast(TextIO, gzip.open(path, mode + 't', encoding=encoding, newline=''))
+
+    return cast(TextIO, open(path, mode, encoding=encoding, newline=''))
+
+
+def iter_bids_tsv_rows(
+    path: Path,
+    columns: Sequence[str] | None = None,
+    field_names: Sequence[str] | None = None,
+) -> Iterator[dict[str, str | None]]:
+    """
+    Iterate over the rows of a BIDS TSV file without reading the whole file in memory.
+
+    :param columns:     The columns to include in the rows, or `None` to include all the columns.
+                        The requested columns that are not in the file are not included.
+    :param field_names: The field names of the file if it does not have a header row, which is the
+                        case of the physio.tsv.gz and stim.tsv.gz files, whose columns are
+                        described in their JSON sidecar.
+    """
+
+    with open_bids_tsv_file(path) as file:
+        reader = csv.reader(file, delimiter='\t')
+        if field_names is None:
+            field_names = next(reader, None)
+            if field_names is None:
+                return
+
+        fields = [
+            (field_index, field_name) for field_index, field_name in enumerate(field_names)
+            if columns is None or field_name in columns
+        ]
+
+        for values in reader:
+            # Skip empty lines (such as trailing newlines).
+            if values == []:
+                continue
+
+            yield {
+                field_name: nullify_empty_string(values[field_index]) if field_index < len(values) else None
+                for field_index, field_name in fields
+            }
+
+
+def write_bids_tsv_rows(path: Path, field_names: Sequence[str], rows: Iterable[dict[str, str | None]]):
+    """
+    Write rows to a BIDS TSV file at the given path, creating it if necessary, without holding all
+    the rows in memory.
+    """
 
-        with open(path, 'w', newline='') as file:
-            writer = csv.DictWriter(file, fieldnames=fields, delimiter='\t')
-            writer.writeheader()
+    with open_bids_tsv_file(path, 'w') as file:
+        writer = csv.DictWriter(file, fieldnames=field_names, delimiter='\t')
+        writer.writeheader()
 
-            for row in self.rows:
-                writer.writerow(row.data)
+        for row in rows:
+            writer.writerow(row)
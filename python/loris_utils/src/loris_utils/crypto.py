@@ -1,19 +1,42 @@
 import hashlib
+import os
+from collections.abc import Iterable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
+from loris_utils.hash_cache import FileHashCache
+
+# Size of the chunks in which the files are read to compute their hashes.
+HASH_CHUNK_SIZE = 1048576
+
+# Persistent hash cache used by the hashing functions, if any.
+_file_hash_cache: FileHashCache | None = None
+
+
+def set_file_hash_cache(file_hash_cache: FileHashCache | None):
+    """
+    Set the persistent hash cache used by the hashing functions, or disable it if `None`.
+    """
+
+    global _file_hash_cache
+    _file_hash_cache = file_hash_cache
+
+
+def get_file_hash_cache() -> FileHashCache | None:
+    """
+    Get the persistent hash cache used by the hashing functions, if any.
+    """
+
+    return _file_hash_cache
+
 
 def compute_file_blake2b_hash(file_path: Path | str) -> str:
     """
     Compute the BLAKE2b hash of a file.
     """
 
-    # Since the file given to this function may be large, we read it in chunks to avoid running
-    # out of memory.
-    hash = hashlib.blake2b()
-    with open(file_path, 'rb') as file:
-        while chunk := file.read(1048576):
-            hash.update(chunk)
-    return hash.hexdigest()
+    return compute_file_hashes(file_path, ('blake2b',))['blake2b']
 
 
 def compute_file_md5_hash(file_path: Path | str) -> str:
@@ -21,10 +44,117 @@ def compute_file_md5_hash(file_path: Path | str) -> str:
     Compute the MD5 hash of a file.
     """
 
+    return compute_file_hashes(file_path, ('md5',))['md5']
+
+
+def compute_file_hashes(file_path: Path | str, algorithms: Sequence[str] = ('blake2b', 'md5')) -> dict[str, str]:
+    """
+    Compute several hashes of a file while reading it only once, and return them indexed by
+    algorithm name (any algorithm supported by `hashlib.new`, such as `blake2b` or `md5`).
+
+    The hashes are memoized by file path, size, modification and status change times and inode, so
+    that a file that has not changed is not read again when it is hashed several times in a same
+    run, including a file rewritten in place with the same size and modification time. If a
+    persistent hash cache is set, it is used instead of this in-memory memoization.
+    """
+
+    stat = os.stat(file_path)
+    algorithms = tuple(algorithms)
+
+    file_hash_cache = _file_hash_cache
+    if file_hash_cache is None:
+        return dict(_compute_file_hashes(
+            os.path.abspath(file_path),
+            stat.st_size,
+            stat.st_mtime_ns,
+            stat.st_ctime_ns,
+            stat.st_ino,
+            algorithms,
+        ))
+
+    cached_hashes = file_hash_cache.get(stat, algorithms)
+    if cached_hashes is None:
+        hashes = dict(_read_file_hashes(file_path, algorithms))
+    elif file_hash_cache.should_verify():
+        # Paranoid mode, read the file again to verify the cached hashes.
+        hashes = dict(_read_file_hashes(file_path, algorithms))
+        file_hash_cache.record_verification(file_path, stat, cached_hashes, hashes)
+    else:
+        return cached_hashes
+
+    file_hash_cache.set(stat, hashes)
+    return hashes
+
+
+def compute_files_hashes(
+    file_paths: Iterable[Path | str],
+    algorithms: Sequence[str] = ('blake2b', 'md5'),
+    max_workers: int | None = None,
+) -> dict[Path | str, dict[str, str]]:
+    """
+    Compute the hashes of several files concurrently, and return them indexed by file path. The
+    hashing functions release the GIL, so the files are hashed in parallel by a thread pool.
+    """
+
+    file_paths = list(dict.fromkeys(file_paths))
+    if len(file_paths) <= 1:
+        return {file_path: compute_file_hashes(file_path, algorithms) for file_path in file_paths}
+
+    def hash_file(file_path: Path | str) -> dict[str, str]:
+        return compute_file_hashes(file_path, algorithms)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        hashes = executor.map(hash_file, file_paths)
+        return dict(zip(file_paths, hashes, strict=True))
+
+
+def copy_file_with_hashes(
+    source_path: Path | str,
+    destination_path: Path | str,
+    algorithms: Sequence[str] = ('blake2b',),
+) -> dict[str, str]:
+    """
+    Copy a file and compute its hashes in the same read, and return the hashes indexed by
+    algorithm name. The hashes are also stored in the persistent hash cache if one is set.
+    """
+
+    algorithms = tuple(algorithms)
+    hashes = [hashlib.new(algorithm) for algorithm in algorithms]
+
+    with open(source_path, 'rb') as source_file, open(destination_path, 'wb') as destination_file:
+        stat = os.fstat(source_file.fileno())
+        while chunk := source_file.read(HASH_CHUNK_SIZE):
+            destination_file.write(chunk)
+            for hash in hashes:
+                hash.update(chunk)
+
+    digests = {algorithm: hash.hexdigest() for algorithm, hash in zip(algorithms, hashes, strict=True)}
+    if _file_hash_cache is not None:
+        _file_hash_cache.set(stat, digests)
+
+    return digests
+
+
+@lru_cache(maxsize=65536)
+def _compute_file_hashes(
+    file_path: str,
+    size: int,
+    mtime_ns: int,
+    ctime_ns: int,
+    inode: int,
+    algorithms: tuple[str, ...],
+) -> tuple[tuple[str, str], ...]:
+    return _read_file_hashes(file_path, algorithms)
+
+
+def _read_file_hashes(file_path: Path | str, algorithms: tuple[str, ...]) -> tuple[tuple[str, str], ...]:
+    hashes = [hashlib.new(algorithm) for algorithm in algorithms]
+
     # Since the file given to this function may be large, we read it in chunks to avoid running
     # out of memory.
-    hash = hashlib.md5()
     with open(file_path, 'rb') as file:
-        while chunk := file.read(1048576):
-            hash.update(chunk)
-    return hash.hexdigest()
+        while chunk := file.read(HASH_CHUNK_SIZE):
+            for hash in hashes:
+                hash.update(chunk)
+
+    return tuple((algorithm, hash.hexdigest()) for algorithm, hash in zip(algorithms, hashes, strict=True))
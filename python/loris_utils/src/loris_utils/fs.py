@@ -1,9 +1,15 @@
+import fcntl
+import os
 import re
+import shutil
 import tarfile
 import tempfile
-from collections.abc import Iterator
+from collections.abc import Iterator, Sequence
 from datetime import datetime
 from pathlib import Path
+from typing import Literal
+
+from loris_utils.crypto import compute_file_hashes, copy_file_with_hashes
 
 
 def extract_archive(tar_path: str, prefix: str, dir_path: str) -> str:
@@ -55,6 +61,37 @@ def remove_empty_directories(dir_path: Path):
         dir_path.rmdir()
 
 
+def remove_path(path: Path):
+    """
+    Remove a file, symbolic link or directory tree if it exists.
+    """
+
+    if path.is_dir() and not path.is_symlink():
+        shutil.rmtree(path)
+    else:
+        path.unlink(missing_ok=True)
+
+
+def replace_file_text(path: Path | str, text: str):
+    """
+    Write a text file through a temporary file that then replaces it. If the file is a hard link
+    or a symbolic link, the link is replaced by a new file rather than written through, so that
+    the linked file is not modified.
+    """
+
+    path = Path(path)
+    with tempfile.NamedTemporaryFile('w', dir=path.parent, prefix=f'.{path.name}.', delete=False) as tmp_file:
+        tmp_file_path = tmp_file.name
+        try:
+            tmp_file.write(text)
+        except BaseException:
+            tmp_file.close()
+            os.unlink(tmp_file_path)
+            raise
+
+    os.replace(tmp_file_path, path)
+
+
 def search_dir_file_with_regex(dir_path: Path, regex: str) -> Path | None:
     """
     Search for a file or directory within a directory whose name matches a regular expression, or
@@ -66,3 +103,100 @@ def search_dir_file_with_regex(dir_path: Path, regex: str) -> Path | None:
             return file_path
 
     return None
+
+
+# Linux `FICLONE` ioctl request, which clones a file using copy-on-write on the file systems that
+# support it (Btrfs, XFS...).
+FICLONE = 0x40049409
+
+FilePlacementStrategy = Literal['copy', 'reflink', 'hardlink', 'symlink']
+"""
+Strategy to place a file in a new location:
+- `copy`: copy the file content.
+- `reflink`: clone the file using copy-on-write, which does not use any disk space until the clone
+  is modified.
+- `hardlink`: create a hard link to the file.
+- `symlink`: create a symbolic link to the file.
+
+With the `hardlink` and `symlink` strategies, an in-place modification of the placed file also
+modifies the source file, so the placed files must only be modified through `replace_file_text`
+or equivalent.
+"""
+
+# Strategies tried in order for each requested placement strategy, the first one that is supported
+# by the file system is used.
+FILE_PLACEMENT_FALLBACKS: dict[FilePlacementStrategy, list[FilePlacementStrategy]] = {
+    'copy':     ['copy'],
+    'reflink':  ['reflink', 'copy'],
+    'hardlink': ['hardlink', 'reflink', 'copy'],
+    'symlink':  ['symlink', 'copy'],
+}
+
+
+def place_file(
+    source_path: Path,
+    destination_path: Path,
+    strategy: FilePlacementStrategy,
+    hash_algorithms: Sequence[str] = (),
+) -> tuple[FilePlacementStrategy, dict[str, str]]:
+    """
+    Place a file or directory in a new location using a placement strategy, falling back to the
+    next strategy if the file system does not support it. Return the strategy used and, for a
+    file, its hashes for the requested algorithms. The hashes are computed while copying the file
+    if it is copied, so that the source file is only read once.
+    """
+
+    for fallback_strategy in FILE_PLACEMENT_FALLBACKS[strategy]:
+        if fallback_strategy == 'copy':
+            break
+
+        try:
+            if source_path.is_dir():
+                _place_directory(source_path, destination_path, fallback_strategy)
+            else:
+                _place_file(source_path, destination_path, fallback_strategy)
+        except OSError:
+            # Remove the partial result of the failed strategy before trying the next one.
+            if destination_path.is_dir() and not destination_path.is_symlink():
+                shutil.rmtree(destination_path)
+            else:
+                destination_path.unlink(missing_ok=True)
+
+            continue
+
+        hashes = compute_file_hashes(source_path, hash_algorithms) if hash_algorithms and source_path.is_file() else {}
+        return fallback_strategy, hashes
+
+    if source_path.is_dir():
+        shutil.copytree(source_path, destination_path)
+        return 'copy', {}
+
+    if hash_algorithms:
+        return 'copy', copy_file_with_hashes(source_path, destination_path, hash_algorithms)
+
+    shutil.copyfile(source_path, destination_path)
+    return 'copy', {}
+
+
+def _place_file(source_path: Path, destination_path: Path, strategy: FilePlacementStrategy):
+    match strategy:
+        case 'reflink':
+            with open(source_path, 'rb') as source_file, open(destination_path, 'wb') as destination_file:
+                fcntl.ioctl(destination_file.fileno(), FICLONE, source_file.fileno())
+        case 'hardlink':
+            os.link(source_path, destination_path)
+        case 'symlink':
+            os.symlink(source_path.absolute(), destination_path)
+        case 'copy':
+            shutil.copyfile(source_path, destination_path)
+
+
+def _place_directory(source_path: Path, destination_path: Path, strategy: FilePlacementStrategy):
+    if strategy == 'symlink':
+        os.symlink(source_path.absolute(), destination_path, target_is_directory=True)
+    else:
+        shutil.copytree(
+            source_path,
+            destination_path,
+            copy_function=lambda source, destination: _place_file(Path(source), Path(destination), strategy),
+        )
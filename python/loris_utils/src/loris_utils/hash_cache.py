@@ -0,0 +1,176 @@
+import os
+import random
+import sqlite3
+import sys
+import threading
+from collections.abc import Callable
+from pathlib import Path
+
+
+class FileHashCache:
+    """
+    Persistent cache of the file hashes, stored in an SQLite database. The hashes are indexed by
+    the identity of the file, that is, its device, inode, size, and modification and status change
+    times, so that a file is only hashed again if it has been modified or replaced.
+
+    In paranoid mode, a random sample of the cache hits is hashed again to verify the cache. In
+    read-only mode, the cache is only read, and the new hashes are not stored.
+
+    The cache is an optimization, so an SQLite error raised while reading or writing it, such as a
+    locked database on a network file system, is reported as a warning and treated as a cache miss.
+    """
+
+    def __init__(self, db_path: Path | str, verify_rate: float = 0.0, warn: Callable[[str], None] | None = None):
+        """
+        :param db_path: path of the SQLite database file, created if it does not exist
+        :param verify_rate: proportion of the cache hits that are verified by hashing the file again
+        :param warn: function used to report the warnings of the cache, printing them by default
+        """
+
+        self.verify_rate = verify_rate
+        self.read_only = False
+        self.warn: Callable[[str], None] = warn or (lambda message: print(f"WARNING: {message}", file=sys.stderr))
+        self.hits = 0
+        self.misses = 0
+        self.verified = 0
+        self.mismatches = 0
+        self.errors = 0
+
+        # The cache may be used by several hashing threads and by several scripts at the same time.
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        with self._lock, self._connection:
+            # Drop the cache tables created without the status change time, which cannot be used.
+            columns = [row[1] for row in self._connection.execute('PRAGMA table_info(file_hash)')]
+            if columns != [] and 'ctime_ns' not in columns:
+                self._connection.execute('DROP TABLE file_hash')
+
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS file_hash ('
+                ' device INTEGER NOT NULL,'
+                ' inode INTEGER NOT NULL,'
+                ' size INTEGER NOT NULL,'
+                ' mtime_ns INTEGER NOT NULL,'
+                ' ctime_ns INTEGER NOT NULL,'
+                ' algorithm TEXT NOT NULL,'
+                ' digest TEXT NOT NULL,'
+                ' PRIMARY KEY (device, inode, size, mtime_ns, ctime_ns, algorithm)'
+                ')'
+            )
+
+    def get(self, stat: os.stat_result, algorithms: tuple[str, ...]) -> dict[str, str] | None:
+        """
+        Get the cached hashes of a file given its stat result, or `None` if any of the requested
+        hashes is not in the cache.
+        """
+
+        with self._lock:
+            try:
+                rows = self._connection.execute(
+                    'SELECT algorithm, digest FROM file_hash'
+                    ' WHERE device = ? AND inode = ? AND size = ? AND mtime_ns = ? AND ctime_ns = ?',
+                    (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns, stat.st_ctime_ns),
+                ).fetchall()
+            except sqlite3.Error as error:
+                self._record_error(error)
+                rows = []
+
+            digests = dict(rows)
+            if any(algorithm not in digests for algorithm in algorithms):
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            return {algorithm: digests[algorithm] for algorithm in algorithms}
+
+    def set(self, stat: os.stat_result, hashes: dict[str, str]):
+        """
+        Store the hashes of a file given its stat result, and remove the hashes of the previous
+        versions of that file. Do nothing if the cache is read-only.
+        """
+
+        if self.read_only:
+            return
+
+        with self._lock:
+            try:
+                with self._connection:
+                    self._connection.execute(
+                        'DELETE FROM file_hash WHERE device = ? AND inode = ?'
+                        ' AND (size != ? OR mtime_ns != ? OR ctime_ns != ?)',
+                        (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns, stat.st_ctime_ns),
+                    )
+
+                    file_key = (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns, stat.st_ctime_ns)
+                    self._connection.executemany(
+                        'INSERT OR REPLACE INTO file_hash (device, inode, size, mtime_ns, ctime_ns, algorithm, digest)'
+                        ' VALUES (?, ?, ?, ?, ?, ?, ?)',
+                        [(*file_key, algorithm, digest) for algorithm, digest in hashes.items()],
+                    )
+            except sqlite3.Error as error:
+                self._record_error(error)
+
+    def should_verify(self) -> bool:
+        """
+        Randomly decide whether a cache hit should be verified according to the verify rate.
+        """
+
+        return self.verify_rate > 0 and random.random() < self.verify_rate
+
+    def record_verification(
+        self,
+        file_path: Path | str,
+        stat: os.stat_result,
+        cached_hashes: dict[str, str],
+        hashes: dict[str, str],
+    ):
+        """
+        Record the result of the verification of a cache hit. If the cached hashes do not match the
+        hashes of the file, a warning is reported and the stale cache entries of the file are
+        removed unless the cache is read-only.
+        """
+
+        with self._lock:
+            self.verified += 1
+            if cached_hashes == hashes:
+                return
+
+            self.mismatches += 1
+            if self.read_only:
+                self.warn(f"Cached hashes of file '{file_path}' do not match its content.")
+                return
+
+            self.warn(f"Cached hashes of file '{file_path}' do not match its content, removing them from the cache.")
+
+            try:
+                with self._connection:
+                    self._connection.execute(
+                        'DELETE FROM file_hash WHERE device = ? AND inode = ?',
+                        (stat.st_dev, stat.st_ino),
+                    )
+            except sqlite3.Error as error:
+                self._record_error(error)
+
+    def get_summary(self) -> str:
+        """
+        Get a human-readable summary of the cache usage.
+        """
+
+        return (
+            f"Hash cache: {self.hits} hit(s), {self.misses} miss(es), {self.verified} verified hit(s),"
+            f" {self.mismatches} mismatch(es), {self.errors} error(s)"
+        )
+
+    def close(self):
+        """
+        Close the connection to the cache database.
+        """
+
+        with self._lock:
+            self._connection.close()
+
+    def _record_error(self, error: sqlite3.Error):
+        # Only the first error is reported, as a locked database usually fails many calls in a row.
+        self.errors += 1
+        if self.errors == 1:
+            self.warn(f"Hash cache error, files are hashed without the cache when it fails: {error}")
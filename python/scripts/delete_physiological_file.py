@@ -6,7 +6,6 @@ import os
 import shutil
 import sys
 
-from lib.database import Database
 from lib.database_lib.config import Config
 from lib.exitcode import INVALID_ARG
 from lib.lorisgetopt import LorisGetOpt
@@ -67,8 +66,7 @@ def main():
     # ---------------------------------------------------------------------------------------------
     # Establish database connection
     # ---------------------------------------------------------------------------------------------
-    db = Database(loris_getopt_obj.config_info.mysql, verbose)
-    db.connect()
+    db = loris_getopt_obj.db
 
     # ---------------------------------------------------------------------------------------------
     # Load the configs
@@ -11,7 +11,6 @@ from loris_utils.fs import extract_archive
 
 import lib.exitcode
 import lib.utilities as utilities
-from lib.database import Database
 from lib.database_lib.config import Config
 from lib.env import Env
 from lib.exitcode import BAD_CONFIG_SETTING, SUCCESS
@@ -63,9 +62,7 @@ def main():
     # ---------------------------------------------------------------------------------------------
     # Establish database connection
     # ---------------------------------------------------------------------------------------------
-    config_file = loris_getopt_obj.config_info
-    db = Database(config_file.mysql, verbose)
-    db.connect()
+    db = loris_getopt_obj.db
 
     # ---------------------------------------------------------------------------------------------
     # Load the Config database class
@@ -6,7 +6,6 @@ import os
 import subprocess
 import sys
 
-from lib.database import Database
 from lib.database_lib.config import Config
 from lib.exitcode import INVALID_ARG, SUCCESS
 from lib.lorisgetopt import LorisGetOpt
@@ -55,9 +54,7 @@ def main():
     # ---------------------------------------------------------------------------------------------
     # Establish database connection
     # ---------------------------------------------------------------------------------------------
-    config_file = loris_getopt_obj.config_info
-    db = Database(config_file.mysql, verbose)
-    db.connect()
+    db = loris_getopt_obj.db
 
     # ---------------------------------------------------------------------------------------------
     # Load the Config database class
@@ -5,7 +5,11 @@ import pytest
 from sqlalchemy.orm import Session as Database
 
 from lib.db.models.candidate import DbCandidate
-from lib.db.queries.candidate import try_get_candidate_with_cand_id
+from lib.db.queries.candidate import (
+    get_candidates_with_cand_ids,
+    get_candidates_with_psc_ids,
+    try_get_candidate_with_cand_id,
+)
 from tests.util.database import create_test_database
 
 
@@ -56,3 +60,13 @@ def test_try_get_candidate_with_cand_id_some(setup: Setup):
 def test_try_get_candidate_with_cand_id_none(setup: Setup):
     candidate = try_get_candidate_with_cand_id(setup.db, 333333)
     assert candidate is None
+
+
+def test_get_candidates_with_cand_ids(setup: Setup):
+    candidates = get_candidates_with_cand_ids(setup.db, [111111, 222222, 333333])
+    assert set(candidates) == {setup.candidate_1, setup.candidate_2}
+
+
+def test_get_candidates_with_psc_ids(setup: Setup):
+    candidates = get_candidates_with_psc_ids(setup.db, ['DCC002', 'DCC003'])
+    assert list(candidates) == [setup.candidate_2]
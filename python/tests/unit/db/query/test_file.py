@@ -0,0 +1,66 @@
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from sqlalchemy.orm import Session as Database
+
+from lib.db.models.file import DbFile
+from lib.db.models.file_parameter import DbFileParameter
+from lib.db.models.parameter_type import DbParameterType
+from lib.db.queries.file import get_files_with_paths, get_registered_file_hashes
+from tests.util.database import create_test_database
+
+
+@dataclass
+class Setup:
+    db: Database
+    file_1: DbFile
+    file_2: DbFile
+
+
+@pytest.fixture
+def setup():
+    db = create_test_database()
+
+    file_1 = DbFile(
+        session_id = 1,
+        path = Path('bids_imports/sub-DCC001/ses-V1/anat/sub-DCC001_ses-V1_T1w.nii.gz'),
+        output_type = 'native',
+        inserted_by_user_id = 'admin',
+        insert_time = datetime.now(),
+    )
+
+    file_2 = DbFile(
+        session_id = 1,
+        path = Path('bids_imports/sub-DCC001/ses-V1/anat/sub-DCC001_ses-V1_T2w.nii.gz'),
+        output_type = 'native',
+        inserted_by_user_id = 'admin',
+        insert_time = datetime.now(),
+    )
+
+    hash_type = DbParameterType(
+        name = 'file_blake2b_hash',
+        queryable = False,
+    )
+
+    db.add_all([file_1, file_2, hash_type])
+    db.flush()
+
+    db.add(DbFileParameter(
+        file_id = file_1.id,
+        type_id = hash_type.id,
+        value = 'hash_1',
+        insert_time = datetime.now(),
+    ))
+
+    return Setup(db, file_1, file_2)
+
+
+def test_get_files_with_paths(setup: Setup):
+    files = get_files_with_paths(setup.db, [setup.file_2.path, Path('sub-DCC002_ses-V1_T1w.nii.gz')])
+    assert list(files) == [setup.file_2]
+
+
+def test_get_registered_file_hashes(setup: Setup):
+    assert get_registered_file_hashes(setup.db, ['hash_1', 'hash_2']) == {'hash_1'}
@@ -0,0 +1,229 @@
+import json
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any, cast
+
+import boto3
+import pytest
+from loris_utils.crypto import compute_file_blake2b_hash
+from moto import mock_aws
+
+import lib.aws_s3
+from lib.aws_s3 import AwsS3
+from lib.aws_s3_cache import S3FileCache
+from lib.imaging import Imaging
+
+BUCKET_NAME = 'loris-test'
+
+
+@pytest.fixture
+def s3() -> Iterator[Any]:
+    # Neither boto3 nor the legacy AwsS3 class are typed.
+    with mock_aws():
+        cast(Any, boto3).client('s3', region_name='us-east-1').create_bucket(Bucket=BUCKET_NAME)
+        yield AwsS3('access-key', 'secret-key', None, BUCKET_NAME, max_concurrent_transfers=4)
+
+
+def write_files(dir_path: Path, count: int) -> list[Path]:
+    paths: list[Path] = []
+    for i in range(count):
+        path = dir_path / f'file_{i}.txt'
+        path.write_text(f'content {i}')
+        paths.append(path)
+
+    return paths
+
+
+def test_upload_files(s3: Any, tmp_path: Path):
+    paths = write_files(tmp_path, 10)
+
+    s3.upload_files([(str(path), f's3://{BUCKET_NAME}/assembly_bids/{path.name}') for path in paths])
+
+    objects = s3.list_objects('assembly_bids/')
+    assert set(objects.keys()) == {f'assembly_bids/{path.name}' for path in paths}
+    assert objects['assembly_bids/file_0.txt'].size == len('content 0')
+
+
+def test_list_objects_prefix(s3: Any, tmp_path: Path):
+    paths = write_files(tmp_path, 2)
+
+    s3.upload_files([
+        (str(paths[0]), f's3://{BUCKET_NAME}/assembly_bids/{paths[0].name}'),
+        (str(paths[1]), f's3://{BUCKET_NAME}/pic/{paths[1].name}'),
+    ])
+
+    assert list(s3.list_objects('pic/').keys()) == [f'pic/{paths[1].name}']
+
+
+def test_check_object_content_exists(s3: Any, tmp_path: Path):
+    paths = write_files(tmp_path, 2)
+
+    s3.upload_files([(str(paths[0]), f's3://{BUCKET_NAME}/assembly_bids/{paths[0].name}')])
+
+    assert s3.check_object_content_exists(str(paths[0]), f'assembly_bids/{paths[0].name}')
+    assert not s3.check_object_content_exists(str(paths[1]), f'assembly_bids/{paths[0].name}')
+    assert not s3.check_object_content_exists(str(paths[1]), f'assembly_bids/{paths[1].name}')
+
+
+def test_check_object_content_exists_multipart(s3: Any, tmp_path: Path):
+    s3.transfer_config.multipart_threshold = 5 * 1024 * 1024
+    s3.transfer_config.multipart_chunksize = 5 * 1024 * 1024
+    path = tmp_path / 'large.nii.gz'
+    path.write_bytes(bytes(range(256)) * (12 * 4096))
+
+    s3.upload_files([(str(path), f's3://{BUCKET_NAME}/assembly_bids/{path.name}')])
+
+    etag = s3.compute_file_etag(str(path))
+    assert etag.endswith('-3')
+    assert s3.list_objects('assembly_bids/')[f'assembly_bids/{path.name}'].etag == etag
+    assert s3.check_object_content_exists(str(path), f'assembly_bids/{path.name}')
+
+
+def test_upload_dir_and_download(s3: Any, tmp_path: Path):
+    upload_dir = tmp_path / 'upload'
+    (upload_dir / 'sub-01').mkdir(parents=True)
+    write_files(upload_dir / 'sub-01', 3)
+
+    s3.upload_dir(str(upload_dir), f's3://{BUCKET_NAME}/assembly_bids')
+
+    assert set(s3.list_objects('assembly_bids/').keys()) == {
+        f'assembly_bids/sub-01/file_{i}.txt' for i in range(3)
+    }
+
+    download_dir = tmp_path / 'download'
+    s3.download_file(f's3://{BUCKET_NAME}/assembly_bids', str(download_dir))
+
+    assert (download_dir / 'sub-01' / 'file_2.txt').read_text() == 'content 2'
+
+
+def test_download_files(s3: Any, tmp_path: Path):
+    paths = write_files(tmp_path, 3)
+    s3.upload_files([(str(path), f's3://{BUCKET_NAME}/pic/{path.name}') for path in paths])
+
+    download_dir = tmp_path / 'download'
+    s3.download_files([
+        (f's3://{BUCKET_NAME}/pic/{path.name}', str(download_dir / path.name)) for path in paths
+    ])
+
+    assert sorted(path.name for path in download_dir.iterdir()) == [path.name for path in paths]
+
+
+def test_download_file_cache(s3: Any, tmp_path: Path):
+    s3.file_cache = S3FileCache(tmp_path / 'cache', 1024)
+    path = write_files(tmp_path, 1)[0]
+    file_hash = compute_file_blake2b_hash(path)
+    s3.upload_file(str(path), f's3://{BUCKET_NAME}/pic/{path.name}')
+
+    s3.download_file(f's3://{BUCKET_NAME}/pic/{path.name}', str(tmp_path / 'first.txt'), file_hash)
+    s3.delete_file(f's3://{BUCKET_NAME}/pic/{path.name}')
+    s3.download_file(f's3://{BUCKET_NAME}/pic/{path.name}', str(tmp_path / 'second.txt'), file_hash)
+
+    assert (tmp_path / 'second.txt').read_text() == 'content 0'
+
+
+def test_copy_file_delete(s3: Any, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(lib.aws_s3, 'MAX_DELETE_OBJECTS_KEYS', 2)
+    paths = write_files(tmp_path, 5)
+    s3.upload_files([(str(path), f's3://{BUCKET_NAME}/pic/{path.name}') for path in paths])
+
+    s3.copy_file(f's3://{BUCKET_NAME}/pic/', f's3://{BUCKET_NAME}/trashbin/pic/', delete=True)
+
+    assert s3.list_objects('pic/') == {}
+    assert set(s3.list_objects('trashbin/pic/').keys()) == {f'trashbin/pic/{path.name}' for path in paths}
+
+
+def test_upload_files_listing(s3: Any, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    paths = write_files(tmp_path, 3)
+    files = [(str(path), f's3://{BUCKET_NAME}/assembly_bids/sub-01/{path.name}') for path in paths]
+    s3.upload_files(files)
+
+    # The existing objects are found in the listing of the upload prefix, not one by one.
+    monkeypatch.setattr(s3.s3_client, 'head_object', None)
+    uploaded_keys: list[str] = []
+    upload_file_to_key = s3._upload_file_to_key
+
+    def upload_file_to_key_spy(file_name: str, bucket_name: str, key: str):
+        uploaded_keys.append(key)
+        upload_file_to_key(file_name, bucket_name, key)
+
+    monkeypatch.setattr(s3, '_upload_file_to_key', upload_file_to_key_spy)
+
+    paths[1].write_text('new content')
+    s3.upload_files(files)
+
+    assert uploaded_keys == [f'assembly_bids/sub-01/{paths[1].name}']
+    assert s3.list_objects('assembly_bids/')[uploaded_keys[0]].size == len('new content')
+
+
+def test_list_objects_with_keys(s3: Any, tmp_path: Path):
+    paths = write_files(tmp_path, 3)
+    s3.upload_files([
+        (str(paths[0]), f's3://{BUCKET_NAME}/assembly_bids/sub-01/{paths[0].name}'),
+        (str(paths[1]), f's3://{BUCKET_NAME}/assembly_bids/sub-02/{paths[1].name}'),
+        (str(paths[2]), f's3://{BUCKET_NAME}/pic/{paths[2].name}'),
+    ])
+
+    assert set(s3.list_objects_with_keys([
+        f'assembly_bids/sub-01/{paths[0].name}',
+        f'assembly_bids/sub-02/{paths[1].name}',
+        f'assembly_bids/sub-02/{paths[2].name}',
+        f'pic/{paths[2].name}',
+    ]).keys()) == {
+        f'assembly_bids/sub-01/{paths[0].name}',
+        f'assembly_bids/sub-02/{paths[1].name}',
+        f'pic/{paths[2].name}',
+    }
+
+
+class FakeConfig:
+    def get_config(self, config_name: str) -> str:
+        return '/data'
+
+
+class FakeParameterType:
+    def get_parameter_type_id(self, param_type_name: str) -> int:
+        return 1
+
+
+class FakeParameterFile:
+    def __init__(self, file_hash: str):
+        self.file_hash = file_hash
+
+    def get_parameter_file_for_file_id_param_type_id(self, file_id: int, param_type_id: int) -> dict[str, Any]:
+        return {'ParameterFileID': 1, 'Value': self.file_hash}
+
+    def update_parameter_file(self, value: str, param_file_id: int):
+        self.file_hash = value
+
+
+def test_fmap_json_file_cache(s3: Any, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    s3.file_cache = S3FileCache(tmp_path / 'cache', 1024)
+    path = tmp_path / 'sub-01_phasediff.json'
+    path.write_text('{}')
+    s3_path = f's3://{BUCKET_NAME}/assembly_bids/sub-01/fmap/{path.name}'
+    s3.upload_file(str(path), s3_path)
+
+    # The legacy Imaging class is not typed.
+    imaging: Any = Imaging.__new__(Imaging)
+    imaging.config_db_obj = FakeConfig()
+    imaging.param_type_db_obj = FakeParameterType()
+    imaging.param_file_db_obj = FakeParameterFile(compute_file_blake2b_hash(path))
+    fmap_files = [{'FileID': 1, 'json_file_path': s3_path, 'IntendedFor': ['func/sub-01_bold.nii.gz']}]
+
+    (tmp_path / 'first').mkdir()
+    imaging.modify_fmap_json_file_to_write_intended_for(fmap_files, s3, str(tmp_path / 'first'))
+
+    # The second run finds the modified file in the cache under the hash stored by the first run.
+    downloads: list[tuple[Any, ...]] = []
+
+    def download_file(*args: Any, **kwargs: Any):
+        downloads.append(args)
+
+    monkeypatch.setattr(s3.s3_client, 'download_file', download_file)
+    (tmp_path / 'second').mkdir()
+    imaging.modify_fmap_json_file_to_write_intended_for(fmap_files, s3, str(tmp_path / 'second'))
+
+    assert downloads == []
+    assert json.loads((tmp_path / 'second' / path.name).read_text()) == {
+        'IntendedFor': ['func/sub-01_bold.nii.gz'],
+    }
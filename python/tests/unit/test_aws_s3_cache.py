@@ -0,0 +1,48 @@
+import os
+from pathlib import Path
+
+from loris_utils.crypto import compute_file_blake2b_hash
+
+from lib.aws_s3_cache import S3FileCache
+
+
+def write_file(path: Path, content: bytes) -> str:
+    path.write_bytes(content)
+    return compute_file_blake2b_hash(path)
+
+
+def test_get_put(tmp_path: Path):
+    cache = S3FileCache(tmp_path / 'cache', 1024)
+    file_hash = write_file(tmp_path / 'file.json', b'{"IntendedFor": []}')
+
+    assert not cache.get(file_hash, tmp_path / 'copy.json')
+
+    cache.put(file_hash, tmp_path / 'file.json')
+
+    assert cache.get(file_hash, tmp_path / 'copy.json')
+    assert (tmp_path / 'copy.json').read_bytes() == b'{"IntendedFor": []}'
+
+
+def test_put_hash_mismatch(tmp_path: Path):
+    cache = S3FileCache(tmp_path / 'cache', 1024)
+    write_file(tmp_path / 'file.json', b'{}')
+
+    cache.put('0' * 128, tmp_path / 'file.json')
+
+    assert not cache.get('0' * 128, tmp_path / 'copy.json')
+
+
+def test_evict_least_recently_used(tmp_path: Path):
+    cache = S3FileCache(tmp_path / 'cache', 250)
+    hashes = [write_file(tmp_path / f'file_{i}', bytes([i]) * 100) for i in range(3)]
+
+    cache.put(hashes[0], tmp_path / 'file_0')
+    cache.put(hashes[1], tmp_path / 'file_1')
+    os.utime(cache.get_cached_file_path(hashes[0]), (0, 0))
+    os.utime(cache.get_cached_file_path(hashes[1]), (1, 1))
+    cache.get(hashes[0], tmp_path / 'copy')
+    cache.put(hashes[2], tmp_path / 'file_2')
+
+    assert cache.get_cached_file_path(hashes[0]).exists()
+    assert not cache.get_cached_file_path(hashes[1]).exists()
+    assert cache.get_cached_file_path(hashes[2]).exists()
@@ -0,0 +1,73 @@
+from pathlib import Path
+
+from loris_bids_importer.copy_files import schedule_copy_loris_bids_file
+from loris_bids_importer.copy_scheduler import BidsFileCopyScheduler
+from loris_bids_importer.env import BidsImportEnv
+
+
+def make_import_env(tmp_path: Path, copy_scheduler: BidsFileCopyScheduler | None) -> BidsImportEnv:
+    (tmp_path / 'source').mkdir()
+    (tmp_path / 'data' / 'bids_imports').mkdir(parents=True)
+    return BidsImportEnv(
+        data_dir_path    = tmp_path / 'data',
+        source_bids_path = tmp_path / 'source',
+        loris_bids_path  = Path('bids_imports'),
+        copy_scheduler   = copy_scheduler,
+    )
+
+
+def test_schedule_copy(tmp_path: Path):
+    copy_scheduler = BidsFileCopyScheduler(4)
+    import_env = make_import_env(tmp_path, copy_scheduler)
+    for i in range(8):
+        (tmp_path / 'source' / f'sub-01_run-{i}_bold.json').write_text('{}')
+
+    futures = [
+        schedule_copy_loris_bids_file(
+            import_env,
+            tmp_path / 'source' / f'sub-01_run-{i}_bold.json',
+            Path('bids_imports') / f'sub-01_run-{i}_bold.json',
+            ('blake2b',),
+        )
+        for i in range(8)
+    ]
+
+    assert len({future.result()['blake2b'] for future in futures}) == 1
+    copy_scheduler.shutdown()
+    assert copy_scheduler.copied_files_count == 8
+    assert copy_scheduler.copied_bytes_count == 16
+    assert len(import_env.placed_files) == 8
+
+
+def test_schedule_copy_error(tmp_path: Path):
+    import_env = make_import_env(tmp_path, None)
+    (tmp_path / 'source' / 'sub-01_T1w.json').write_text('{}')
+    (tmp_path / 'data' / 'bids_imports' / 'sub-01_T1w.json').write_text('{}')
+
+    future = schedule_copy_loris_bids_file(
+        import_env,
+        tmp_path / 'source' / 'sub-01_T1w.json',
+        Path('bids_imports') / 'sub-01_T1w.json',
+    )
+
+    assert 'already exists' in str(future.exception())
+
+
+def test_schedule_copy_links_not_counted(tmp_path: Path):
+    copy_scheduler = BidsFileCopyScheduler(2)
+    import_env = make_import_env(tmp_path, copy_scheduler)
+    import_env.placement_strategy = 'hardlink'
+    (tmp_path / 'source' / 'sub-01_T1w.nii.gz').write_bytes(b'nifti')
+    (tmp_path / 'source' / 'sub-01_T1w.json').write_text('{}')
+
+    for file_name in ['sub-01_T1w.nii.gz', 'sub-01_T1w.json']:
+        schedule_copy_loris_bids_file(import_env, tmp_path / 'source' / file_name, Path('bids_imports') / file_name)
+
+    copy_scheduler.shutdown()
+
+    # The NIfTI file is linked, only the metadata file is copied.
+    assert import_env.placed_files == {
+        Path('bids_imports/sub-01_T1w.nii.gz'): 'hardlink',
+        Path('bids_imports/sub-01_T1w.json'): 'copy',
+    }
+    assert (copy_scheduler.copied_files_count, copy_scheduler.copied_bytes_count) == (1, 2)
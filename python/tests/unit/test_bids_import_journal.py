@@ -0,0 +1,118 @@
+from pathlib import Path
+
+import pytest
+from loris_bids_importer.copy_files import copy_loris_bids_file
+from loris_bids_importer.env import BidsImportEnv
+from loris_bids_importer.journal import BidsImportJournal
+
+
+def make_import_env(tmp_path: Path, resume: bool) -> BidsImportEnv:
+    (tmp_path / 'source').mkdir(exist_ok=True)
+    (tmp_path / 'data' / 'bids_imports').mkdir(parents=True, exist_ok=True)
+    return BidsImportEnv(
+        data_dir_path    = tmp_path / 'data',
+        source_bids_path = tmp_path / 'source',
+        loris_bids_path  = Path('bids_imports'),
+        journal          = BidsImportJournal(tmp_path / 'data' / 'bids_imports' / 'journal.jsonl', resume),
+    )
+
+
+def test_resume_copies(tmp_path: Path):
+    import_env = make_import_env(tmp_path, False)
+    for name in ['sub-01_T1w.json', 'sub-01_T2w.json', 'sub-01_FLAIR.json']:
+        (tmp_path / 'source' / name).write_text('{"EchoTime": 1}')
+
+    complete_hashes = copy_loris_bids_file(
+        import_env,
+        tmp_path / 'source' / 'sub-01_T1w.json',
+        Path('bids_imports/sub-01_T1w.json'),
+        ('blake2b',),
+    )
+
+    assert import_env.journal is not None
+    import_env.journal.close()
+
+    # Simulate an incomplete copy and a truncated journal record left by an interrupted import,
+    # and a file placed without journal by an earlier import.
+    (tmp_path / 'data' / 'bids_imports' / 'sub-01_T2w.json').write_text('{"Ech')
+    (tmp_path / 'data' / 'bids_imports' / 'sub-01_FLAIR.json').write_text('{"EchoTime": 2}')
+    with open(tmp_path / 'data' / 'bids_imports' / 'journal.jsonl', 'a') as file:
+        file.write('{"type": "copy_start", "path": "bids_imports/sub-01_T2w.json"}\n')
+        file.write('{"type": "copy", "pa')
+
+    # The completed copy raises an error if the import is not resumed.
+    with pytest.raises(Exception):
+        copy_loris_bids_file(
+            make_import_env(tmp_path, False),
+            tmp_path / 'source' / 'sub-01_T1w.json',
+            Path('bids_imports/sub-01_T1w.json'),
+        )
+
+    import_env = make_import_env(tmp_path, True)
+    assert import_env.journal is not None
+
+    # The completed copy is skipped and its hash is read from the journal.
+    assert copy_loris_bids_file(
+        import_env,
+        tmp_path / 'source' / 'sub-01_T1w.json',
+        Path('bids_imports/sub-01_T1w.json'),
+        ('blake2b',),
+    ) == complete_hashes
+
+    assert import_env.placed_files == {}
+
+    # The incomplete copy is copied again.
+    copy_loris_bids_file(
+        import_env,
+        tmp_path / 'source' / 'sub-01_T2w.json',
+        Path('bids_imports/sub-01_T2w.json'),
+    )
+
+    assert (tmp_path / 'data' / 'bids_imports' / 'sub-01_T2w.json').read_text() == '{"EchoTime": 1}'
+
+    # The file that was not placed by a journaled copy is kept.
+    with pytest.raises(Exception):
+        copy_loris_bids_file(
+            import_env,
+            tmp_path / 'source' / 'sub-01_FLAIR.json',
+            Path('bids_imports/sub-01_FLAIR.json'),
+        )
+
+    assert (tmp_path / 'data' / 'bids_imports' / 'sub-01_FLAIR.json').read_text() == '{"EchoTime": 2}'
+    import_env.journal.close()
+
+    journal = BidsImportJournal(tmp_path / 'data' / 'bids_imports' / 'journal.jsonl', True)
+    assert journal.copies.keys() == {Path('bids_imports/sub-01_T1w.json'), Path('bids_imports/sub-01_T2w.json')}
+    journal.close()
+
+
+def test_resume_acquisitions(tmp_path: Path):
+    nifti_path = tmp_path / 'sub-01_T1w.nii.gz'
+    nifti_path.write_bytes(b'nifti')
+
+    journal = BidsImportJournal(tmp_path / 'journal.jsonl', False)
+    journal.record_acquisition(nifti_path, 'hash')
+    journal.close()
+
+    # The previous records are only loaded if the import is resumed.
+    journal = BidsImportJournal(tmp_path / 'journal.jsonl', False)
+    assert not journal.is_acquisition_imported(nifti_path)
+    journal.close()
+
+    journal = BidsImportJournal(tmp_path / 'journal.jsonl', True)
+    assert journal.is_acquisition_imported(nifti_path)
+    journal.close()
+
+    # An acquisition whose source file changed is imported again.
+    nifti_path.write_bytes(b'new nifti')
+    journal = BidsImportJournal(tmp_path / 'journal.jsonl', True)
+    assert not journal.is_acquisition_imported(nifti_path)
+    journal.close()
+
+
+def test_resume_unknown_record(tmp_path: Path):
+    journal_path = tmp_path / 'journal.jsonl'
+    journal_path.write_text('{"type": "checksum", "path": "bids_imports/sub-01_T1w.json"}\n')
+
+    with pytest.raises(Exception, match="Unknown record type 'checksum'"):
+        BidsImportJournal(journal_path, True)
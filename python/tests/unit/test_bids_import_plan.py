@@ -0,0 +1,185 @@
+import hashlib
+import json
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from loris_bids_importer.env import BidsImportEnv
+from loris_bids_importer.plan import measure_read_throughput, plan_bids_dataset_import
+from loris_bids_importer.print import format_bytes
+from loris_bids_utils.reader import BidsDatasetReader
+
+from lib.db.models.candidate import DbCandidate
+from lib.db.models.file import DbFile
+from lib.db.models.file_parameter import DbFileParameter
+from lib.db.models.mri_scan_type import DbMriScanType
+from lib.db.models.parameter_type import DbParameterType
+from lib.db.models.session import DbSession
+from lib.env import Env
+from tests.util.database import create_test_database
+
+LORIS_BIDS_PATH = Path('bids_imports/Test_BIDSVersion_1.8.0')
+
+
+def write_file(path: Path, content: bytes = b''):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)
+
+
+def write_dataset(dataset_path: Path):
+    write_file(dataset_path / 'dataset_description.json', json.dumps({'Name': 'Test', 'BIDSVersion': '1.8.0'}).encode())
+
+    session_path = dataset_path / 'sub-DCC001' / 'ses-V1'
+    write_file(session_path / 'anat' / 'sub-DCC001_ses-V1_T1w.nii.gz', b'registered path')
+    write_file(session_path / 'anat' / 'sub-DCC001_ses-V1_run-2_T1w.nii.gz', b'registered hash')
+    write_file(session_path / 'anat' / 'sub-DCC001_ses-V1_unknown.nii.gz', b'unknown')
+    write_file(session_path / 'func' / 'sub-DCC001_ses-V1_task-rest_run-1_bold.nii.gz', b'bold')
+    write_file(session_path / 'func' / 'sub-DCC001_ses-V1_task-rest_run-1_bold.json', b'{}')
+    write_file(session_path / 'func' / 'sub-DCC001_ses-V1_task-rest_run-1_events.tsv', b'onset\tduration\n')
+    write_file(dataset_path / 'task-rest_events.json', b'{}')
+
+    write_file(dataset_path / 'sub-DCC002' / 'ses-V1' / 'anat' / 'sub-DCC002_ses-V1_T2w.nii.gz', b'new subject')
+
+
+@pytest.fixture
+def env(tmp_path: Path) -> Env:
+    db = create_test_database()
+
+    db.add(DbCandidate(
+        id                      = 1,
+        cand_id                 = 111111,
+        psc_id                  = 'DCC001',
+        registration_site_id    = 1,
+        registration_project_id = 1,
+        active                  = True,
+        user_id                 = 'admin',
+        test_date               = datetime.now(),
+        entity_type             = 'Human',
+    ))
+
+    db.add(DbSession(
+        id               = 1,
+        candidate_id     = 1,
+        visit_label      = 'V1',
+        current_stage    = 'Not Started',
+        site_id          = 1,
+        project_id       = 1,
+        submitted        = False,
+        active           = True,
+        user_id          = 'admin',
+        test_date        = datetime.now(),
+        hardcopy_request = '-',
+        mri_qc_status    = '',
+        mri_qc_pending   = False,
+        mri_caveat       = True,
+    ))
+
+    db.add(DbMriScanType(id=1, name='T1w'))
+    db.add(DbMriScanType(id=2, name='bold'))
+    db.add(DbParameterType(id=1, name='file_blake2b_hash'))
+
+    # A file registered with the LORIS path of a dataset file.
+    db.add(DbFile(
+        id                  = 1,
+        session_id          = 1,
+        path                = LORIS_BIDS_PATH / 'sub-DCC001' / 'ses-V1' / 'anat' / 'sub-DCC001_ses-V1_T1w.nii.gz',
+        output_type         = 'native',
+        inserted_by_user_id = 'admin',
+        insert_time         = datetime.now(),
+    ))
+
+    # A file registered with the hash of another dataset file.
+    db.add(DbFile(
+        id                  = 2,
+        session_id          = 1,
+        path                = Path('assembly_bids/sub-DCC001_ses-V1_T1w.nii.gz'),
+        output_type         = 'native',
+        inserted_by_user_id = 'admin',
+        insert_time         = datetime.now(),
+    ))
+
+    db.add(DbFileParameter(
+        id          = 1,
+        file_id     = 2,
+        type_id     = 1,
+        value       = hashlib.blake2b(b'registered hash').hexdigest(),
+        insert_time = datetime.now(),
+    ))
+
+    db.flush()
+
+    return Env(
+        db_engine     = db.get_bind(),  # type: ignore
+        db            = db,
+        script_name   = 'test',
+        config_info   = None,
+        tmp_dir_path  = tmp_path,
+        log_file_path = tmp_path / 'test.log',
+        verbose       = False,
+        cleanups      = [],
+    )
+
+
+def test_plan_bids_dataset_import(env: Env, tmp_path: Path):
+    dataset_path = tmp_path / 'dataset'
+    write_dataset(dataset_path)
+
+    import_env = BidsImportEnv(
+        data_dir_path    = tmp_path / 'data',
+        source_bids_path = dataset_path,
+        loris_bids_path  = LORIS_BIDS_PATH,
+    )
+
+    bids = BidsDatasetReader(dataset_path, False, False, native=True)
+    plan = plan_bids_dataset_import(env, import_env, bids, True, 2)
+
+    assert plan.missing_candidates == ['DCC002']
+    assert plan.missing_sessions == [('DCC002', 'V1')]
+    assert plan.missing_scan_types == ['T2w']
+
+    session_plan_1, session_plan_2 = plan.sessions
+    session_path = dataset_path / 'sub-DCC001' / 'ses-V1'
+    assert {(skipped_file.path, skipped_file.reason) for skipped_file in session_plan_1.skipped_files} == {
+        (
+            session_path / 'anat' / 'sub-DCC001_ses-V1_T1w.nii.gz',
+            f"File '{LORIS_BIDS_PATH}/sub-DCC001/ses-V1/anat/sub-DCC001_ses-V1_T1w.nii.gz' is already registered in"
+            " LORIS.",
+        ),
+        (
+            session_path / 'anat' / 'sub-DCC001_ses-V1_run-2_T1w.nii.gz',
+            f"File with hash '{hashlib.blake2b(b'registered hash').hexdigest()}' is already registered in LORIS.",
+        ),
+        (
+            session_path / 'anat' / 'sub-DCC001_ses-V1_unknown.nii.gz',
+            "Unknown MRI file suffix 'unknown'.",
+        ),
+    }
+
+    # The BOLD acquisition is copied with its sidecar and events files.
+    assert (session_plan_1.acquisitions_count, session_plan_1.copied_files_count) == (1, 3)
+    assert session_plan_1.copied_bytes == len(b'bold') + len(b'{}') + len(b'onset\tduration\n')
+
+    # The acquisition of a new candidate is checked against the database by hash only.
+    assert session_plan_2.skipped_files == []
+    assert (session_plan_2.acquisitions_count, session_plan_2.copied_files_count) == (1, 1)
+    assert session_plan_2.copied_bytes == len(b'new subject')
+
+    assert plan.hashed_bytes == len(b'bold') + len(b'new subject')
+
+    # Nothing is written in the LORIS data directory.
+    assert not (tmp_path / 'data').exists()
+
+
+def test_measure_read_throughput(tmp_path: Path):
+    path = tmp_path / 'file.nii'
+    path.write_bytes(b'0' * 4096)
+
+    assert measure_read_throughput([path], 1024) is not None
+    assert measure_read_throughput([]) is None
+
+
+def test_format_bytes():
+    assert format_bytes(512) == '512 B'
+    assert format_bytes(1536) == '1.5 KiB'
+    assert format_bytes(3 * 1024 ** 3) == '3.0 GiB'
+    assert format_bytes(2 * 1024 ** 4) == '2.0 TiB'
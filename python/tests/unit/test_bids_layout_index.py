@@ -0,0 +1,87 @@
+import json
+from pathlib import Path
+
+from loris_bids_utils.layout_index import (
+    compute_bids_dataset_fingerprint,
+    get_bids_layout_index_path,
+    read_bids_layout_index_fingerprint,
+)
+from loris_bids_utils.reader import BidsDatasetReader
+
+
+def write_dataset(dataset_path: Path, subject_labels: list[str]):
+    dataset_path.mkdir(exist_ok=True)
+    (dataset_path / 'dataset_description.json').write_text(json.dumps({'Name': 'Test', 'BIDSVersion': '1.8.0'}))
+    for subject_label in subject_labels:
+        anat_path = dataset_path / f'sub-{subject_label}' / 'anat'
+        anat_path.mkdir(parents=True, exist_ok=True)
+        (anat_path / f'sub-{subject_label}_T1w.nii.gz').write_bytes(b'')
+
+
+def test_layout_index_refresh(tmp_path: Path):
+    dataset_path = tmp_path / 'dataset'
+    index_root_path = tmp_path / 'index'
+    write_dataset(dataset_path, ['01'])
+
+    reader = BidsDatasetReader(dataset_path, False, False, index_root_path)
+    index_path = get_bids_layout_index_path(index_root_path, dataset_path, False, False)
+    fingerprint = read_bids_layout_index_fingerprint(index_path)
+
+    assert reader.subject_labels == ['01']
+    assert (index_path / 'layout_index.sqlite').is_file()
+    assert fingerprint is not None
+
+    # The unchanged dataset is loaded from the index.
+    reader = BidsDatasetReader(dataset_path, False, False, index_root_path)
+    assert reader.subject_labels == ['01']
+    assert read_bids_layout_index_fingerprint(index_path) == fingerprint
+
+    # The modified dataset is indexed again.
+    write_dataset(dataset_path, ['01', '02'])
+    reader = BidsDatasetReader(dataset_path, False, False, index_root_path)
+    assert reader.subject_labels == ['01', '02']
+    assert read_bids_layout_index_fingerprint(index_path) != fingerprint
+
+
+def test_layout_index_reuse(tmp_path: Path):
+    dataset_path = tmp_path / 'dataset'
+    index_root_path = tmp_path / 'index'
+    write_dataset(dataset_path, ['01'])
+    BidsDatasetReader(dataset_path, False, False, index_root_path)
+
+    write_dataset(dataset_path, ['01', '02'])
+
+    assert BidsDatasetReader(dataset_path, False, False, index_root_path, 'reuse').subject_labels == ['01']
+    assert BidsDatasetReader(dataset_path, False, False, index_root_path, 'rebuild').subject_labels == [
+        '01', '02',
+    ]
+
+
+def test_layout_index_read_only(tmp_path: Path):
+    dataset_path = tmp_path / 'dataset'
+    index_root_path = tmp_path / 'index'
+    write_dataset(dataset_path, ['01'])
+
+    # Without an existing index, the dataset is indexed in memory.
+    reader = BidsDatasetReader(dataset_path, False, False, index_root_path, read_only_index=True)
+    assert reader.subject_labels == ['01']
+    assert not index_root_path.exists()
+
+    # An existing index is reused as is, even if the dataset has changed.
+    BidsDatasetReader(dataset_path, False, False, index_root_path)
+    write_dataset(dataset_path, ['01', '02'])
+    reader = BidsDatasetReader(dataset_path, False, False, index_root_path, read_only_index=True)
+    assert reader.subject_labels == ['01']
+
+
+def test_fingerprint_ignore_root_only(tmp_path: Path):
+    (tmp_path / 'code').mkdir()
+    (tmp_path / 'sub-01' / 'code').mkdir(parents=True)
+    fingerprint = compute_bids_dataset_fingerprint(tmp_path)
+
+    # The root code directory is ignored like in PyBIDS, but not a nested one.
+    (tmp_path / 'code' / 'script.py').write_text('')
+    assert compute_bids_dataset_fingerprint(tmp_path) == fingerprint
+
+    (tmp_path / 'sub-01' / 'code' / 'sub-01_events.tsv').write_text('')
+    assert compute_bids_dataset_fingerprint(tmp_path) != fingerprint
@@ -0,0 +1,143 @@
+import json
+from pathlib import Path
+from typing import Any
+
+from bids import BIDSLayout
+from loris_bids_utils.mri.reader import BidsMriDataTypeReader
+from loris_bids_utils.reader import BidsDatasetReader
+from loris_utils.iter import find
+
+
+def write_file(path: Path, content: str = ''):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+
+
+def write_dataset(dataset_path: Path):
+    write_file(dataset_path / 'dataset_description.json', json.dumps({'Name': 'Test', 'BIDSVersion': '1.8.0'}))
+    write_file(dataset_path / 'participants.tsv', 'participant_id\nsub-01\nsub-02\n')
+    write_file(dataset_path / 'task-rest_bold.json', json.dumps({'TaskName': 'rest'}))
+    write_file(dataset_path / 'task-rest_events.json', json.dumps({}))
+    write_file(dataset_path / 'dwi.bval', '0 1000\n')
+    write_file(dataset_path / 'dwi.bvec', '0 1\n0 0\n0 0\n')
+
+    for subject in ['01', '02']:
+        for session in ['v1', 'v2']:
+            session_path = dataset_path / f'sub-{subject}' / f'ses-{session}'
+            prefix = f'sub-{subject}_ses-{session}'
+            write_file(session_path / f'{prefix}_scans.tsv', f'filename\nanat/{prefix}_T1w.nii.gz\n')
+            write_file(session_path / 'anat' / f'{prefix}_T1w.nii.gz')
+            write_file(session_path / 'anat' / f'{prefix}_T1w.json', json.dumps({}))
+            write_file(session_path / 'anat' / f'{prefix}_run-2_T1w.nii.gz')
+            write_file(session_path / 'anat' / f'{prefix}_run-10_T1w.nii.gz')
+            write_file(session_path / 'func' / f'{prefix}_task-rest_run-1_bold.nii.gz')
+            write_file(session_path / 'func' / f'{prefix}_task-rest_run-1_events.tsv', 'onset\tduration\n')
+            write_file(session_path / 'func' / f'{prefix}_task-rest_run-1_physio.tsv.gz')
+            write_file(session_path / 'func' / f'{prefix}_task-rest_run-1_physio.json', json.dumps({}))
+            write_file(session_path / 'dwi' / f'{prefix}_dwi.nii.gz')
+            write_file(session_path / 'dwi' / f'{prefix}_acq-b1000_dwi.nii.gz')
+            write_file(session_path / 'dwi' / f'{prefix}_acq-b1000_dwi.bval', '0 1000\n')
+            write_file(session_path / 'dwi' / f'{prefix}_acq-b1000_dwi.bvec', '0 1\n0 0\n0 0\n')
+            write_file(session_path / 'dwi' / f'{prefix}_acq-b1000_dwi.json', json.dumps({}))
+            write_file(session_path / 'eeg' / f'{prefix}_task-rest_eeg.set')
+            write_file(session_path / 'eeg' / f'{prefix}_task-rest_eeg.fdt')
+            write_file(session_path / 'eeg' / f'{prefix}_task-rest_eeg.json', json.dumps({}))
+            write_file(session_path / 'eeg' / f'{prefix}_task-rest_channels.tsv', 'name\n')
+            write_file(session_path / 'eeg' / f'{prefix}_task-rest_events.tsv', 'onset\tduration\n')
+            write_file(session_path / 'eeg' / f'{prefix}_electrodes.tsv', 'name\n')
+
+
+def get_acquisitions(reader: BidsDatasetReader) -> list[tuple[Path | str | None, ...]]:
+    return [
+        (
+            acquisition.nifti_path,
+            acquisition.sidecar_file.path if acquisition.sidecar_file is not None else None,
+            acquisition.bval_path,
+            acquisition.bvec_path,
+            acquisition.events_path,
+            acquisition.physio_path,
+            bids_info.suffix,
+        )
+        for data_type in reader.data_types if isinstance(data_type, BidsMriDataTypeReader)
+        for acquisition, bids_info in data_type.acquisitions
+    ]
+
+
+def get_pybids_path(pybids_file: Any) -> Path | None:
+    return Path(pybids_file.path) if pybids_file is not None else None
+
+
+def get_pybids_acquisitions(layout: BIDSLayout) -> list[tuple[Path | str | None, ...]]:
+    # PyBIDS is not typed.
+    untyped_layout: Any = layout
+    acquisitions: list[tuple[Path | str | None, ...]] = []
+    pybids_files: list[Any] = untyped_layout.get(extension=['.nii', '.nii.gz'])
+    for pybids_file in pybids_files:
+        associations: list[Any] = pybids_file.get_associations()
+        acquisitions.append((
+            Path(pybids_file.path),
+            get_pybids_path(find(associations, lambda file: file.entities.get('extension') == '.json')),
+            get_pybids_path(untyped_layout.get_nearest(pybids_file, return_type='tuple', extension='.bval')),
+            get_pybids_path(untyped_layout.get_nearest(pybids_file, return_type='tuple', extension='.bvec')),
+            get_pybids_path(find(associations, lambda file: file.entities.get('suffix') == 'events')),
+            get_pybids_path(find(associations, lambda file: file.entities.get('suffix') in ['physio', 'stim'])),
+            pybids_file.entities.get('suffix'),
+        ))
+
+    return sorted(acquisitions, key=lambda acquisition: str(acquisition[0]))
+
+
+def test_native_layout_matches_pybids(tmp_path: Path):
+    write_dataset(tmp_path)
+
+    pybids_reader = BidsDatasetReader(tmp_path, False, False)
+    native_reader = BidsDatasetReader(tmp_path, False, False, native=True)
+
+    assert native_reader.subject_labels == pybids_reader.subject_labels
+    assert native_reader.session_labels == pybids_reader.session_labels
+    assert native_reader.data_type_names == pybids_reader.data_type_names
+    assert [session.scans_file.path for session in native_reader.sessions] == [  # type: ignore
+        session.scans_file.path for session in pybids_reader.sessions  # type: ignore
+    ]
+
+    native_event_dict_file = native_reader.event_dict_file
+    pybids_event_dict_file = pybids_reader.event_dict_file
+    assert native_event_dict_file is not None and pybids_event_dict_file is not None
+    assert native_event_dict_file.path == pybids_event_dict_file.path
+
+    native_acquisitions = get_acquisitions(native_reader)
+    assert len(native_acquisitions) == 24
+    assert native_acquisitions == get_acquisitions(pybids_reader)
+    assert sorted(native_acquisitions, key=lambda acquisition: str(acquisition[0])) \
+        == get_pybids_acquisitions(pybids_reader.layout)
+
+    # The PyBIDS layout is only built when it is used.
+    assert 'layout' not in native_reader.__dict__
+
+
+def test_native_layout_eeg_associated_files(tmp_path: Path):
+    write_dataset(tmp_path)
+
+    reader = BidsDatasetReader(tmp_path, False, False, native=True)
+    layout = reader.layout
+    eeg_data_types = [data_type for data_type in reader.data_types if data_type.name == 'eeg']
+    assert len(eeg_data_types) == 4
+
+    for data_type in eeg_data_types:
+        [(acquisition_path, associated_files)] = data_type.associated_files.items()
+        eeg_path = str(acquisition_path) + '.set'
+
+        def get_nearest(suffix: str, extension: str, all_: bool = False) -> Any:
+            return layout.get_nearest(  # type: ignore
+                eeg_path, return_type='tuple', strict=False, extension=extension, suffix=suffix, all_=all_,
+            )
+
+        assert associated_files.sidecar is not None and associated_files.fdt is not None
+        assert associated_files.sidecar.path == get_pybids_path(get_nearest('eeg', 'json'))
+        assert associated_files.fdt.path == get_pybids_path(get_nearest('eeg', 'fdt'))
+        assert associated_files.channels is not None and associated_files.events is not None
+        assert associated_files.channels.path == get_pybids_path(get_nearest('channels', 'tsv'))
+        assert associated_files.events.path == get_pybids_path(get_nearest('events', 'tsv'))
+        assert [file.path for file in associated_files.electrodes] == [
+            Path(file.path) for file in get_nearest('electrodes', 'tsv', all_=True)
+        ]
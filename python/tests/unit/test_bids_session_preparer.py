@@ -0,0 +1,61 @@
+import json
+from pathlib import Path
+
+import nibabel as nib
+import numpy as np
+from loris_bids_importer.session_preparer import BidsSessionPreparer
+from loris_bids_utils.reader import BidsDatasetReader
+
+
+def write_dataset(dataset_path: Path, subject_labels: list[str]):
+    (dataset_path / 'dataset_description.json').write_text(json.dumps({'Name': 'Test', 'BIDSVersion': '1.8.0'}))
+    for subject_label in subject_labels:
+        anat_path = dataset_path / f'sub-{subject_label}' / 'anat'
+        anat_path.mkdir(parents=True)
+        image = nib.Nifti1Image(np.zeros((4, 5, 6), dtype=np.int16), np.eye(4))  # type: ignore
+        nib.save(image, anat_path / f'sub-{subject_label}_T1w.nii.gz')  # type: ignore
+
+
+def test_iter_prepared_sessions(tmp_path: Path):
+    subject_labels = [f'{i:02}' for i in range(6)]
+    write_dataset(tmp_path, subject_labels)
+    reader = BidsDatasetReader(tmp_path, False, False, native=True)
+
+    session_preparer = BidsSessionPreparer(2)
+    prepared_sessions = [
+        (bids_session, prepared_session_future.result())
+        for bids_session, prepared_session_future in session_preparer.iter_prepared_sessions(reader.sessions)
+    ]
+
+    session_preparer.shutdown()
+
+    # The sessions are returned in order.
+    assert [bids_session.subject.label for bids_session, _ in prepared_sessions] == subject_labels
+
+    for bids_session, prepared_session in prepared_sessions:
+        subject_label = bids_session.subject.label
+        nifti_path = tmp_path / f'sub-{subject_label}' / 'anat' / f'sub-{subject_label}_T1w.nii.gz'
+        assert prepared_session.nifti_parameters.keys() == {nifti_path}
+        assert prepared_session.nifti_parameters[nifti_path]['xspace'] == 4
+        assert prepared_session.nifti_parameters[nifti_path]['zspace'] == 6
+        assert prepared_session.nifti_parameters[nifti_path]['time'] is None
+
+
+def test_iter_prepared_sessions_registered(tmp_path: Path):
+    write_dataset(tmp_path, ['01', '02'])
+    reader = BidsDatasetReader(tmp_path, False, False, native=True)
+    registered_path = tmp_path / 'sub-01' / 'anat' / 'sub-01_T1w.nii.gz'
+
+    # The NIfTI files that are already registered are not prepared.
+    session_preparer = BidsSessionPreparer(2, get_registered_paths=lambda bids_session: {registered_path})
+    prepared_sessions = [
+        prepared_session_future.result()
+        for _, prepared_session_future in session_preparer.iter_prepared_sessions(reader.sessions)
+    ]
+
+    session_preparer.shutdown()
+
+    assert [prepared_session.nifti_parameters.keys() for prepared_session in prepared_sessions] == [
+        set(),
+        {tmp_path / 'sub-02' / 'anat' / 'sub-02_T1w.nii.gz'},
+    ]
@@ -0,0 +1,86 @@
+import gzip
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+from loris_bids_utils.files.events import BidsEventsTsvFile
+from loris_bids_utils.files.participants import BidsParticipantsTsvFile
+from loris_bids_utils.files.scans import BidsScansTsvFile
+from loris_bids_utils.tsv import iter_bids_tsv_rows
+
+
+def test_scans_tsv_file_rows(tmp_path: Path):
+    scans_path = tmp_path / 'sub-01_scans.tsv'
+    scans_path.write_text('filename\tacq_time\nsub-01_T1w.nii.gz\t2020-01-01T10:00:00\nsub-01_T2w.nii.gz\tn/a\n')
+    other_scans_path = tmp_path / 'other_scans.tsv'
+    other_scans_path.write_text('filename\tage\nsub-01_T2w.nii.gz\t30\nsub-01_bold.nii.gz\t31\n')
+
+    scans_file = BidsScansTsvFile(scans_path)
+    assert scans_file.get_field_names() == ['filename', 'acq_time']
+
+    t1w_row = scans_file.get_row(Path('anat/sub-01_T1w.nii.gz'))
+    assert t1w_row is not None and t1w_row.get_acquisition_time() is not None
+    assert scans_file.get_row(Path('sub-01_bold.nii.gz')) is None
+
+    scans_file.merge(BidsScansTsvFile(other_scans_path))
+
+    # The T2w row is replaced and the bold row is appended.
+    assert [row.data['filename'] for row in scans_file.rows] == [
+        'sub-01_T1w.nii.gz', 'sub-01_T2w.nii.gz', 'sub-01_bold.nii.gz',
+    ]
+
+    t2w_row = scans_file.get_row(Path('sub-01_T2w.nii.gz'))
+    bold_row = scans_file.get_row(Path('sub-01_bold.nii.gz'))
+    assert t2w_row is not None and t2w_row.get_age_at_scan() == '30'
+    assert bold_row is not None and bold_row.get_age_at_scan() == '31'
+    assert scans_file.get_field_names() == ['filename', 'acq_time', 'age']
+
+    scans_file.write(scans_path)
+    assert BidsScansTsvFile(scans_path).get_field_names() == ['filename', 'acq_time', 'age']
+
+
+def test_participants_tsv_file_rows(tmp_path: Path):
+    participants_path = tmp_path / 'participants.tsv'
+    participants_path.write_text('participant_id\tsex\tsite\nsub-01\tM\tA\nsub-02\tF\tB\n')
+    other_participants_path = tmp_path / 'other_participants.tsv'
+    other_participants_path.write_text('participant_id\tsex\nsub-02\tM\n')
+
+    participants_file = BidsParticipantsTsvFile(participants_path)
+    participant_row = participants_file.get_row('02')
+    assert participant_row is not None and participant_row.sex == 'F'
+
+    participants_file.merge(BidsParticipantsTsvFile(other_participants_path))
+
+    participant_row = participants_file.get_row('02')
+    assert participant_row is not None and participant_row.sex == 'M' and participant_row.site is None
+    assert len(participants_file.rows) == 2
+    assert participants_file.get_field_names() == ['participant_id', 'sex', 'site']
+
+
+def test_events_tsv_file_rows(tmp_path: Path):
+    events_path = tmp_path / 'sub-01_task-rest_events.tsv'
+    events_path.write_text('onset\tduration\tevent_sample\tevent_value\n1.5\t0.5\t300\tA\n2.0\tn/a\t400\t\n\n')
+
+    rows = list(BidsEventsTsvFile(events_path))
+    assert [(row.onset, row.duration, row.event_sample, row.event_value) for row in rows] == [
+        (Decimal('1.5'), Decimal('0.5'), 300, 'A'), (Decimal('2.0'), None, 400, None),
+    ]
+
+
+def test_events_tsv_file_validate(tmp_path: Path):
+    events_path = tmp_path / 'sub-01_task-rest_events.tsv'
+    events_path.write_text('onset\tduration\tevent_code\n1.5\t0.5\t1\n2.0\t0.5\tstart\n')
+
+    with pytest.raises(Exception, match='Malformed row 2'):
+        BidsEventsTsvFile(events_path).validate()
+
+
+def test_gzip_tsv_file_rows(tmp_path: Path):
+    physio_path = tmp_path / 'sub-01_task-rest_physio.tsv.gz'
+    with gzip.open(physio_path, 'wt') as file:
+        file.write('0.1\t10\tx\n0.2\tn/a\ty\n')
+
+    field_names = ['cardiac', 'respiratory', 'trigger']
+    assert list(iter_bids_tsv_rows(physio_path, ['trigger', 'missing'], field_names)) == [
+        {'trigger': 'x'}, {'trigger': 'y'},
+    ]
@@ -0,0 +1,187 @@
+from collections.abc import Iterable, Sequence
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import pytest
+from loris_bids_importer.validation import subjects
+from loris_bids_importer.validation.sessions import validate_bids_sessions
+from loris_bids_importer.validation.subjects import validate_bids_subjects
+from loris_bids_utils.files.participants import BidsParticipantTsvRow
+from loris_bids_utils.info import BidsSessionInfo, BidsSubjectInfo
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session as Database
+from sqlalchemy.orm import UOWTransaction
+
+from lib.candidate import generate_new_cand_ids
+from lib.db.models.candidate import DbCandidate
+from lib.db.models.cohort import DbCohort
+from lib.db.models.project import DbProject
+from lib.db.models.session import DbSession
+from lib.db.models.sex import DbSex
+from lib.db.models.site import DbSite
+from lib.env import Env
+from tests.util.database import create_test_database
+
+
+@pytest.fixture
+def env(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Env:
+    db = create_test_database()
+
+    db.add(DbSite(id=1, name='Montreal', alias='MTL', mri_alias='MTL'))
+    db.add(DbProject(id=1, name='Rye', alias='RYE'))
+    db.add(DbCohort(id=1, name='Control'))
+    db.add(DbSex(name='Female'))
+
+    db.add(make_candidate(1, 111111, 'DCC001'))
+    db.add(make_candidate(2, 222222, 'DCC002'))
+    db.add(make_session(1, 1, 'V1'))
+    db.flush()
+
+    # SQLite compares strings case-sensitively, unlike the MySQL collation of the LORIS database.
+    def get_candidates_with_psc_ids(db: Database, psc_ids: Iterable[str]):
+        psc_ids = [psc_id.lower() for psc_id in psc_ids]
+        return db.execute(select(DbCandidate)
+            .where(func.lower(DbCandidate.psc_id).in_(psc_ids))
+        ).scalars().all()
+
+    monkeypatch.setattr(subjects, 'get_candidates_with_psc_ids', get_candidates_with_psc_ids)
+
+    # The candidates and sessions are created without test date, which has a default value in MySQL.
+    @event.listens_for(db, 'before_flush')
+    def set_test_dates(db: Database, flush_context: UOWTransaction, instances: Sequence[Any] | None):
+        for object in db.new:
+            if isinstance(object, (DbCandidate, DbSession)) and object.__dict__.get('test_date') is None:
+                object.test_date = datetime.now()
+
+    return Env(
+        db_engine     = db.get_bind(),  # type: ignore
+        db            = db,
+        script_name   = 'test',
+        config_info   = None,
+        tmp_dir_path  = tmp_path,
+        log_file_path = tmp_path / 'test.log',
+        verbose       = False,
+        cleanups      = [],
+    )
+
+
+def make_candidate(id: int, cand_id: int, psc_id: str) -> DbCandidate:
+    return DbCandidate(
+        id                      = id,
+        cand_id                 = cand_id,
+        psc_id                  = psc_id,
+        registration_site_id    = 1,
+        registration_project_id = 1,
+        active                  = True,
+        user_id                 = 'admin',
+        test_date               = datetime.now(),
+        entity_type             = 'Human',
+    )
+
+
+def make_session(id: int, candidate_id: int, visit_label: str) -> DbSession:
+    return DbSession(
+        id               = id,
+        candidate_id     = candidate_id,
+        visit_label      = visit_label,
+        current_stage    = 'Not Started',
+        site_id          = 1,
+        project_id       = 1,
+        submitted        = False,
+        active           = True,
+        user_id          = 'admin',
+        test_date        = datetime.now(),
+        hardcopy_request = '-',
+        mri_qc_status    = '',
+        mri_qc_pending   = False,
+        mri_caveat       = True,
+    )
+
+
+def make_participant(participant_id: str) -> BidsParticipantTsvRow:
+    return BidsParticipantTsvRow({
+        'participant_id': f'sub-{participant_id}',
+        'project': 'RYE',
+        'site': 'Montreal',
+        'cohort': 'Control',
+        'sex': 'F',
+    })
+
+
+def test_validate_bids_subjects_existing(env: Env):
+    candidates = validate_bids_subjects(env, [
+        BidsSubjectInfo('111111', None),
+        BidsSubjectInfo('dcc002', None),
+    ])
+
+    assert {label: candidate.psc_id for label, candidate in candidates.items()} == {
+        '111111': 'DCC001',
+        'dcc002': 'DCC002',
+    }
+
+
+def test_validate_bids_subjects_cand_ids_only(env: Env):
+    candidates = validate_bids_subjects(env, [BidsSubjectInfo('222222', None)])
+    assert candidates['222222'].psc_id == 'DCC002'
+
+
+def test_validate_bids_subjects_missing(env: Env):
+    with pytest.raises(Exception):
+        validate_bids_subjects(env, [BidsSubjectInfo('333333', None)])
+
+    with pytest.raises(Exception):
+        validate_bids_subjects(env, [BidsSubjectInfo('DCC003', make_participant('DCC003'))])
+
+
+def test_validate_bids_subjects_create(env: Env):
+    candidates = validate_bids_subjects(env, [
+        BidsSubjectInfo('DCC001', None),
+        BidsSubjectInfo('DCC003', make_participant('DCC003')),
+        BidsSubjectInfo('DCC004', make_participant('DCC004')),
+    ], create_candidate=True)
+
+    assert candidates['DCC001'].id == 1
+    assert candidates['DCC003'].psc_id == 'DCC003'
+    assert candidates['DCC004'].psc_id == 'DCC004'
+    assert candidates['DCC003'].sex == 'Female'
+    assert candidates['DCC003'].cand_id != candidates['DCC004'].cand_id
+    assert len(env.db.execute(select(DbCandidate)).scalars().all()) == 4
+
+
+def test_validate_bids_sessions(env: Env):
+    candidates = validate_bids_subjects(env, [BidsSubjectInfo('DCC001', None)])
+
+    sessions = validate_bids_sessions(env, [BidsSessionInfo('DCC001', None, 'v1', None)], candidates, False)
+    assert sessions['DCC001', 'v1'].id == 1
+
+    with pytest.raises(Exception):
+        validate_bids_sessions(env, [BidsSessionInfo('DCC001', None, 'V2', None)], candidates, False)
+
+
+def test_validate_bids_sessions_create(env: Env):
+    candidates = validate_bids_subjects(env, [BidsSubjectInfo('DCC001', None), BidsSubjectInfo('DCC002', None)])
+
+    sessions = validate_bids_sessions(env, [
+        BidsSessionInfo('DCC001', make_participant('DCC001'), 'V1', None),
+        BidsSessionInfo('DCC001', make_participant('DCC001'), 'V2', None),
+        BidsSessionInfo('DCC002', make_participant('DCC002'), 'V1', None),
+    ], candidates, True)
+
+    assert sessions['DCC001', 'V1'].id == 1
+    assert sessions['DCC001', 'V2'].candidate_id == 1
+    assert sessions['DCC002', 'V1'].candidate_id == 2
+    assert sessions['DCC002', 'V1'].cohort_id == 1
+    assert len(env.db.execute(select(DbSession)).scalars().all()) == 3
+
+
+def test_generate_new_cand_ids(env: Env, monkeypatch: pytest.MonkeyPatch):
+    # Return an existing CandID and a duplicate before the new CandIDs.
+    random_cand_ids = iter([111111, 333333, 333333, 444444])
+
+    def randint(a: int, b: int) -> int:
+        return next(random_cand_ids)
+
+    monkeypatch.setattr('lib.candidate.random.randint', randint)
+
+    assert sorted(generate_new_cand_ids(env, 2)) == [333333, 444444]
@@ -0,0 +1,51 @@
+import hashlib
+import os
+from pathlib import Path
+
+from loris_utils.crypto import compute_file_blake2b_hash, compute_file_hashes, compute_files_hashes
+
+
+def test_compute_file_hashes(tmp_path: Path):
+    path = tmp_path / 'file.nii'
+    path.write_bytes(b'nifti' * 500000)
+
+    hashes = compute_file_hashes(path)
+
+    assert hashes == {
+        'blake2b': hashlib.blake2b(b'nifti' * 500000).hexdigest(),
+        'md5': hashlib.md5(b'nifti' * 500000).hexdigest(),
+    }
+
+
+def test_compute_file_hashes_modified_file(tmp_path: Path):
+    path = tmp_path / 'file.json'
+    path.write_text('{}')
+    compute_file_blake2b_hash(path)
+
+    path.write_text('{"IntendedFor": []}')
+
+    assert compute_file_blake2b_hash(path) == hashlib.blake2b(b'{"IntendedFor": []}').hexdigest()
+
+
+def test_compute_files_hashes(tmp_path: Path):
+    paths = [tmp_path / f'file_{i}.tsv' for i in range(5)]
+    for i, path in enumerate(paths):
+        path.write_text(f'content {i}')
+
+    hashes = compute_files_hashes(paths, ('md5',))
+
+    assert list(hashes.keys()) == paths
+    assert hashes[paths[3]] == {'md5': hashlib.md5(b'content 3').hexdigest()}
+
+
+def test_compute_file_hashes_restored_mtime(tmp_path: Path):
+    path = tmp_path / 'file.json'
+    path.write_text('{"a": 1}')
+    stat = path.stat()
+    compute_file_blake2b_hash(path)
+
+    # Rewrite the file in place with the same size and modification time.
+    path.write_text('{"a": 2}')
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    assert compute_file_blake2b_hash(path) == hashlib.blake2b(b'{"a": 2}').hexdigest()
@@ -0,0 +1,68 @@
+from typing import Any
+
+import pytest
+from loris_bids_importer.eeg import physiological
+from loris_bids_importer.eeg.physiological import Physiological
+
+from lib.point_3d import Point3D
+
+# The maximum length of the statements of a MySQLdb multi-row insert.
+MAX_STMT_LENGTH = 64 * 1024
+
+
+class FakeDatabase:
+    """
+    Fake legacy database that splits the multi-row inserts like MySQLdb and inserts a row from
+    another import between each statement.
+    """
+
+    def __init__(self):
+        self.electrodes: list[dict[str, Any]] = []
+
+    def insert_electrode(self, name: str, file_path: str):
+        self.electrodes.append({
+            'PhysiologicalElectrodeID': len(self.electrodes) + 1,
+            'Name': name,
+            'FilePath': file_path,
+        })
+
+    def insert(self, table_name: str, column_names: tuple[str, ...], values: list[tuple[Any, ...]]):
+        statement_length = 0
+        for row in values:
+            row_length = len(str(row))
+            if statement_length + row_length > MAX_STMT_LENGTH:
+                self.insert_electrode('Cz', 'other_electrodes.tsv')
+                statement_length = 0
+
+            statement_length += row_length
+            self.insert_electrode(row[column_names.index('Name')], row[column_names.index('FilePath')])
+
+    def pselect(self, query: str, args: tuple[Any, ...]) -> list[dict[str, Any]]:
+        return [electrode for electrode in self.electrodes if electrode['FilePath'] == args[0]]
+
+
+def test_insert_electrode_file(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(physiological, 'insert_physio_file_parameter', lambda *args: None)  # type: ignore
+
+    db = FakeDatabase()
+    # An electrode inserted by a previous import of the same file.
+    db.insert_electrode('E0', 'electrodes.tsv')
+
+    physio = Physiological(None, db, False)  # type: ignore
+
+    def grep_or_insert_points(points: list[Point3D]) -> list[Point3D]:
+        return [Point3D(i, 0, 0, 0) for i in range(len(points))]
+
+    monkeypatch.setattr(physio.point_3d_db, 'grep_or_insert_points', grep_or_insert_points)
+
+    electrode_data = [
+        {'name': f'E{i}', 'x': 'n/a', 'y': 'n/a', 'z': 'n/a', 'impedance': 'n/a'} for i in range(5000)
+    ]
+
+    electrode_ids: list[int] = physio.insert_electrode_file(electrode_data, 'electrodes.tsv', None, 'hash')  # type: ignore
+
+    electrodes = {electrode['PhysiologicalElectrodeID']: electrode for electrode in db.electrodes}
+    assert any(electrode['FilePath'] == 'other_electrodes.tsv' for electrode in db.electrodes)
+    assert len(set(electrode_ids)) == 5000
+    assert [electrodes[electrode_id]['Name'] for electrode_id in electrode_ids] == [f'E{i}' for i in range(5000)]
+    assert electrode_ids[0] != 1
@@ -0,0 +1,67 @@
+import hashlib
+from pathlib import Path
+
+from loris_utils.fs import place_file, replace_file_text
+
+
+def test_place_file_copy_hashes(tmp_path: Path):
+    source_path = tmp_path / 'sub-01_T1w.json'
+    source_path.write_text('{}')
+
+    strategy, hashes = place_file(source_path, tmp_path / 'copy.json', 'copy', ('blake2b',))
+
+    assert strategy == 'copy'
+    assert hashes == {'blake2b': hashlib.blake2b(b'{}').hexdigest()}
+    assert (tmp_path / 'copy.json').read_text() == '{}'
+
+
+def test_place_file_links(tmp_path: Path):
+    source_path = tmp_path / 'sub-01_T1w.nii.gz'
+    source_path.write_bytes(b'nifti')
+
+    assert place_file(source_path, tmp_path / 'hardlink.nii.gz', 'hardlink')[0] == 'hardlink'
+    assert place_file(source_path, tmp_path / 'symlink.nii.gz', 'symlink')[0] == 'symlink'
+
+    assert (tmp_path / 'hardlink.nii.gz').stat().st_ino == source_path.stat().st_ino
+    assert (tmp_path / 'symlink.nii.gz').resolve() == source_path.resolve()
+
+
+def test_place_file_reflink_fallback(tmp_path: Path):
+    source_path = tmp_path / 'sub-01_T1w.nii.gz'
+    source_path.write_bytes(b'nifti')
+
+    strategy, hashes = place_file(source_path, tmp_path / 'reflink.nii.gz', 'reflink', ('md5',))
+
+    # The temporary directory file system may or may not support reflinks.
+    assert strategy in ('reflink', 'copy')
+    assert hashes == {'md5': hashlib.md5(b'nifti').hexdigest()}
+    assert (tmp_path / 'reflink.nii.gz').read_bytes() == b'nifti'
+
+
+def test_place_directory(tmp_path: Path):
+    source_path = tmp_path / 'sub-01_meg.ds'
+    source_path.mkdir()
+    (source_path / 'data.meg4').write_bytes(b'meg')
+
+    strategy, _ = place_file(source_path, tmp_path / 'copy.ds', 'hardlink')
+
+    assert strategy == 'hardlink'
+    assert (tmp_path / 'copy.ds' / 'data.meg4').read_bytes() == b'meg'
+
+
+def test_replace_file_text_link(tmp_path: Path):
+    source_path = tmp_path / 'sub-01_phasediff.json'
+    source_path.write_text('{}')
+    place_file(source_path, tmp_path / 'hardlink.json', 'hardlink')
+    place_file(source_path, tmp_path / 'symlink.json', 'symlink')
+
+    replace_file_text(tmp_path / 'hardlink.json', '{"IntendedFor": []}')
+    replace_file_text(tmp_path / 'symlink.json', '{"IntendedFor": []}')
+
+    # The links are replaced by new files and the source file is not modified.
+    assert source_path.read_text() == '{}'
+    assert (tmp_path / 'hardlink.json').read_text() == '{"IntendedFor": []}'
+    assert not (tmp_path / 'symlink.json').is_symlink()
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        'hardlink.json', 'sub-01_phasediff.json', 'symlink.json',
+    ]
@@ -0,0 +1,102 @@
+import hashlib
+import os
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from loris_utils.crypto import compute_file_hashes, set_file_hash_cache
+from loris_utils.hash_cache import FileHashCache
+
+
+@pytest.fixture
+def hash_cache(tmp_path: Path) -> Iterator[FileHashCache]:
+    hash_cache = FileHashCache(tmp_path / 'hash_cache.sqlite')
+    set_file_hash_cache(hash_cache)
+    yield hash_cache
+    set_file_hash_cache(None)
+    hash_cache.close()
+
+
+def test_hash_cache_hit(hash_cache: FileHashCache, tmp_path: Path):
+    path = tmp_path / 'archive.tar'
+    path.write_bytes(b'dicom')
+
+    compute_file_hashes(path, ('md5',))
+    hashes = compute_file_hashes(path, ('md5',))
+
+    assert hashes == {'md5': hashlib.md5(b'dicom').hexdigest()}
+    assert (hash_cache.hits, hash_cache.misses) == (1, 1)
+
+
+def test_hash_cache_modified_file(hash_cache: FileHashCache, tmp_path: Path):
+    path = tmp_path / 'archive.tar'
+    path.write_bytes(b'dicom')
+    compute_file_hashes(path, ('md5',))
+
+    path.write_bytes(b'modified dicom')
+
+    assert compute_file_hashes(path, ('md5',)) == {'md5': hashlib.md5(b'modified dicom').hexdigest()}
+    assert hash_cache.misses == 2
+
+
+def test_hash_cache_paranoid(hash_cache: FileHashCache, tmp_path: Path):
+    hash_cache.verify_rate = 1.0
+    path = tmp_path / 'archive.tar'
+    path.write_bytes(b'dicom')
+    compute_file_hashes(path, ('md5',))
+
+    hash_cache.set(path.stat(), {'md5': 'corrupted', 'blake2b': 'corrupted'})
+    warnings: list[str] = []
+    hash_cache.warn = warnings.append
+
+    assert compute_file_hashes(path, ('md5',)) == {'md5': hashlib.md5(b'dicom').hexdigest()}
+    assert (hash_cache.verified, hash_cache.mismatches) == (1, 1)
+    assert len(warnings) == 1 and str(path) in warnings[0]
+
+    # The stale entries are removed, including the ones of the algorithms that were not verified.
+    hash_cache.verify_rate = 0.0
+    assert hash_cache.get(path.stat(), ('blake2b',)) is None
+
+
+def test_hash_cache_restored_mtime(hash_cache: FileHashCache, tmp_path: Path):
+    path = tmp_path / 'archive.tar'
+    path.write_bytes(b'dicom')
+    stat = path.stat()
+    compute_file_hashes(path, ('md5',))
+
+    # Extract a file with the same size and modification time over the hashed file.
+    path.write_bytes(b'DICOM')
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    assert compute_file_hashes(path, ('md5',)) == {'md5': hashlib.md5(b'DICOM').hexdigest()}
+    assert hash_cache.misses == 2
+
+
+def test_hash_cache_error(hash_cache: FileHashCache, tmp_path: Path):
+    path = tmp_path / 'archive.tar'
+    path.write_bytes(b'dicom')
+    warnings: list[str] = []
+    hash_cache.warn = warnings.append
+
+    # A failing cache is a miss rather than an error of the hashing functions.
+    hash_cache.close()
+
+    assert compute_file_hashes(path, ('md5',)) == {'md5': hashlib.md5(b'dicom').hexdigest()}
+    assert compute_file_hashes(path, ('md5',)) == {'md5': hashlib.md5(b'dicom').hexdigest()}
+    assert hash_cache.errors == 4 and len(warnings) == 1
+
+
+def test_hash_cache_read_only(hash_cache: FileHashCache, tmp_path: Path):
+    cached_path = tmp_path / 'cached.tar'
+    cached_path.write_bytes(b'cached')
+    compute_file_hashes(cached_path, ('md5',))
+
+    hash_cache.read_only = True
+    path = tmp_path / 'archive.tar'
+    path.write_bytes(b'dicom')
+    compute_file_hashes(path, ('md5',))
+
+    # The cached hashes are still read, but the new hashes are not stored.
+    assert compute_file_hashes(cached_path, ('md5',)) == {'md5': hashlib.md5(b'cached').hexdigest()}
+    assert hash_cache.get(path.stat(), ('md5',)) is None
+    assert (hash_cache.hits, hash_cache.misses) == (1, 3)
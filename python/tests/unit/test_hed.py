@@ -0,0 +1,124 @@
+import json
+from pathlib import Path
+
+import pytest
+
+# Register the HED schema table referenced by the HED schema nodes in the ORM metadata, which is
+# shared with the database tests.
+from lib.db.models.hed_schema import DbHedSchema as DbHedSchema
+from lib.db.models.hed_schema_node import DbHedSchemaNode
+from lib.physio.hed import HedSchemaLookup, assemble_hed, validate_hed_string
+
+# Fragment of the HED 8.2.0 standard schema, with the ID of the node, the ID of its parent node,
+# and its long name.
+HED_SCHEMA_NODES = [
+    (1,  None, 'Event'),
+    (2,  1,    'Event/Sensory-event'),
+    (3,  None, 'Agent'),
+    (4,  3,    'Agent/Human-agent'),
+    (5,  None, 'Property'),
+    (6,  5,    'Property/Organizational-property'),
+    (7,  6,    'Property/Organizational-property/Def'),
+    (8,  7,    'Property/Organizational-property/Def/#'),
+    (9,  6,    'Property/Organizational-property/Def-expand'),
+    (10, 9,    'Property/Organizational-property/Def-expand/#'),
+    (11, 6,    'Property/Organizational-property/Definition'),
+    (12, 11,   'Property/Organizational-property/Definition/#'),
+    (13, 5,    'Property/Informational-property'),
+    (14, 13,   'Property/Informational-property/Label'),
+    (15, 14,   'Property/Informational-property/Label/#'),
+    (16, 5,    'Property/Data-property'),
+    (17, 16,   'Property/Data-property/Data-value'),
+    (18, 17,   'Property/Data-property/Data-value/Spatiotemporal-value'),
+    (19, 18,   'Property/Data-property/Data-value/Spatiotemporal-value/Temporal-value'),
+    (20, 19,   'Property/Data-property/Data-value/Spatiotemporal-value/Temporal-value/Duration'),
+    (21, 20,   'Property/Data-property/Data-value/Spatiotemporal-value/Temporal-value/Duration/#'),
+    (22, 5,    'Property/Sensory-property'),
+    (23, 22,   'Property/Sensory-property/Sensory-attribute'),
+    (24, 23,   'Property/Sensory-property/Sensory-attribute/Visual-attribute'),
+    (25, 24,   'Property/Sensory-property/Sensory-attribute/Visual-attribute/Color'),
+    (26, 25,   'Property/Sensory-property/Sensory-attribute/Visual-attribute/Color/CSS-color'),
+    (27, 26,   'Property/Sensory-property/Sensory-attribute/Visual-attribute/Color/CSS-color/Red-color'),
+    (28, 27,   'Property/Sensory-property/Sensory-attribute/Visual-attribute/Color/CSS-color/Red-color/Red'),
+]
+
+
+@pytest.fixture
+def hed_schema() -> HedSchemaLookup:
+    return HedSchemaLookup([
+        DbHedSchemaNode(
+            id          = id,
+            parent_id   = parent_id,
+            schema_id   = 1,
+            name        = long_name.split('/')[-1],
+            long_name   = long_name,
+            description = '',
+        )
+        for id, parent_id, long_name in HED_SCHEMA_NODES
+    ])
+
+
+def write_events_files(tmp_path: Path):
+    (tmp_path / 'events.json').write_text(json.dumps({
+        'trial_type': {
+            'HED': {
+                'go': 'Sensory-event, Red, (Def/Go-cue)',
+                'stop': 'Sensory-event, Def/Stop-cue/3',
+            },
+        },
+        'response_time': {
+            'HED': 'Duration/# s',
+        },
+        'definitions': {
+            'HED': {
+                'go_cue': '(Definition/Go-cue, (Label/Go))',
+                'stop_cue': '(Definition/Stop-cue/#, (Duration/# s))',
+            },
+        },
+    }))
+
+    (tmp_path / 'events.tsv').write_text(
+        'onset\tduration\ttrial_type\tresponse_time\tHED\n'
+        '1.0\t0.5\tgo\t0.3\tAgent/Human-agent\n'
+        '2.0\t0.5\tstop\tn/a\tn/a\n'
+        '\n'
+    )
+
+
+# The expected strings follow the output format of the `events_assemble` HED tools service, which
+# expands the `Def/` tags in place and joins the HED strings of the columns in their file order.
+
+def test_assemble_hed_expand_definitions(tmp_path: Path, hed_schema: HedSchemaLookup):
+    write_events_files(tmp_path)
+
+    assert list(assemble_hed(hed_schema, tmp_path, Path('events.tsv'), Path('events.json'))) == [
+        {
+            'onset': '1.0',
+            'HED_assembled': 'Sensory-event,Red,((Def-expand/Go-cue,(Label/Go))),Duration/0.3 s,Agent/Human-agent',
+        },
+        {
+            'onset': '2.0',
+            'HED_assembled': 'Sensory-event,(Def-expand/Stop-cue/3,(Duration/3 s))',
+        },
+    ]
+
+
+def test_assemble_hed_keep_definitions(tmp_path: Path, hed_schema: HedSchemaLookup):
+    write_events_files(tmp_path)
+
+    rows = assemble_hed(hed_schema, tmp_path, Path('events.tsv'), Path('events.json'), expand_defs=False)
+    assert [row['HED_assembled'] for row in rows] == [
+        'Sensory-event,Red,(Def/Go-cue),Duration/0.3 s,Agent/Human-agent',
+        'Sensory-event,Def/Stop-cue/3',
+    ]
+
+
+def test_validate_hed_string(hed_schema: HedSchemaLookup):
+    # Tags in long and short form, values, and extensions of nodes that allow them.
+    validate_hed_string(hed_schema, 'Event/Sensory-event,(Red,Label/Anything)')
+    validate_hed_string(hed_schema, 'Property/Sensory-property/Sensory-attribute/Visual-attribute/Color/Dark-red')
+    validate_hed_string(hed_schema, 'Duration/3 s,Def-expand/Stop-cue/3')
+
+    for hed_string in ['Garbage', 'Event/Garbage', 'Sensory-event/Garbage', 'Agent/Human-agent/Garbage']:
+        with pytest.raises(Exception):
+            validate_hed_string(hed_schema, hed_string)